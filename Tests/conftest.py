@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# Game modules live at the repo root next to axolotl_dash.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# No window or audio device needed; set before any test module imports pygame
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def asset_cache(tmp_path_factory):
+    """Build the asset pack cache in a temp dir instead of the repo's .asset_cache/."""
+    try:
+        import asset_manager
+    except ImportError:  # no pygame: the tests that need it skip themselves
+        yield None
+        return
+    with pytest.MonkeyPatch.context() as mp:
+        path = str(tmp_path_factory.mktemp("asset_cache"))
+        mp.setattr(asset_manager, "ASSET_CACHE_DIR", path)
+        yield path
+
+
+@pytest.fixture(scope="session")
+def assets():
+    """The simulation's sprites and masks, loaded once for the whole run."""
+    pytest.importorskip("pygame")
+    pytest.importorskip("numpy")
+    import simulation
+
+    return simulation.load_assets()
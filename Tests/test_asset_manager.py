@@ -0,0 +1,96 @@
+import os
+import threading
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+import asset_manager
+from asset_manager import AssetManager, resolve_asset
+
+
+def _save_png(path, color):
+    surf = pygame.Surface((8, 8), pygame.SRCALPHA)
+    surf.fill(color)
+    pygame.image.save(surf, str(path))
+
+
+@pytest.fixture
+def assets_dir(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _save_png(src / "Red.png", (255, 0, 0, 255))
+    _save_png(src / "blue.png", (0, 0, 255, 128))
+    return src
+
+
+SPECS = [("red", "red.png", (4, 4), True), ("blue", "blue.png", (16, 16), True)]
+
+
+def test_resolve_asset_ignores_case(assets_dir):
+    assert resolve_asset(str(assets_dir), "RED.PNG") == str(assets_dir / "Red.png")
+    with pytest.raises(FileNotFoundError):
+        resolve_asset(str(assets_dir), "green.png")
+
+
+def test_second_load_is_served_from_pack(assets_dir, tmp_path, monkeypatch):
+    cache = str(tmp_path / "cache")
+    first = AssetManager(str(assets_dir), cache).load(SPECS, group="g")
+    assert first["red"].get_size() == (4, 4)
+    assert first["blue"].get_at((0, 0)) == (0, 0, 255, 128)
+
+    def fail(*args):
+        raise AssertionError("should have been read from the pack")
+
+    monkeypatch.setattr(asset_manager, "_decode", fail)
+    manager = AssetManager(str(assets_dir), cache)
+    again = manager.load(SPECS, group="g")
+    assert (manager.hits, manager.misses) == (2, 0)
+    assert again["blue"].get_size() == (16, 16)
+    assert again["red"].get_at((3, 3)) == (255, 0, 0, 255)
+
+
+def test_changed_source_is_rebuilt_but_touched_one_is_not(assets_dir, tmp_path):
+    cache = str(tmp_path / "cache")
+    AssetManager(str(assets_dir), cache).load(SPECS, group="g")
+
+    _save_png(assets_dir / "Red.png", (0, 255, 0, 255))
+    blue = assets_dir / "blue.png"
+    st = os.stat(blue)
+    os.utime(blue, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+    manager = AssetManager(str(assets_dir), cache)
+    surfaces = manager.load(SPECS, group="g")
+    assert (manager.hits, manager.misses) == (1, 1)
+    assert surfaces["red"].get_at((0, 0)) == (0, 255, 0, 255)
+    assert surfaces["blue"].get_at((0, 0)) == (0, 0, 255, 128)
+
+
+def test_deferred_assets(assets_dir, tmp_path):
+    later = AssetManager(str(assets_dir), str(tmp_path / "cache")).load_later(SPECS, "g")
+    assert later.get("red").get_size() == (4, 4)
+    assert later.ready()
+    assert later.get("red") is later.get("red")
+
+
+def test_deferred_group_does_not_block_other_groups(assets_dir, tmp_path, monkeypatch):
+    started, gate = threading.Event(), threading.Event()
+    decode = asset_manager._decode
+
+    def slow_blue(path, size):
+        if path.endswith("blue.png"):
+            started.set()
+            assert gate.wait(5)
+        return decode(path, size)
+
+    monkeypatch.setattr(asset_manager, "_decode", slow_blue)
+    manager = AssetManager(str(assets_dir), str(tmp_path / "cache"))
+    later = manager.load_later([SPECS[1]], "slow")
+    assert started.wait(5)
+    # Cold cache for both groups, and the deferred one is stuck decoding
+    surfaces = manager.load([SPECS[0]], group="fast")
+    assert surfaces["red"].get_size() == (4, 4)
+    assert not later.ready()
+    gate.set()
+    assert later.get("blue").get_size() == (16, 16)
+    assert (manager.hits, manager.misses) == (0, 2)
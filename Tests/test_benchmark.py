@@ -0,0 +1,69 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import benchmark
+
+
+@pytest.fixture(scope="module")
+def ctx():
+    return benchmark.make_context()
+
+
+@pytest.mark.parametrize("name", list(benchmark.SCENARIOS))
+def test_scenario_runs(ctx, name):
+    result = benchmark.run_scenario(ctx, name, frames=3, warmup=1, alloc_frames=2)
+    assert result["ticks_per_sec"] > 0
+    assert result["mean_ms"] >= result["update_ms"]
+
+
+def test_texture_backend_runs():
+    pytest.importorskip("pygame._sdl2.video")
+    texture_ctx = benchmark.make_context(backend="texture", software=True)
+    assert texture_ctx["driver"] == "software"
+    for name in ("default", "game_over"):
+        result = benchmark.run_scenario(texture_ctx, name, frames=3, warmup=1, alloc_frames=2)
+        assert result["mean_ms"] >= result["update_ms"]
+
+
+def test_stress_scenarios_hold_their_load(ctx):
+    state, tick, _ = benchmark.SCENARIOS["jellies_500"](ctx)
+    for _ in range(5):
+        tick(state)
+        benchmark.simulation.step(state, ctx["assets"], 0, 0)
+    tick(state)
+    assert len(state["jellies"]) == 500
+
+
+def test_compare_flags_gated_slowdowns_only():
+    baselines = {"a": {"mean_ms": 10.0, "update_ms": 1.0, "p99_ms": 10.0}}
+    ok = {"a": {"mean_ms": 12.0, "update_ms": 1.08, "p99_ms": 50.0}}
+    assert benchmark.compare(ok, baselines, threshold=0.25) == []
+    slow = {"a": {"mean_ms": 13.0, "update_ms": 1.0, "p99_ms": 10.0}}
+    assert len(benchmark.compare(slow, baselines, threshold=0.25)) == 1
+    assert benchmark.compare({"new": ok["a"]}, baselines) == []
+    # Large relative but tiny absolute slowdowns are timer noise
+    jitter = {"a": {"mean_ms": 10.0, "update_ms": 0.12, "p99_ms": 10.0}}
+    assert benchmark.compare(jitter, {"a": {"mean_ms": 10.0, "update_ms": 0.05}}) == []
+
+
+def test_baselines_round_trip(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    assert benchmark.load_baselines(path) == {}
+    benchmark.save_baselines({"a": {"mean_ms": 1.5}}, path)
+    assert benchmark.load_baselines(path) == {"a": {"mean_ms": 1.5}}
+
+
+def test_baseline_keys_keep_drawing_setups_apart():
+    keys = {
+        benchmark.baseline_key("default"),
+        benchmark.baseline_key("default", "surface", "dirty"),
+        benchmark.baseline_key("default", "surface", "full", "low"),
+        benchmark.baseline_key("default", "surface", "dirty", "low"),
+        benchmark.baseline_key("default", "texture", "software"),
+        benchmark.baseline_key("default", "texture", "accelerated"),
+    }
+    assert len(keys) == 6
+    assert benchmark.baseline_key("default") == "default"
+    assert benchmark.baseline_key("default", "surface", "dirty", "low") == "default[surface,dirty,q=low]"
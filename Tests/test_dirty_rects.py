@@ -0,0 +1,53 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from dirty_rects import DirtyRectRenderer
+
+
+@pytest.fixture()
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((200, 100))
+    pygame.display.quit()
+
+
+@pytest.fixture()
+def pushed(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pygame.display, "flip", lambda: calls.append("flip"))
+    monkeypatch.setattr(pygame.display, "update", lambda rects: calls.append(list(rects)))
+    return calls
+
+
+def test_only_changed_regions_are_pushed(screen, pushed):
+    background = pygame.Surface((200, 100))
+    background.fill((0, 0, 255))
+    sprite = pygame.Surface((10, 10))
+    sprite.fill((255, 0, 0))
+    renderer = DirtyRectRenderer(screen, background)
+
+    renderer.clear()
+    renderer.blit(sprite, (0, 0))
+    renderer.present()
+    assert pushed[-1] == "flip"  # first frame paints everything
+
+    renderer.clear()
+    renderer.blit(sprite, (50, 50))
+    renderer.present()
+    assert pushed[-1] == [pygame.Rect(0, 0, 10, 10), pygame.Rect(50, 50, 10, 10)]
+    # The old sprite position was restored from the background
+    assert screen.get_at((5, 5))[:3] == (0, 0, 255)
+    assert screen.get_at((55, 55))[:3] == (255, 0, 0)
+
+
+def test_large_dirty_area_falls_back_to_flip(screen, pushed):
+    background = pygame.Surface((200, 100))
+    renderer = DirtyRectRenderer(screen, background, max_fraction=0.5)
+    for _ in range(2):
+        renderer.clear()
+        renderer.present()
+    renderer.clear()
+    renderer.blit(pygame.Surface((200, 100)), (0, 0))
+    renderer.present()
+    assert pushed == ["flip", [], "flip"]
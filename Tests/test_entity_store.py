@@ -0,0 +1,44 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pygame = pytest.importorskip("pygame")
+
+from entity_store import EntityStore
+
+
+def test_spawn_reuses_freed_slots_and_grows():
+    store = EntityStore((10, 10), capacity=2)
+    a = store.spawn(0, 0)
+    b = store.spawn(5, 5)
+    c = store.spawn(9, 9)  # forces growth
+    assert store.capacity == 4
+    assert len(store) == 3
+    store.kill(b)
+    assert store.spawn(1, 1) == b
+    assert store.live().tolist() == [a, b, c]
+
+
+def test_move_truncates_velocity_like_int():
+    store = EntityStore((10, 10))
+    i = store.spawn(100, 0, vx=-0.8, vy=2.8)
+    store.move()
+    assert (store.x[i], store.y[i]) == (100, 2)
+
+
+def test_cull_and_overlap():
+    store = EntityStore((10, 10))
+    low = store.spawn(0, 700)
+    high = store.spawn(0, 0)
+    assert store.cull_below(650).tolist() == [low]
+    assert store.live().tolist() == [high]
+    assert store.overlapping(pygame.Rect(5, 5, 20, 20)).tolist() == [high]
+    assert store.overlapping(pygame.Rect(10, 0, 20, 20)).tolist() == []
+
+
+def test_wobble_matches_scalar_formula():
+    store = EntityStore((10, 10))
+    store.spawn(0, 0, phase=1.3)
+    off = store.wobble(250.0, 6, 0.006, store.live())
+    assert off.tolist() == [int(round(6 * math.sin(0.006 * 250.0 + 1.3)))]
@@ -0,0 +1,55 @@
+import pytest
+
+from frame_governor import FrameGovernor
+
+
+def feed(governor, ms, frames):
+    """Feed ``frames`` frames of ``ms``; returns the tier after each."""
+    tiers = []
+    for _ in range(frames):
+        governor.update(ms)
+        tiers.append(governor.tier)
+    return tiers
+
+
+def make(**kw):
+    kw.setdefault("window", 10)
+    kw.setdefault("hold_frames", 20)
+    kw.setdefault("restore_frames", 50)
+    return FrameGovernor(16.0, 4, **kw)
+
+
+def test_steps_down_one_tier_per_hold_period_and_stops_at_the_last():
+    governor = make()
+    tiers = feed(governor, 30.0, 100)
+    assert tiers[18] == 0 and tiers[19] == 1   # first judged after hold_frames
+    assert tiers[39] == 2 and tiers[59] == 3
+    assert tiers[-1] == 3 and governor.changes == 3
+
+
+def test_restoring_needs_sustained_headroom():
+    governor = make()
+    feed(governor, 30.0, 20)
+    assert governor.tier == 1
+    # In between the thresholds: neither worse nor better
+    assert set(feed(governor, 12.0, 200)) == {1}
+    # Headroom that keeps getting interrupted never restores
+    for _ in range(10):
+        feed(governor, 5.0, 30)
+        feed(governor, 12.0, 10)
+    assert governor.tier == 1
+    tiers = feed(governor, 5.0, 60)
+    assert tiers[-1] == 0
+
+
+def test_no_flapping_around_the_budget():
+    governor = make()
+    # Alternating just over and well under the budget averages in between
+    for k in range(1000):
+        governor.update(17.0 if k % 2 else 7.0)
+    assert governor.tier == 0 and governor.changes == 0
+
+
+def test_thresholds_must_leave_a_gap():
+    with pytest.raises(ValueError):
+        FrameGovernor(16.0, 4, degrade_at=0.6, restore_at=0.6)
@@ -0,0 +1,80 @@
+import csv
+import json
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from frame_profiler import FrameProfiler
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+    def advance(self, ms):
+        self.t += ms / 1000.0
+
+
+def run_frames(profiler, clock, n):
+    for k in range(n):
+        profiler.begin_frame()
+        clock.advance(1)
+        profiler.mark("a")
+        clock.advance(k)
+        profiler.mark("b")
+        profiler.end_frame({"things": k})
+
+
+def test_ring_buffer_keeps_latest_frames_in_order():
+    clock = FakeClock()
+    profiler = FrameProfiler(("a", "b"), ("things",), capacity=4, clock=clock)
+    run_frames(profiler, clock, 6)
+    assert len(profiler) == 4
+    rows = list(profiler.rows())
+    assert [r["frame"] for r in rows] == [2, 3, 4, 5]
+    assert [r["b"] for r in rows] == pytest.approx([2, 3, 4, 5])
+    assert [r["things"] for r in rows] == [2, 3, 4, 5]
+    assert profiler.latest_counts() == {"things": 5}
+    assert profiler.latest_total() == pytest.approx(6)
+    assert profiler.latest_total(exclude=("a",)) == pytest.approx(5)
+
+
+def test_percentiles_and_total():
+    clock = FakeClock()
+    profiler = FrameProfiler(("a", "b"), capacity=200, clock=clock)
+    run_frames(profiler, clock, 101)
+    stats = profiler.percentiles()
+    assert stats["a"] == pytest.approx([1, 1, 1])
+    assert stats["b"] == pytest.approx([50, 95, 99], abs=1e-3)
+    assert stats["total"] == pytest.approx([51, 96, 100], abs=1e-3)
+    assert profiler.percentiles(exclude=("a",))["total"] == pytest.approx(stats["b"], abs=1e-3)
+
+
+def test_unknown_phase_and_duplicate_names_are_rejected():
+    profiler = FrameProfiler(("a",))
+    profiler.begin_frame()
+    with pytest.raises(KeyError):
+        profiler.mark("nope")
+    with pytest.raises(ValueError):
+        FrameProfiler(("a", "b"), ("a",))
+
+
+@pytest.mark.parametrize("name", ["frames.csv", "frames.jsonl"])
+def test_dump(tmp_path, name):
+    clock = FakeClock()
+    profiler = FrameProfiler(("a", "b"), ("things",), capacity=8, clock=clock)
+    run_frames(profiler, clock, 3)
+    path = tmp_path / name
+    profiler.dump(str(path))
+    with open(path, newline="") as f:
+        if name.endswith(".jsonl"):
+            rows = [json.loads(line) for line in f]
+        else:
+            rows = list(csv.DictReader(f))
+    assert [int(r["frame"]) for r in rows] == [0, 1, 2]
+    assert [float(r["b"]) for r in rows] == pytest.approx([0, 1, 2])
+    assert [int(r["things"]) for r in rows] == [0, 1, 2]
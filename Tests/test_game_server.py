@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import game_server
+import simulation
+
+
+def server_view(state):
+    """The parts of a server game a client mirror should match."""
+    entities = {}
+    for kind in game_server.KINDS:
+        store = state[kind]
+        entities[kind] = {int(i): (int(store.x[i]), int(store.y[i])) for i in store.live()}
+    ax = state["ax_rect"]
+    return state["ticks"], state["score"], state["lives"], (ax.x, ax.y, ax.w, ax.h), entities
+
+
+def mirror_view(mirror):
+    entities = {kind: {i: (e[0], e[1]) for i, e in ents.items()} for kind, ents in mirror.entities.items()}
+    return mirror.ticks, mirror.score, mirror.lives, mirror.ax_rect, entities
+
+
+def test_mirror_tracks_the_server_game_over_loopback(assets):
+    async def scenario():
+        server = game_server.GameServer(assets)
+        port = await server.start("127.0.0.1", 0, tick=False)
+        client = await game_server.StandInClient.connect("127.0.0.1", port, bot_seed=4)
+        await client.join(seed=21)
+        assert client.seed == 21
+        assert await client.receive() == game_server.DELTA  # starting entities
+        session = server.sessions[client.session_id]
+        assert mirror_view(client.mirror) == server_view(session.state)
+        session.state["lives"] = 10**6  # keep playing through hits
+
+        # Many jellies, so spawns, culls and reused slots all happen
+        simulation.JELLYFISH_SPAWN_INTERVAL, saved = 50, simulation.JELLYFISH_SPAWN_INTERVAL
+        try:
+            for _ in range(900):
+                server.tick()
+                await client.receive()
+                assert mirror_view(client.mirror) == server_view(session.state)
+        finally:
+            simulation.JELLYFISH_SPAWN_INTERVAL = saved
+        await client.close()
+        await server.close()
+        return session
+
+    session = asyncio.run(scenario())
+    assert len(session.state["jellies"]) > 10
+
+
+class _Runs(list):
+    submit = list.append
+
+
+def test_finished_runs_are_ranked_on_the_board(assets):
+    runs = _Runs()
+
+    async def scenario():
+        server = game_server.GameServer(assets, high_scores=[9, 5, 1], score_writer=runs)
+        port = await server.start("127.0.0.1", 0, tick=False)
+        client = await game_server.StandInClient.connect("127.0.0.1", port)
+        await client.join(seed=3)
+        await client.receive()
+        state = server.sessions[client.session_id].state
+        state.update(lives=1, score=7)
+        # A jelly right on top of the axolotl
+        rect = pygame.Rect((0, 0), simulation.JELLYFISH_SIZE)
+        rect.center = state["ax_rect"].center
+        simulation.add_entity(state, "jellies", rect, vy=0.0)
+
+        server.tick()
+        assert await client.receive() == game_server.DELTA
+        assert client.mirror.game_over and "game_over" in client.mirror.events
+        assert await client.receive() == game_server.GAME_OVER
+        assert not server.sessions
+        await client.close()
+        await server.close()
+        return client.result, server.high_scores
+
+    result, scores = asyncio.run(scenario())
+    assert result == (7, 2, True)
+    assert scores == [9, 7, 5, 1]
+    [(score, played_at, ticks)] = runs
+    assert score == 7 and played_at > 0 and ticks == 1
+
+
+class _KeepingWriter(game_server._CountingWriter):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def write(self, data):
+        super().write(data)
+        self.messages.append(data)
+
+
+def test_rank_counts_every_run(assets):
+    leaderboard = pytest.importorskip("leaderboard")
+    board = leaderboard.Leaderboard(":memory:")
+    board.record_many((20, None, None) for _ in range(12))
+    server = game_server.GameServer(assets, board.top(10), ranks=leaderboard.RankTable(board.score_counts()))
+    board.close()   # ranking never goes back to the database
+    results = []
+    for score in (3, 5):
+        writer = _KeepingWriter()
+        session = server._join(1, writer)
+        session.state["score"] = score
+        server._finish(session)
+        results.append(writer.messages[-1])
+    # Not just the top 10 kept in memory, and runs not yet written count too
+    assert results == [
+        game_server.pack_message(game_server.GAME_OVER, game_server._GAME_OVER.pack(3, 13, False)),
+        game_server.pack_message(game_server.GAME_OVER, game_server._GAME_OVER.pack(5, 13, False)),
+    ]
+
+
+def test_scheduler_runs_stand_in_clients(assets):
+    async def scenario():
+        server = game_server.GameServer(assets, tick_ms=2)
+        port = await server.start("127.0.0.1", 0)
+        players = await game_server.run_clients("127.0.0.1", port, clients=3, ticks=40)
+        await server.close()
+        return players
+
+    players = asyncio.run(scenario())
+    assert len({p.session_id for p in players}) == 3
+    assert all(p.deltas > 40 or p.result is not None for p in players)
+
+
+def test_malformed_delta_is_rejected():
+    body = game_server._DELTA.pack(1, 0, 3, 0, 0, 0, 0, 10, 10, 1, 0)
+    with pytest.raises(game_server.ProtocolError):
+        game_server.Mirror().apply(body)
+
+
+def test_measure_throughput(assets):
+    result = game_server.measure_throughput(assets, sessions=4, ticks=30)
+    assert result["sessions"] == 4
+    assert result["tick_ms"] > 0 and result["max_sessions"] > 0
@@ -1,6 +1,7 @@
 import ast
 import types
 import json
+import os
 from pathlib import Path
 import pytest
 
@@ -20,6 +21,7 @@ def hs_module():
             nodes.append(node)
     module = types.ModuleType("hs_module")
     module.__dict__["json"] = json
+    module.__dict__["os"] = os
     exec(compile(ast.Module(body=nodes, type_ignores=[]), "hs_module", "exec"), module.__dict__)
     return module
 
@@ -55,3 +57,20 @@ def test_submit_high_score_persistence(tmp_path, hs_module, monkeypatch):
     assert len(reloaded) == 10
     assert rank == 4
     assert qualifies
+
+
+def test_submit_high_score_off_the_board(hs_module):
+    scores = [1000, 900, 800, 700, 600, 500, 400, 300, 200, 100]
+    updated, qualifies, rank = hs_module.submit_high_score(scores, 50)
+    assert updated == scores
+    assert rank == 11
+    assert not qualifies
+
+
+def test_save_high_scores_replaces_file_atomically(tmp_path, hs_module, monkeypatch):
+    temp_file = tmp_path / "scores.json"
+    monkeypatch.setattr(hs_module, "HIGH_SCORES_FILE", str(temp_file))
+    hs_module.save_high_scores([3, 2, 1])
+    hs_module.save_high_scores([4, 3, 2, 1])
+    assert hs_module.load_high_scores() == [4, 3, 2, 1]
+    assert [p.name for p in tmp_path.iterdir()] == ["scores.json"]
@@ -0,0 +1,101 @@
+import random
+
+import pytest
+
+sqlite3 = pytest.importorskip("sqlite3")
+
+from leaderboard import LEADERBOARD_SCHEMA_VERSION, Leaderboard, LeaderboardError, RankTable, open_leaderboard
+
+
+@pytest.fixture
+def board():
+    lb = Leaderboard(":memory:")
+    yield lb
+    lb.close()
+
+
+def test_top_and_rank_match_sorted_list(board):
+    rng = random.Random(4)
+    scores = [rng.randint(0, 50) for _ in range(500)]
+    board.record_many((s, float(k), None) for k, s in enumerate(scores))
+    assert len(board) == 500
+    assert board.top(10) == sorted(scores, reverse=True)[:10]
+    ordered = sorted(scores, reverse=True)
+    for s in (0, 17, 50, 51, -1):
+        # Ties rank just after every strictly higher score, as on the JSON board
+        assert board.rank(s) == sum(1 for x in ordered if x > s) + 1
+
+
+def test_history_is_newest_first_and_pages(board):
+    ids = [board.record(s, played_at=1000.0 + s, ticks=s * 60) for s in range(5)]
+    page = board.history(limit=2)
+    assert [r["id"] for r in page] == ids[:-3:-1]
+    assert page[0] == {"id": ids[-1], "score": 4, "played_at": 1004.0, "ticks": 240}
+    older = board.history(limit=10, before_id=page[-1]["id"])
+    assert [r["score"] for r in older] == [2, 1, 0]
+
+
+def test_runs_survive_reopen(tmp_path):
+    path = str(tmp_path / "board.db")
+    lb = Leaderboard(path)
+    lb.record(7)
+    lb.record_many([(3, None, None), (9, None, None)])
+    lb.close()
+
+    lb = Leaderboard(path)
+    assert lb.top(10) == [9, 7, 3]
+    assert all(r["played_at"] > 0 for r in lb.history())
+    lb.close()
+
+
+def test_open_leaderboard_seeds_a_new_board_once(tmp_path):
+    from leaderboard import write_runs
+
+    path = str(tmp_path / "board.db")
+    lb = open_leaderboard(path, lambda: [5, 3])
+    write_runs(lb, [(4, None, 60), (1, 1000.0, 30)])
+    lb.close()
+    # Seeding only happens while the board is empty
+    lb = open_leaderboard(path, lambda: [100])
+    assert lb.top(10) == [5, 4, 3, 1]
+    lb.close()
+
+
+def test_write_runs_without_a_board_uses_the_fallback():
+    from leaderboard import write_runs
+
+    saved = []
+    write_runs(None, [(4, None, 60)], fallback=lambda: saved.append(True))
+    assert saved == [True]
+
+
+def test_schema_version_is_checked_on_open(tmp_path):
+    path = str(tmp_path / "board.db")
+    # A board from before user_version was set: runs only, no counts
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE runs (id INTEGER PRIMARY KEY, score INTEGER NOT NULL, played_at REAL NOT NULL, ticks INTEGER)")
+    conn.executemany("INSERT INTO runs (score, played_at) VALUES (?, 0)", [(5,), (9,), (9,)])
+    conn.commit()
+    conn.close()
+
+    lb = Leaderboard(path)
+    assert lb.conn.execute("PRAGMA user_version").fetchone()[0] == LEADERBOARD_SCHEMA_VERSION
+    assert (len(lb), lb.rank(5), lb.rank(9)) == (3, 3, 1)
+    lb.conn.execute(f"PRAGMA user_version={LEADERBOARD_SCHEMA_VERSION + 1}")
+    lb.close()
+
+    with pytest.raises(LeaderboardError):
+        Leaderboard(path)
+    assert open_leaderboard(path) is None
+
+
+def test_rank_table_matches_the_database(board):
+    rng = random.Random(9)
+    board.record_many((rng.randint(0, 30), None, None) for _ in range(200))
+    ranks = RankTable(board.score_counts())
+    for score in (rng.randint(0, 30) for _ in range(50)):
+        board.record(score)
+        ranks.add(score)
+    assert len(ranks) == len(board) == 250
+    for s in (-1, 0, 7, 15, 30, 31):
+        assert ranks.rank(s) == board.rank(s)
@@ -0,0 +1,81 @@
+import os
+import random
+import struct
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import replay
+import simulation
+
+
+def record_run(path, assets, ticks=900, seed=11, chunk_frames=64, finish=True):
+    """Play a random-input game like the window does, recording it."""
+    rng = random.Random(3)
+    state = simulation.reset_game_state(assets, seed)
+    recorder = replay.Recorder(str(path), seed, chunk_frames=chunk_frames)
+    for _ in range(ticks):
+        dx, dy, dt = rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)), rng.choice((16, 17))
+        recorder.record(dx, dy, dt)
+        simulation.step(state, assets, dx, dy, dt)
+        if state["game_over"]:
+            break
+    recorder.finish(state if finish else None)
+    assert recorder.wait()
+    return state
+
+
+def test_playback_reproduces_the_run(tmp_path, assets):
+    path = tmp_path / "run.axr"
+    state = record_run(path, assets)
+    ok, header, replayed = replay.verify_replay(str(path), assets)
+    assert ok
+    assert header["seed"] == 11
+    assert (replayed["score"], replayed["lives"], replayed["ticks"]) == (state["score"], state["lives"], state["ticks"])
+    # 10 bytes a frame before compression
+    assert os.path.getsize(path) < state["ticks"] * replay.FRAME_DTYPE.itemsize
+
+
+def test_tampered_result_fails_verification(tmp_path, assets):
+    path = tmp_path / "run.axr"
+    record_run(path, assets)
+    with open(path, "r+b") as f:
+        f.seek(struct.calcsize("<4sHxxqq"))
+        f.write(struct.pack("<q", 9999))  # claimed score
+    ok, header, _ = replay.verify_replay(str(path), assets)
+    assert header["score"] == 9999
+    assert not ok
+
+
+def test_unfinished_and_truncated_recordings_still_load(tmp_path, assets):
+    path = tmp_path / "run.axr"
+    state = record_run(path, assets, ticks=300, finish=False)
+    header, frames = replay.load_replay(str(path))
+    assert not header["finished"]
+    assert len(frames) == state["ticks"]
+
+    # Cut off mid-stream: everything up to the last complete chunk survives
+    data = path.read_bytes()
+    path.write_bytes(data[: len(data) - 40])
+    _, frames = replay.load_replay(str(path))
+    assert 0 < len(frames) < state["ticks"]
+
+
+def test_file_is_only_touched_by_the_writer_thread(tmp_path, assets):
+    path = tmp_path / "replays" / "run.axr"
+    recorder = replay.Recorder(str(path), 5)
+    assert not path.parent.exists()   # nothing opened in the frame that started the run
+    recorder.record(1, 0, 16)
+    recorder.finish({"ticks": 1, "score": 0, "lives": 3})
+    assert recorder.wait()
+    header, frames = replay.load_replay(str(path))
+    assert header["finished"] and len(frames) == 1
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.axr"
+    path.write_bytes(b"not a replay at all, just some text here")
+    with pytest.raises(replay.ReplayError):
+        replay.load_replay(str(path))
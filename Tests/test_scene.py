@@ -0,0 +1,91 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import simulation
+from scene import HUD_STATS_COLOR, QUALITY_NAMES, QUALITY_TIERS, Scene
+from text_cache import TextCache
+
+
+class RecordingRenderer:
+    def __init__(self):
+        self.drawn = []
+
+    def clear(self):
+        self.drawn = []
+
+    def blit(self, surf, dest, area=None):
+        topleft = dest.topleft if isinstance(dest, pygame.Rect) else tuple(dest)
+        self.drawn.append((surf, topleft))
+
+    def blits(self, seq):
+        for surf, dest in seq:
+            self.blit(surf, dest)
+
+
+@pytest.fixture(scope="module")
+def scene_parts(assets):
+    pygame.font.init()
+    renderer = RecordingRenderer()
+    font = pygame.font.Font(None, 20)
+    return assets, renderer, Scene(renderer, assets, TextCache(), font, font)
+
+
+def positions_of(renderer, images):
+    return [pos for surf, pos in renderer.drawn if any(surf is img for img in images)]
+
+
+def test_draw_interpolates_between_ticks(scene_parts):
+    assets, renderer, scene = scene_parts
+    state = simulation.reset_game_state(assets, seed=0)
+    rect = pygame.Rect((100, 100), simulation.JELLYFISH_SIZE)
+    simulation.add_entity(state, "jellies", rect, vx=0.0, vy=20.0)
+
+    prev = simulation.snapshot(state)
+    simulation.step(state, assets, 1, 0)
+    # Spawned during the step, so it has no previous position
+    simulation.add_entity(state, "jellies", pygame.Rect((500, 50), simulation.JELLYFISH_SIZE),
+                          spawn_ms=state["now"])
+
+    scene.draw(state, prev=prev, alpha=0.5)
+    assert positions_of(renderer, assets["jelly_images"]) == [(100, 110), (500, 50)]
+    ax = [pos for surf, pos in renderer.drawn if surf is state["ax_sprite"]]
+    assert ax == [(state["ax_rect"].x - simulation.MOVE_SPEED // 2, state["ax_rect"].y)]
+
+    scene.draw(state, prev=prev, alpha=1.0)
+    assert positions_of(renderer, assets["jelly_images"]) == [(100, 120), (500, 50)]
+    scene.draw(state)
+    assert positions_of(renderer, assets["jelly_images"]) == [(100, 120), (500, 50)]
+
+
+def test_lower_quality_tiers(scene_parts):
+    assets, renderer, scene = scene_parts
+    state = simulation.reset_game_state(assets, seed=0)
+    turtles = state["turtles"]
+    turtle = turtles.live()[0]
+    for k in range(6):
+        simulation.spawn_score_popup(state, (100 + k, 100), float(k))
+    state["now"] = 10.0
+    try:
+        scene.quality = QUALITY_TIERS[QUALITY_NAMES.index("low")]
+        scene.draw(state)
+        # No wobble, and only the 3 newest popups
+        assert positions_of(renderer, [assets["turtle_img"]]) == [(int(turtles.x[turtle]), int(turtles.y[turtle]))]
+        half = scene.popup_ramp[0].get_width() // 2
+        assert sorted(x + half for x, _ in positions_of(renderer, scene.popup_ramp)) == [103, 104, 105]
+
+        # The HUD shows the score from its last refresh until the next one
+        every = scene.quality["hud_every"]
+        while scene.frames % every != 0:
+            scene.draw(state)
+        state["score"] = 5
+        old = scene.text_cache.get("Score: 0", scene.font, HUD_STATS_COLOR)
+        new = scene.text_cache.get("Score: 5", scene.font, HUD_STATS_COLOR)
+        for _ in range(every - 1):
+            scene.draw(state)
+            assert positions_of(renderer, [old]) and not positions_of(renderer, [new])
+        scene.draw(state)
+        assert positions_of(renderer, [new])
+    finally:
+        scene.quality = QUALITY_TIERS[0]
@@ -0,0 +1,80 @@
+import threading
+
+from score_writer import BackgroundWriter
+
+
+def test_close_writes_everything_submitted():
+    written = []
+    writer = BackgroundWriter(written.extend)
+    for k in range(10):
+        assert writer.submit(k)
+    assert writer.close()
+    assert written == list(range(10))
+    assert writer.written == 10
+
+
+def test_queued_items_are_coalesced_into_one_batch():
+    gate = threading.Event()
+    batches = []
+
+    def write(items):
+        gate.wait(5)
+        batches.append(list(items))
+
+    writer = BackgroundWriter(write)
+    writer.submit("first")  # worker blocks on this one
+    for k in range(5):
+        writer.submit(k)
+    gate.set()
+    writer.close()
+    assert sum(batches, []) == ["first", 0, 1, 2, 3, 4]
+    assert len(batches) <= 2
+
+
+def test_submit_never_blocks_when_queue_is_full():
+    gate = threading.Event()
+    writer = BackgroundWriter(lambda items: gate.wait(5), max_queue=2)
+    results = [writer.submit(k) for k in range(6)]
+    assert not all(results)
+    assert writer.dropped == results.count(False)
+    gate.set()
+    writer.close()
+
+
+def test_close_without_waiting_then_on_close():
+    gate = threading.Event()
+    written = []
+    at_close = []
+
+    def write(items):
+        gate.wait(5)
+        written.extend(items)
+
+    writer = BackgroundWriter(write, on_close=lambda: at_close.append(list(written)))
+    writer.submit(1)
+    writer.submit(2)
+    assert not writer.close(timeout=0)   # returns while the worker is still blocked
+    gate.set()
+    assert writer.close()
+    assert at_close == [[1, 2]]
+
+
+def test_failed_batch_is_retried():
+    calls = []
+    failed = threading.Event()
+
+    def flaky(items):
+        calls.append(list(items))
+        if len(calls) == 1:
+            failed.set()
+            raise OSError("disk full")
+
+    writer = BackgroundWriter(flaky)
+    writer.submit("a")
+    # Queue more only after the first attempt has failed
+    assert failed.wait(5)
+    writer.submit("b")
+    writer.close()
+    assert isinstance(writer.error, OSError)
+    assert calls[-1] == ["a", "b"]
+    assert writer.written == 2
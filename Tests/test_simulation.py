@@ -0,0 +1,142 @@
+import random
+import time
+
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import simulation
+
+
+def random_bot(seed):
+    rng = random.Random(seed)
+    return lambda state: (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+
+
+def snapshot(state):
+    return (
+        state["score"],
+        state["lives"],
+        state["ticks"],
+        tuple(state["ax_rect"]),
+        [tuple(state["jellies"].rect(j)) for j in state["jellies"].live()],
+        [tuple(state["starfruits"].rect(f)) for f in state["starfruits"].live()],
+    )
+
+
+def test_same_seed_replays_same_game(assets):
+    a = simulation.run_headless(seed=7, ticks=2000, bot=random_bot(1), assets=assets)
+    b = simulation.run_headless(seed=7, ticks=2000, bot=random_bot(1), assets=assets)
+    assert snapshot(a) == snapshot(b)
+
+
+def test_spawns_follow_simulation_clock(assets):
+    state = simulation.run_headless(seed=3, ticks=600, assets=assets, stop_on_game_over=False)
+    # 600 ticks at 60 Hz is ten seconds of play
+    assert state["now"] == pytest.approx(10_000)
+    assert state["starfruit_spawns"] == int(10_000 // simulation.STARFRUIT_SPAWN_INTERVAL)
+
+
+def test_starfruit_pickup_scores_and_grows(assets):
+    state = simulation.reset_game_state(assets, seed=0)
+    rect = pygame.Rect((0, 0), simulation.STARFRUIT_SIZE)
+    rect.center = state["ax_rect"].center
+    simulation.add_entity(state, "starfruits", rect)
+    events = simulation.step(state, assets, 0, 0)
+    assert "pickup" in events
+    assert state["score"] == 1
+    assert state["ax_size"] == (82, 82)
+    assert state["ax_rect"].size == (82, 82)
+    assert len(state["score_popups"]) == 1
+
+
+def test_last_life_ends_game(assets):
+    state = simulation.reset_game_state(assets, seed=0)
+    state["lives"] = 1
+    rect = pygame.Rect((0, 0), simulation.JELLYFISH_SIZE)
+    rect.center = state["ax_rect"].center
+    simulation.add_entity(state, "jellies", rect)
+    events = simulation.step(state, assets, 0, 0)
+    assert events[-2:] == ["hit", "game_over"]
+    assert state["game_over"]
+    assert len(state["jellies"]) == 0
+
+
+def test_score_popups_expire(assets):
+    state = simulation.reset_game_state(assets, seed=0)
+    simulation.spawn_score_popup(state, (100, 100), state["now"])
+    ticks = int(simulation.SCORE_POPUP_DURATION // simulation.TICK_MS)
+    for _ in range(ticks):
+        simulation.step(state, assets, 0, 0)
+    assert len(state["score_popups"]) == 1
+    for _ in range(2):
+        simulation.step(state, assets, 0, 0)
+    assert len(state["score_popups"]) == 0
+
+
+def test_uncollected_pickups_expire(assets):
+    state = simulation.reset_game_state(assets, seed=0)
+    turtle = state["turtles"].live()[0]
+    state["lives"] = 10**6
+    ticks = int(simulation.TURTLE_LIFETIME // simulation.TICK_MS)
+    for _ in range(ticks - 1):
+        simulation.step(state, assets, 0, 0)
+        if not state["turtles"].alive[turtle]:
+            break
+    assert state["turtles"].alive[turtle] and state["turtles"].spawn_ms[turtle] == 0
+    for _ in range(2):
+        simulation.step(state, assets, 0, 0)
+    assert not (state["turtles"].alive[turtle] and state["turtles"].spawn_ms[turtle] == 0)
+
+
+def test_expiry_spares_a_reused_slot(assets):
+    state = simulation.reset_game_state(assets, seed=0)
+    first = simulation.spawn_starfruit(state, state["now"])
+    simulation.remove_entity(state, "starfruits", first)  # picked up
+    simulation.step(state, assets, 0, 0)
+    again = simulation.spawn_starfruit(state, state["now"])
+    assert again == first
+    # Past the first one's expiry, short of the second's
+    state["now"] = simulation.STARFRUIT_LIFETIME - simulation.TICK_MS / 2
+    simulation.step(state, assets, 0, 0)
+    assert state["starfruits"].alive[again]
+
+
+def test_idle_play_stays_bounded(assets):
+    state = simulation.run_headless(seed=4, ticks=1, assets=assets)
+    state["lives"] = 10**6
+    for _ in range(int(4 * simulation.TURTLE_LIFETIME // simulation.TICK_MS)):
+        simulation.step(state, assets, 0, 0)
+    assert len(state["starfruits"]) <= simulation.STARFRUIT_MAX
+    assert len(state["turtles"]) <= simulation.TURTLE_MAX
+    assert len(state["starfruits"]) <= simulation.STARFRUIT_LIFETIME // simulation.STARFRUIT_SPAWN_INTERVAL + 1
+    # Live entities' expiries plus the two spawn timers
+    pending = len(state["starfruits"]) + len(state["turtles"]) + len(state["score_popups"]) + 2
+    assert len(state["timers"]) == pending
+
+
+def test_spawn_caps(assets, monkeypatch):
+    monkeypatch.setattr(simulation, "STARFRUIT_SPAWN_INTERVAL", 10)
+    monkeypatch.setattr(simulation, "TURTLE_SPAWN_EVERY", 1)
+    monkeypatch.setattr(simulation, "JELLYFISH_SPAWN_INTERVAL", 10)
+    monkeypatch.setattr(simulation, "JELLYFISH_MAX", 5)
+    state = simulation.reset_game_state(assets, seed=0)
+    state["lives"] = 10**6
+    for _ in range(120):
+        simulation.step(state, assets, 0, 0)
+    assert len(state["starfruits"]) == simulation.STARFRUIT_MAX
+    assert len(state["turtles"]) == simulation.TURTLE_MAX
+    assert len(state["jellies"]) == 5
+
+
+def test_growth_sizes_are_prewarmed():
+    sizes = simulation.growth_sizes()
+    assert sizes[0] == simulation.AXOLOTL_SIZE and sizes[-1] == simulation.AXOLOTL_MAX_SIZE
+    cache = simulation.load_assets()["ax_sprites"]
+    assert ("idle", sizes[0]) in cache
+    # The rest fill in on a background thread, without any lookups
+    deadline = time.monotonic() + 10
+    while not all(("idle", size) in cache for size in sizes) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(cache) == len(sizes)
@@ -0,0 +1,52 @@
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pygame = pytest.importorskip("pygame")
+
+import sound_bank
+
+
+def test_render_tone_matches_sample_loop():
+    sample_rate, duration_ms, freqs = 8000, 50, [660, 880]
+    pcm = sound_bank.render_tone(freqs, duration_ms, 8000, sample_rate=sample_rate)
+    n = int(sample_rate * duration_ms / 1000)
+    expected = []
+    for i in range(n):
+        t = i / sample_rate
+        amplitude = 8000 * (1 - i / n)
+        sample = sum(math.sin(2 * math.pi * f * t) for f in freqs) / len(freqs)
+        expected.append(int(amplitude * sample))
+    assert pcm.dtype == np.int16
+    assert np.abs(pcm.astype(int) - np.array(expected)).max() <= 1
+
+
+def test_rendered_pcm_is_cached_on_disk(tmp_path, monkeypatch):
+    params = {k: v for k, v in sound_bank.EFFECTS["hit"].items() if k != "variants"}
+    first = sound_bank.load_or_render("hit", params, 8000, cache_dir=str(tmp_path))
+    assert len(list(tmp_path.iterdir())) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("should have been read from the cache")
+
+    monkeypatch.setattr(sound_bank, "render_tone", fail)
+    again = sound_bank.load_or_render("hit", params, 8000, cache_dir=str(tmp_path))
+    assert np.array_equal(first, again)
+
+
+def test_sound_bank_plays_on_fixed_channel_pool(tmp_path, monkeypatch):
+    monkeypatch.setenv("SDL_AUDIODRIVER", "dummy")
+    try:
+        pygame.mixer.init(frequency=22050)
+    except pygame.error:
+        pytest.skip("no audio driver available")
+    try:
+        bank = sound_bank.SoundBank(cache_dir=str(tmp_path), channels=2)
+        for name in sound_bank.EFFECTS:
+            assert name in bank
+        for _ in range(5):
+            bank.play("pickup")
+        assert pygame.mixer.get_num_channels() == 2
+    finally:
+        pygame.mixer.quit()
@@ -0,0 +1,35 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from spatial_hash import SpatialHash
+
+
+def test_query_returns_only_nearby_items():
+    grid = SpatialHash(cell_size=100)
+    grid.insert("near", pygame.Rect(10, 10, 40, 40))
+    grid.insert("far", pygame.Rect(900, 600, 40, 40))
+    assert grid.query(pygame.Rect(0, 0, 50, 50)) == ["near"]
+
+
+def test_item_spanning_cells_is_reported_once():
+    grid = SpatialHash(cell_size=50)
+    grid.insert(7, pygame.Rect(0, 0, 200, 200))
+    assert grid.query(pygame.Rect(0, 0, 200, 200)) == [7]
+
+
+def test_remove():
+    grid = SpatialHash(cell_size=100)
+    grid.insert(3, pygame.Rect(510, 510, 40, 40))
+    assert grid.query(pygame.Rect(500, 500, 50, 50)) == [3]
+    grid.remove(3)
+    assert len(grid) == 0
+    assert grid.query(pygame.Rect(500, 500, 50, 50)) == []
+
+
+def test_query_order_is_by_cell_then_insertion():
+    grid = SpatialHash(cell_size=100)
+    grid.insert("b2", pygame.Rect(110, 10, 10, 10))   # cell (1, 0)
+    grid.insert("a", pygame.Rect(10, 10, 10, 10))     # cell (0, 0)
+    grid.insert("b1", pygame.Rect(150, 10, 10, 10))   # cell (1, 0)
+    assert grid.query(pygame.Rect(0, 0, 200, 50)) == ["a", "b2", "b1"]
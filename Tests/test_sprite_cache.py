@@ -0,0 +1,60 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from sprite_cache import SpriteCache, AXOLOTL_DIRECTIONS
+
+
+@pytest.fixture()
+def sprite_files(tmp_path):
+    files = {}
+    for direction in AXOLOTL_DIRECTIONS:
+        surf = pygame.Surface((16, 16), pygame.SRCALPHA)
+        surf.fill((255, 0, 0, 255))
+        path = tmp_path / f"{direction}.png"
+        pygame.image.save(surf, str(path))
+        files[direction] = str(path)
+    return files
+
+
+def test_sources_decoded_once(sprite_files, monkeypatch):
+    loads = []
+    real_load = pygame.image.load
+    monkeypatch.setattr(pygame.image, "load", lambda p: loads.append(p) or real_load(p))
+    cache = SpriteCache(sprite_files)
+    for size in [(80, 80), (82, 82), (84, 84), (80, 80)]:
+        surf, mask = cache.get("idle", size)
+        assert surf.get_size() == size
+        assert mask.get_size() == size
+    assert loads == [sprite_files["idle"]]
+    assert len(cache) == 3
+
+
+def test_repeat_lookup_returns_same_entry(sprite_files):
+    cache = SpriteCache(sprite_files)
+    assert cache.get("left", (90, 90)) is cache.get("left", (90, 90))
+
+
+def test_memory_cap_evicts_least_recently_used(sprite_files):
+    # Room for roughly two 100x100 entries
+    cache = SpriteCache(sprite_files, max_bytes=2 * 100 * 100 * 5)
+    cache.get("idle", (100, 100))
+    cache.get("up", (100, 100))
+    cache.get("idle", (100, 100))  # touch so "up" is the oldest
+    cache.get("down", (100, 100))
+    assert ("up", (100, 100)) not in cache
+    assert ("idle", (100, 100)) in cache
+    assert ("down", (100, 100)) in cache
+    assert cache.used_bytes <= cache.max_bytes
+
+
+def test_prewarm_later_builds_in_the_background(sprite_files):
+    cache = SpriteCache(sprite_files)
+    sizes = [(80 + 2 * k, 80 + 2 * k) for k in range(10)]
+    thread = cache.prewarm_later(sizes, directions=("idle",))
+    # Lookups while the prewarm runs get the same entries it builds
+    looked_up = cache.get("idle", sizes[5])
+    thread.join(5)
+    assert all(("idle", size) in cache for size in sizes)
+    assert len(cache) == 10
+    assert cache.get("idle", sizes[5]) is looked_up
@@ -0,0 +1,46 @@
+import argparse
+import json
+
+import pytest
+
+pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import simulation
+import sweep
+
+
+def test_parse_param_and_grid():
+    assert sweep.parse_param("move_speed=4,6") == ("MOVE_SPEED", [4, 6])
+    assert sweep.parse_param("JELLYFISH_SPEED_MIN=1.5") == ("JELLYFISH_SPEED_MIN", [1.5])
+    with pytest.raises(argparse.ArgumentTypeError):
+        sweep.parse_param("SCREEN_WIDTH=10")
+    with pytest.raises(argparse.ArgumentTypeError):
+        sweep.parse_param("MOVE_SPEED=fast")
+    points = sweep.grid_points({"MOVE_SPEED": [4, 6], "TURTLE_SPAWN_EVERY": [2, 3, 4]})
+    assert len(points) == 6
+    assert points[0] == {"MOVE_SPEED": 4, "TURTLE_SPAWN_EVERY": 2}
+
+
+def test_play_game_applies_and_restores_constants(assets):
+    before = simulation.JELLYFISH_SPAWN_INTERVAL
+    config = {"JELLYFISH_SPAWN_INTERVAL": 50, "STARTING_LIVES": 1}
+    hard = sweep.play_game(config, seed=2, ticks=2000, bot="idle", assets=assets)
+    assert simulation.JELLYFISH_SPAWN_INTERVAL == before
+    assert hard["game_over"]
+    assert hard == sweep.play_game(config, seed=2, ticks=2000, bot="idle", assets=assets)
+    easy = sweep.play_game({}, seed=2, ticks=600, bot="greedy", assets=assets)
+    assert easy["jellies_peak"] < hard["jellies_peak"]
+
+
+def test_run_sweep_summarizes_every_point(tmp_path):
+    rows = sweep.run_sweep({"MOVE_SPEED": [4, 8]}, seeds=2, ticks=300, bot="random", workers=1)
+    assert [r["MOVE_SPEED"] for r in rows] == [4, 8]
+    assert all(r["games"] == 2 and r["score_p90"] >= r["score_p10"] for r in rows)
+
+    path = str(tmp_path / "out.json")
+    sweep.write_results(path, rows, {"seeds": 2})
+    with open(path) as f:
+        assert json.load(f)["results"] == rows
+    sweep.write_results(str(tmp_path / "out.csv"), rows, {})
+    assert (tmp_path / "out.csv").read_text().startswith("MOVE_SPEED,games,")
@@ -0,0 +1,115 @@
+import gzip
+import threading
+
+import pytest
+
+pytest.importorskip("pygame")
+pytest.importorskip("numpy")
+
+import simulation
+import telemetry
+
+
+def log_games(path, assets, seeds, ticks=1200, batch=64):
+    log = telemetry.Telemetry(str(path), batch=batch)
+    states = []
+    for seed in seeds:
+        state = simulation.reset_game_state(assets, seed)
+        log.start_run(seed)
+        for k in range(ticks):
+            for name in simulation.step(state, assets, (k // 40) % 3 - 1, (k // 70) % 3 - 1):
+                log.sim_event(name, state)
+            if k % 30 == 0:
+                log.sample(state["ticks"], 16.7, 2.0 + k // 30 % 3, {"jellies": len(state["jellies"])})
+            if state["game_over"]:
+                break
+        state["rank"] = 1
+        log.end_run(state)
+        states.append(state)
+    log.close()
+    return log, states
+
+
+def test_round_trip(tmp_path, assets):
+    path = tmp_path / "a.jsonl.gz"
+    log, states = log_games(path, assets, seeds=[1, 2])
+    records = list(telemetry.read_events(str(path)))
+    assert len(records) == log.records
+    assert [r["seed"] for r in records if r["event"] == "run_start"] == [1, 2]
+    ends = [r for r in records if r["event"] == "run_end"]
+    assert [(r["run"], r["score"], r["ticks"]) for r in ends] == [
+        (n, s["score"], s["ticks"]) for n, s in enumerate(states, start=1)
+    ]
+    assert sum(r["event"] == "spawn_jelly" for r in records) > 10
+
+    # Reopening appends to the same log
+    more, _ = log_games(path, assets, seeds=[3])
+    assert len(list(telemetry.read_events(str(path)))) == log.records + more.records
+
+
+def test_truncated_log_reads_up_to_the_damage(tmp_path, assets):
+    path = tmp_path / "a.jsonl.gz"
+    log, _ = log_games(path, assets, seeds=[1])
+    data = path.read_bytes()
+    path.write_bytes(data[:-20])
+    records = list(telemetry.read_events(str(path)))
+    assert 0 < len(records) < log.records
+    assert records[0]["event"] == "run_start"
+
+
+def test_summary_streams_many_logs(tmp_path, assets):
+    paths = []
+    states = []
+    for k in range(3):
+        path = tmp_path / f"{k}.jsonl.gz"
+        states += log_games(path, assets, seeds=[10 + k])[1]
+        paths.append(str(path))
+    bad = tmp_path / "bad.jsonl.gz"
+    bad.write_bytes(b"not gzip")
+    report = telemetry.summarize(paths + [str(bad)])
+    assert report["logs"] == 4
+    assert report["runs"] == report["finished_runs"] == 3
+    assert report["score_max"] == max(s["score"] for s in states)
+    assert report["events"]["hit"] == sum(simulation.STARTING_LIVES - s["lives"] for s in states)
+    assert report["work_ms"] == {"p50": 3.25, "p95": 4.25, "p99": 4.25}
+    assert report["frame_ms"]["p50"] == 16.75
+
+
+def test_quit_runs_count_toward_play_time(tmp_path, assets):
+    path = tmp_path / "a.jsonl.gz"
+    log = telemetry.Telemetry(str(path))
+    state = simulation.reset_game_state(assets, 5)
+    log.start_run(5)
+    for _ in range(simulation.FPS * 60):
+        simulation.step(state, assets, 0, 0)
+    log.end_run(state, finished=False)
+    log.close()
+    report = telemetry.summarize([str(path)])
+    assert (report["runs"], report["finished_runs"], report["quit_runs"]) == (1, 0, 1)
+    assert report["minutes_played"] == 1.0
+    assert report["score_max"] is None
+
+
+def test_slow_last_batch_is_not_cut_off(tmp_path, monkeypatch):
+    path = tmp_path / "a.jsonl.gz"
+    log = telemetry.Telemetry(str(path))
+    write = log._write_batches
+    gate = threading.Event()
+
+    def slow(batches):
+        assert gate.wait(5)
+        write(batches)
+
+    monkeypatch.setattr(log._writer, "write_batch", slow)
+    log.event("run_end", 1, score=3, ticks=1, finished=True)
+    assert not log.close(timeout=0.05)
+    gate.set()
+    assert log._writer.close()
+    assert [r["event"] for r in telemetry.read_events(str(path))] == ["run_end"]
+
+
+def test_gzip_tools_can_read_logs(tmp_path, assets):
+    path = tmp_path / "a.jsonl.gz"
+    log, _ = log_games(path, assets, seeds=[1], ticks=200)
+    with gzip.open(path, "rt") as f:
+        assert sum(1 for _ in f) == log.records
@@ -0,0 +1,40 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+
+from text_cache import TextCache
+
+
+@pytest.fixture(scope="module")
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 20)
+
+
+def test_unchanged_text_is_rendered_once(font):
+    cache = TextCache()
+    first = cache.get("Score: 1", font, (255, 255, 255))
+    assert cache.get("Score: 1", font, (255, 255, 255)) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get("Score: 2", font, (255, 255, 255)) is not first
+
+
+def test_surface_includes_shadow_offset(font):
+    cache = TextCache(shadow_offset=(2, 3))
+    surf = cache.get("Lives: 3", font, (30, 130, 110))
+    text_w, text_h = font.size("Lives: 3")
+    assert surf.get_size() == (text_w + 2, text_h + 3)
+    assert cache.text_size(surf) == (text_w, text_h)
+
+
+def test_least_recently_used_entry_is_evicted(font):
+    cache = TextCache(max_entries=2)
+    a = cache.get("a", font, (0, 0, 0))
+    cache.get("b", font, (0, 0, 0))
+    cache.get("a", font, (0, 0, 0))
+    cache.get("c", font, (0, 0, 0))
+    assert len(cache) == 2
+    assert cache.get("a", font, (0, 0, 0)) is a
+    assert cache.misses == 3
+    cache.get("b", font, (0, 0, 0))  # "b" was dropped, so it renders again
+    assert cache.misses == 4
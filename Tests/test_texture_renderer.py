@@ -0,0 +1,70 @@
+import pytest
+
+pygame = pytest.importorskip("pygame")
+pytest.importorskip("pygame._sdl2.video")
+pytest.importorskip("numpy")
+
+from dirty_rects import FullRenderer
+from texture_renderer import TextureRenderer, open_window
+
+
+@pytest.fixture()
+def sdl_renderer():
+    pygame.display.init()
+    window, renderer, driver = open_window((200, 100), "test", software=True)
+    assert driver == "software"
+    yield renderer
+    window.destroy()
+    pygame.display.quit()
+
+
+def make_sprites():
+    background = pygame.Surface((200, 100))
+    background.fill((0, 0, 255))
+    solid = pygame.Surface((20, 10))
+    solid.fill((255, 0, 0))
+    faded = pygame.Surface((10, 10), pygame.SRCALPHA)
+    faded.fill((0, 255, 0, 255))
+    faded.set_alpha(128)
+    return background, solid, faded
+
+
+def draw_frame(renderer, solid, faded):
+    renderer.clear()
+    renderer.blit(solid, (10, 20))
+    renderer.blits([(faded, (100, 50)), (solid, pygame.Rect(150, 80, 20, 10))])
+
+
+def test_matches_the_surface_path(sdl_renderer):
+    background, solid, faded = make_sprites()
+    textures = TextureRenderer(sdl_renderer, background)
+    draw_frame(textures, solid, faded)
+    drawn = sdl_renderer.to_surface()
+
+    screen = pygame.Surface((200, 100))
+    draw_frame(FullRenderer(screen, background), solid, faded)
+    for pos in ((0, 0), (15, 25), (105, 55), (155, 85), (199, 99)):
+        a, b = drawn.get_at(pos), screen.get_at(pos)
+        assert all(abs(x - y) <= 2 for x, y in zip(a[:3], b[:3])), pos
+
+
+def test_each_surface_is_uploaded_once(sdl_renderer):
+    background, solid, faded = make_sprites()
+    textures = TextureRenderer(sdl_renderer, background)
+    textures.preload([solid, faded])
+    assert textures.uploads == 3
+    for _ in range(5):
+        draw_frame(textures, solid, faded)
+    assert textures.uploads == 3
+    assert textures.blit(solid, (5, 5), area=(0, 0, 4, 3)) == pygame.Rect(5, 5, 4, 3)
+
+
+def test_cache_is_bounded(sdl_renderer):
+    background, solid, _ = make_sprites()
+    textures = TextureRenderer(sdl_renderer, background, max_textures=4)
+    lines = [solid.copy() for _ in range(10)]
+    for surf in lines:
+        textures.blit(surf, (0, 0))
+    assert len(textures._textures) == 4
+    textures.blit(lines[0], (0, 0))  # dropped earlier, uploaded again
+    assert textures.uploads == 12
@@ -0,0 +1,51 @@
+import random
+
+from timer_wheel import TimerWheel
+
+
+def test_fires_in_time_order_and_never_early():
+    wheel = TimerWheel(10, slots=8)
+    wheel.schedule(25, "c")
+    wheel.schedule(5, "a")
+    wheel.schedule(25, "d")   # same time: scheduling order
+    wheel.schedule(12, "b")
+    assert len(wheel) == 4
+    assert wheel.advance(4) == []
+    assert wheel.advance(24) == ["a", "b"]
+    assert wheel.advance(25) == ["c", "d"]
+    assert len(wheel) == 0
+
+
+def test_events_beyond_one_turn_wait_for_their_own():
+    wheel = TimerWheel(10, slots=4)   # one turn is 40 ms
+    wheel.schedule(15, "near")
+    wheel.schedule(55, "far")     # same bucket as "near"
+    wheel.schedule(1000, "later")
+    assert wheel.advance(20) == ["near"]
+    assert wheel.advance(50) == []
+    assert wheel.advance(60) == ["far"]
+    assert wheel.advance(999) == []
+    assert wheel.advance(1000) == ["later"]
+
+
+def test_past_times_fire_on_the_next_advance():
+    wheel = TimerWheel(10)
+    wheel.advance(100)
+    wheel.schedule(30, "late")
+    assert wheel.advance(100) == ["late"]
+
+
+def test_matches_a_sorted_reference():
+    rng = random.Random(2)
+    wheel = TimerWheel(16.5, slots=16)
+    pending = []
+    now = 0.0
+    for n in range(3000):
+        at = now + rng.uniform(0, 900)
+        wheel.schedule(at, n)
+        pending.append((at, n))
+        now += rng.choice((0, 5, 16.5, 40))
+        expected = sorted(p for p in pending if p[0] <= now)
+        pending = [p for p in pending if p[0] > now]
+        assert wheel.advance(now) == [n for _, n in expected]
+    assert len(wheel) == len(pending)
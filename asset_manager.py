@@ -0,0 +1,252 @@
+"""Packed, pre-scaled image cache for fast startup.
+
+The first launch decodes and scales every PNG (in a thread pool) and writes
+the raw RGBA pixels into one pack file per asset group plus a small JSON
+index. Later launches memory-map the pack and wrap each image with
+``pygame.image.frombuffer``, skipping PNG decoding and scaling entirely.
+Entries are rebuilt when their source file's mtime/size changes and its
+content hash no longer matches.
+"""
+import hashlib
+import json
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+ASSET_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_CACHE_DIR = os.path.join(ASSET_DIR, ".asset_cache")
+ASSET_CACHE_VERSION = 1
+
+
+def resolve_asset(asset_dir, filename):
+    """Path to ``filename`` under ``asset_dir``, matching case-insensitively.
+
+    Asset names in the code do not always match the case of the files on
+    disk, which only matters on case-sensitive file systems.
+    """
+    path = os.path.join(asset_dir, filename)
+    if os.path.exists(path):
+        return path
+    head, tail = os.path.split(path)
+    if not os.path.isdir(head):
+        head = resolve_asset(asset_dir, os.path.relpath(head, asset_dir))
+    for entry in os.listdir(head):
+        if entry.lower() == tail.lower():
+            return os.path.join(head, entry)
+    raise FileNotFoundError(path)
+
+
+def _file_sha1(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _decode(path, size):
+    """Decode and scale one PNG to raw RGBA bytes. Runs on a worker thread."""
+    img = pygame.transform.scale(pygame.image.load(path), size)
+    return pygame.image.tobytes(img, "RGBA")
+
+
+class AssetManager:
+    """Load groups of ``(name, filename, size, alpha)`` image specs.
+
+    ``load`` returns ready-to-blit surfaces. ``load_later`` starts a group on
+    a background thread and returns a ``DeferredAssets`` whose ``get`` only
+    blocks if the image is needed before it has finished loading.
+    """
+
+    def __init__(self, asset_dir=ASSET_DIR, cache_dir=None, workers=None):
+        self.asset_dir = asset_dir
+        # Read at call time, so the default cache location can be redirected
+        self.cache_dir = ASSET_CACHE_DIR if cache_dir is None else cache_dir
+        self.workers = workers
+        self.hits = 0
+        self.misses = 0
+        self._maps = {}  # group -> mmap backing its surfaces
+        # One lock per group, so a deferred group rebuilding its pack doesn't
+        # hold up a different group; _lock only guards the shared bookkeeping
+        self._group_locks = {}
+        self._lock = threading.Lock()
+
+    # -------------------------
+    # Index / pack files
+    # -------------------------
+    def _paths(self, group):
+        base = os.path.join(self.cache_dir, group)
+        return base + ".json", base + ".pack"
+
+    def _read_index(self, group):
+        index_path, _ = self._paths(group)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == ASSET_CACHE_VERSION:
+                return index["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return {}
+
+    def _check(self, entry, source, size):
+        """``"fresh"``, ``"touched"`` (same content, new mtime) or ``None`` if stale."""
+        if entry is None or entry["file"] != os.path.basename(source) or tuple(entry["size"]) != tuple(size):
+            return None
+        st = os.stat(source)
+        if entry["mtime_ns"] == st.st_mtime_ns and entry["source_size"] == st.st_size:
+            return "fresh"
+        # Touched but maybe unchanged (e.g. a fresh checkout): compare content
+        if entry["sha1"] == _file_sha1(source):
+            entry["mtime_ns"] = st.st_mtime_ns
+            entry["source_size"] = st.st_size
+            return "touched"
+        return None
+
+    def _write_pack(self, group, entries, blobs):
+        """Atomically write the pack and index. ``blobs`` maps name -> bytes."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        index_path, pack_path = self._paths(group)
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        offset = 0
+        with open(pack_path + suffix, "wb") as f:
+            for name, entry in entries.items():
+                data = blobs[name]
+                f.write(data)
+                entry["offset"] = offset
+                entry["length"] = len(data)
+                offset += len(data)
+        os.replace(pack_path + suffix, pack_path)
+        self._write_index(group, entries)
+
+    def _write_index(self, group, entries):
+        index_path, _ = self._paths(group)
+        tmp = f"{index_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": ASSET_CACHE_VERSION, "entries": entries}, f)
+        os.replace(tmp, index_path)
+
+    # -------------------------
+    # Loading
+    # -------------------------
+    def _group_lock(self, group):
+        with self._lock:
+            return self._group_locks.setdefault(group, threading.Lock())
+
+    def load_raw(self, specs, group="assets"):
+        """Surfaces backed directly by the memory-mapped pack (not converted)."""
+        _, pack_path = self._paths(group)
+        sources = {name: resolve_asset(self.asset_dir, filename) for name, filename, _, _ in specs}
+
+        with self._group_lock(group):
+            index = self._read_index(group) if os.path.exists(pack_path) else {}
+            entries, misses = {}, []
+            touched = False
+            for name, _, size, _ in specs:
+                status = self._check(index.get(name), sources[name], size)
+                if status is None:
+                    misses.append((name, size))
+                else:
+                    entries[name] = index[name]
+                    touched = touched or status == "touched"
+
+            if misses:
+                self._rebuild(group, specs, sources, entries, misses)
+            elif touched:
+                # Only the recorded mtimes changed; save them so the next
+                # launch skips hashing again
+                self._write_index(group, entries)
+
+            entries = self._read_index(group)
+            with open(pack_path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        with self._lock:
+            self.hits += len(specs) - len(misses)
+            self.misses += len(misses)
+            # Old surfaces may still reference the previous map, so keep it alive
+            self._maps.setdefault(group, []).append(mapped)
+
+        view = memoryview(mapped)
+        surfaces = {}
+        for name, _, size, _ in specs:
+            entry = entries[name]
+            data = view[entry["offset"]:entry["offset"] + entry["length"]]
+            surfaces[name] = pygame.image.frombuffer(data, tuple(size), "RGBA")
+        return surfaces
+
+    def _rebuild(self, group, specs, sources, entries, misses):
+        blobs = {}
+        # Keep the still-valid entries' pixels from the old pack
+        if entries:
+            _, pack_path = self._paths(group)
+            with open(pack_path, "rb") as f:
+                for name, entry in entries.items():
+                    f.seek(entry["offset"])
+                    blobs[name] = f.read(entry["length"])
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            decoded = pool.map(lambda m: _decode(sources[m[0]], m[1]), misses)
+            for (name, size), data in zip(misses, decoded):
+                blobs[name] = data
+                st = os.stat(sources[name])
+                entries[name] = {
+                    "file": os.path.basename(sources[name]),
+                    "size": list(size),
+                    "mtime_ns": st.st_mtime_ns,
+                    "source_size": st.st_size,
+                    "sha1": _file_sha1(sources[name]),
+                }
+
+        ordered = {name: entries[name] for name, _, _, _ in specs}
+        self._write_pack(group, ordered, blobs)
+
+    def load(self, specs, group="assets"):
+        """Load ``specs`` and convert them for the open display, if any."""
+        raw = self.load_raw(specs, group)
+        return {name: self.convert(raw[name], alpha) for name, _, _, alpha in specs}
+
+    def load_later(self, specs, group):
+        return DeferredAssets(self, specs, group)
+
+    @staticmethod
+    def convert(surf, alpha):
+        # Conversion needs a display mode; headless runs keep the raw surface
+        if pygame.display.get_surface() is None:
+            return surf
+        return surf.convert_alpha() if alpha else surf.convert()
+
+
+class DeferredAssets:
+    """A group of assets loading on a background thread."""
+
+    def __init__(self, manager, specs, group):
+        self._alpha = {name: alpha for name, _, _, alpha in specs}
+        self._surfaces = {}
+        self._pending = None
+        self._thread = threading.Thread(target=self._run, args=(manager, specs, group), daemon=True)
+        self._error = None
+        self._thread.start()
+
+    def _run(self, manager, specs, group):
+        try:
+            self._pending = manager.load_raw(specs, group)
+        except Exception as exc:  # re-raised on the main thread by get()
+            self._error = exc
+
+    def ready(self):
+        return not self._thread.is_alive()
+
+    def get(self, name):
+        surf = self._surfaces.get(name)
+        if surf is None:
+            self._thread.join()
+            if self._error is not None:
+                raise self._error
+            # Convert on the calling (main) thread, once
+            surf = AssetManager.convert(self._pending[name], self._alpha[name])
+            self._surfaces[name] = surf
+        return surf
@@ -1,206 +1,167 @@
+import os
 import sys
-import math
-import random
 import json
+import time
+import atexit
+import random
+import argparse
+from functools import partial
+
 import pygame
-import array
+
+from asset_manager import ASSET_DIR, AssetManager, resolve_asset
+from dirty_rects import DirtyRectRenderer, FullRenderer
+from frame_governor import FrameGovernor
+from frame_profiler import FrameProfiler
+from replay import Recorder
+from score_writer import BackgroundWriter
+from leaderboard import RankTable, open_leaderboard, write_runs
+from scene import QUALITY_NAMES, QUALITY_TIERS, Scene
+from sound_bank import SoundBank
+from telemetry import TELEMETRY_DIR, TELEMETRY_SAMPLE_FRAMES, Telemetry
+from text_cache import TextCache
+try:
+    from texture_renderer import TextureRenderer, asset_surfaces, open_window
+except ImportError:  # pygame built without the SDL2 video module
+    TextureRenderer = None
+from simulation import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    FPS,
+    SIM_PHASES,
+    TICK_MS,
+    load_assets,
+    reset_game_state,
+    snapshot,
+    step,
+)
 
 # -------------------------
 # Config
 # -------------------------
-SCREEN_WIDTH  = 1280
-SCREEN_HEIGHT = 720
-FPS = 60
-
-AXOLOTL_SIZE      = (80, 80)
-STARFRUIT_SIZE    = (40, 40)
-TURTLE_SIZE       = (54, 54)
-JELLYFISH_SIZE    = (72, 72)
-
-MOVE_SPEED = 6
-
-JELLYFISH_SPEED_MIN = 1.2
-JELLYFISH_SPEED_MAX = 2.8
-
-STARFRUIT_SPAWN_INTERVAL = 1500  # ms
-JELLYFISH_SPAWN_INTERVAL = 900   # ms
-
-WOBBLE_AMPLITUDE = 6             # px
-WOBBLE_SPEED     = 0.006         # radians per ms
-
-TURTLE_SPAWN_EVERY = 4
-
-SCORE_POPUP_DURATION = 700       # ms
-SCORE_POPUP_RISE_SPEED = 0.05    # px per ms
-SCORE_POPUP_COLOR   = (200, 80, 255)  # bright purple for score popups
-
 HIGH_SCORES_FILE = "high_scores.json"
 MAX_HIGH_SCORES  = 10
-
-# Growth settings
-AXOLOTL_GROWTH   = 2              # pixels per fruit (width & height)
-AXOLOTL_MAX_SIZE = (200, 200)     # max axolotl size clamp
+LEADERBOARD_FILE = "leaderboard.db"  # every run with its timestamp (SQLite)
+SCORE_WRITER_QUEUE = 64           # finished runs waiting to be saved
+SCORE_WRITER_CLOSE_TIMEOUT = 5.0  # s to finish saving on quit
+REPLAY_DIR = "replays"            # input recording of every run (see replay.py)
 
 # Font & color settings
 FONT_PATH = "assets/DejaVuSans.ttf"
-HUD_TEXT_COLOR = (255, 240, 200)  # warm sand tone to match palette
-HUD_STATS_COLOR = (30, 130, 110)  # dark seafoam green for lives/score
 SHADOW_OFFSET  = (2, 2)
 
-# -------------------------
-# Init pygame
-# -------------------------
-pygame.init()
-pygame.display.set_caption("Axolotl")
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-clock = pygame.time.Clock()
-font = pygame.font.Font(FONT_PATH, 24)
-small_font = pygame.font.Font(FONT_PATH, 20)
-
-
-def blit_text_with_shadow(text, font, color, pos, center=False):
-    """Render text with a shadow for improved readability."""
-    shadow_color = tuple(max(0, c - 80) for c in color)
-    text_surf = font.render(text, True, color)
-    shadow_surf = font.render(text, True, shadow_color)
-    if center:
-        text_rect = text_surf.get_rect(center=pos)
-        shadow_rect = shadow_surf.get_rect(
-            center=(pos[0] + SHADOW_OFFSET[0], pos[1] + SHADOW_OFFSET[1])
-        )
-    else:
-        text_rect = text_surf.get_rect(topleft=pos)
-        shadow_rect = shadow_surf.get_rect(
-            topleft=(pos[0] + SHADOW_OFFSET[0], pos[1] + SHADOW_OFFSET[1])
-        )
-    screen.blit(shadow_surf, shadow_rect)
-    screen.blit(text_surf, text_rect)
-    return text_rect
-
-def create_pickup_sound():
-    sample_rate = 44100
-    duration_ms = 180
-    frequencies = [660, 880]
-    n_samples = int(sample_rate * duration_ms / 1000)
-    buf = array.array("h")
-    for i in range(n_samples):
-        t = i / sample_rate
-        amplitude = 8000 * (1 - i / n_samples)  # fade out for softer sound
-        sample = sum(math.sin(2 * math.pi * f * t) for f in frequencies) / len(frequencies)
-        buf.append(int(amplitude * sample))
-    return pygame.mixer.Sound(buffer=buf)
-try:
-    pickup_sound = create_pickup_sound()
-except pygame.error:
-    pickup_sound = None
-# -------------------------
-# Load and scale assets
-# -------------------------
-def load_scaled_axolotl(size):
-    idle  = pygame.transform.scale(pygame.image.load("Axel.png").convert_alpha(),       size)
-    down  = pygame.transform.scale(pygame.image.load("diver.png").convert_alpha(),      size)
-    left  = pygame.transform.scale(pygame.image.load("diverleft.png").convert_alpha(),  size)
-    up    = pygame.transform.scale(pygame.image.load("diverup.png").convert_alpha(),    size)
-    right = pygame.transform.scale(pygame.image.load("diverRight.png").convert_alpha(), size)
-    return idle, down, left, up, right
-
-# Initial axolotl sprites
-ax_img_idle, ax_img_down, ax_img_left, ax_img_up, ax_img_right = load_scaled_axolotl(AXOLOTL_SIZE)
-ax_mask_idle  = pygame.mask.from_surface(ax_img_idle)
-ax_mask_down  = pygame.mask.from_surface(ax_img_down)
-ax_mask_left  = pygame.mask.from_surface(ax_img_left)
-ax_mask_up    = pygame.mask.from_surface(ax_img_up)
-ax_mask_right = pygame.mask.from_surface(ax_img_right)
-
-# Background
-background_img = pygame.transform.scale(
-    pygame.image.load("Background.png").convert(), (SCREEN_WIDTH, SCREEN_HEIGHT)
-)
-
-# Pickups
-starfruit_img = pygame.transform.scale(pygame.image.load("Starfruit.png").convert_alpha(),     STARFRUIT_SIZE)
-turtle_img    = pygame.transform.scale(pygame.image.load("turtle_shield.png").convert_alpha(), TURTLE_SIZE)
-starfruit_mask = pygame.mask.from_surface(starfruit_img)
-turtle_mask    = pygame.mask.from_surface(turtle_img)
-
-# Jellyfish: static images, choose one per spawn
-jelly_images = [
-    pygame.transform.scale(pygame.image.load("Jelly1.png").convert_alpha(), JELLYFISH_SIZE),
-    pygame.transform.scale(pygame.image.load("Jelly2.png").convert_alpha(), JELLYFISH_SIZE),
-    pygame.transform.scale(pygame.image.load("Jelly3.png").convert_alpha(), JELLYFISH_SIZE),
-    pygame.transform.scale(pygame.image.load("Jelly4.png").convert_alpha(), JELLYFISH_SIZE),
-]
-jelly_masks = [pygame.mask.from_surface(img) for img in jelly_images]
+TEXT_CACHE_MAX_ENTRIES = 128
+
+SOUND_CHANNELS = 8                # fixed mixer channel pool for effects
+
+# Simulation events that make a sound, and which effect they play
+EVENT_SOUNDS = {
+    "pickup": "pickup",
+    "shield": "shield",
+    "shield_used": "hit",
+    "hit": "hit",
+    "game_over": "game_over",
+}
+
+DIRTY_RECT_MAX_FRACTION = 0.5     # fall back to a full flip above this share of the screen
+
+# The simulation always advances in TICK_MS steps; rendering runs at its own rate
+MAX_STEPS_PER_FRAME = 5           # past this the game slows down instead of stalling
+
+# Frame profiler: phases in loop order ("tick" is time spent waiting for the clock)
+PROFILE_PHASES = ("tick", "events") + SIM_PHASES + ("sim_events", "draw", "overlay", "flip")
+PROFILE_ENTITIES = ("starfruits", "turtles", "jellies", "score_popups")
+PROFILE_COUNTERS = PROFILE_ENTITIES + ("quality_tier",)
+PROFILE_FRAMES = 600              # ring buffer size (10 s at 60 FPS)
+PROFILE_OVERLAY_REFRESH = 30      # frames between overlay percentile updates
+PROFILE_OVERLAY_COLOR = (255, 255, 255)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Axolotl Dash")
+    parser.add_argument(
+        "--fps",
+        type=int,
+        default=None,
+        help=f"render frame rate cap, 0 for uncapped (default: {FPS}, or uncapped with --vsync); "
+             f"the game itself always updates {FPS} times a second",
+    )
+    parser.add_argument(
+        "--vsync",
+        action="store_true",
+        help="present frames in sync with the display refresh",
+    )
+    parser.add_argument(
+        "--quality",
+        choices=("auto",) + QUALITY_NAMES,
+        default=QUALITY_NAMES[0],
+        help="drawing detail; 'auto' lowers it while frames run over budget (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--dirty-rects",
+        action="store_true",
+        help="only redraw and update the screen regions that changed each frame",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=("surface", "texture"),
+        default="surface",
+        help="draw by blitting surfaces, or as textures through SDL's renderer (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--software-renderer",
+        action="store_true",
+        help="with --backend texture, use SDL's software renderer instead of the GPU",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="show the frame profiler overlay at startup (toggle with F3)",
+    )
+    parser.add_argument(
+        "--profile-out",
+        metavar="PATH",
+        help="write the last frames' phase timings to PATH on exit (.csv or .jsonl)",
+    )
+    parser.add_argument(
+        "--telemetry",
+        action="store_true",
+        help=f"log gameplay events and frame times to {TELEMETRY_DIR}/ (read with telemetry.py)",
+    )
+    parser.add_argument(
+        "--no-record",
+        action="store_true",
+        help=f"don't save input recordings of each run to {REPLAY_DIR}/",
+    )
+    return parser.parse_args(argv)
 
 # -------------------------
 # Helpers
 # -------------------------
-def clamp_rect_to_screen(rect):
-    rect.left = max(0, rect.left)
-    rect.top = max(0, rect.top)
-    rect.right = min(SCREEN_WIDTH, rect.right)
-    rect.bottom = min(SCREEN_HEIGHT, rect.bottom)
-
-def new_axolotl_rect():
-    return ax_img_idle.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-
-def spawn_starfruit(now_ms):
-    x = random.randint(30, SCREEN_WIDTH - 30)
-    y = random.randint(30, SCREEN_HEIGHT - 30)
-    rect = starfruit_img.get_rect(center=(x, y))
-    phase = random.uniform(0, 2 * math.pi)  # desync wobble
-    return {"rect": rect, "spawn": now_ms, "phase": phase}
-
-def spawn_turtle(now_ms):
-    x = random.randint(30, SCREEN_WIDTH - 30)
-    y = random.randint(30, SCREEN_HEIGHT - 30)
-    rect = turtle_img.get_rect(center=(x, y))
-    phase = random.uniform(0, 2 * math.pi)
-    return {"rect": rect, "spawn": now_ms, "phase": phase}
-
-def spawn_jelly():
-    # Spawn from top at random x, drifting down with slight sideways drift
-    idx = random.randrange(len(jelly_images))
-    img = jelly_images[idx]  # pick one and keep it static
-    mask = jelly_masks[idx]
-    x = random.randint(20, SCREEN_WIDTH - 20)
-    rect = img.get_rect(midtop=(x, -img.get_height()))
-    speed_y = random.uniform(JELLYFISH_SPEED_MIN, JELLYFISH_SPEED_MAX)
-    drift = random.uniform(-0.8, 0.8)  # gentle sideways drift
-    return {"rect": rect, "vy": speed_y, "vx": drift, "image": img, "mask": mask}
-
-def spawn_score_popup(position, now_ms):
-    surf = small_font.render("+1", True, SCORE_POPUP_COLOR)
-    x, y = position
-    return {"surf": surf, "x": float(x), "y": float(y), "spawn": now_ms, "alpha": 255}
-
-def draw_wobbling(image, item, now_ms):
-    wobble = WOBBLE_AMPLITUDE * math.sin(WOBBLE_SPEED * now_ms + item["phase"])
-    r = item["rect"].copy()
-    r.x += int(round(wobble))
-    screen.blit(image, r)
-
-# Growth: rescale all direction sprites and update rect without moving center
-def grow_axolotl():
-    current_w, current_h = state["ax_sprite"].get_size()
-    new_w = min(current_w + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[0])
-    new_h = min(current_h + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[1])
-    if (new_w, new_h) == (current_w, current_h):
-        return  # already at max size
-
-    global ax_img_idle, ax_img_down, ax_img_left, ax_img_up, ax_img_right
-    global ax_mask_idle, ax_mask_down, ax_mask_left, ax_mask_up, ax_mask_right
-    ax_img_idle, ax_img_down, ax_img_left, ax_img_up, ax_img_right = load_scaled_axolotl((new_w, new_h))
-    ax_mask_idle  = pygame.mask.from_surface(ax_img_idle)
-    ax_mask_down  = pygame.mask.from_surface(ax_img_down)
-    ax_mask_left  = pygame.mask.from_surface(ax_img_left)
-    ax_mask_up    = pygame.mask.from_surface(ax_img_up)
-    ax_mask_right = pygame.mask.from_surface(ax_img_right)
-
-    center = state["ax_rect"].center
-    state["ax_sprite"] = ax_img_idle
-    state["ax_rect"] = ax_img_idle.get_rect(center=center)
-    state["ax_mask"] = ax_mask_idle
+def draw_profile_overlay():
+    """Per-phase p50/p95/p99 in ms and entity counts, top right.
+
+    Percentiles are recomputed every ``PROFILE_OVERLAY_REFRESH`` frames so
+    the overlay itself stays cheap and readable.
+    """
+    if profiler.frames % PROFILE_OVERLAY_REFRESH == 0 or not profile_lines:
+        stats = profiler.percentiles(exclude=("tick",))
+        profile_lines[:] = ["phase  p50 / p95 / p99 ms"]
+        for phase, (p50, p95, p99) in stats.items():
+            profile_lines.append(f"{phase}  {p50:.2f} / {p95:.2f} / {p99:.2f}")
+        counts = profiler.latest_counts()
+        profile_lines.append("  ".join(f"{name}: {counts[name]}" for name in PROFILE_ENTITIES))
+        quality = f"quality: {scene.quality['name']}"
+        if governor is not None:
+            quality += (f" (auto, tier {governor.tier}, {governor.average_ms:.1f}"
+                        f" / {governor.budget_ms:.1f} ms, {governor.changes} changes)")
+        profile_lines.append(quality)
+
+    y = 10
+    for line in profile_lines:
+        surf = text_cache.get(line, small_font, PROFILE_OVERLAY_COLOR)
+        renderer.blit(surf, (SCREEN_WIDTH - surf.get_width() - 10, y))
+        y += 22
 
 # -------------------------
 # High score helpers
@@ -216,267 +177,266 @@ def load_high_scores():
         return []
 
 def save_high_scores(scores):
+    # Write a temp file and swap it in, so a crash never leaves half a board
+    tmp = f"{HIGH_SCORES_FILE}.tmp"
     try:
-        with open(HIGH_SCORES_FILE, "w", encoding="utf-8") as f:
+        with open(tmp, "w", encoding="utf-8") as f:
             json.dump(scores, f)
+        os.replace(tmp, HIGH_SCORES_FILE)
     except Exception:
         pass
 
 def submit_high_score(scores, new_score):
     # returns (updated_scores, qualifies: bool, rank: int)
-    arr = scores[:] + [int(new_score)]
-    arr = sorted(arr, reverse=True)[:MAX_HIGH_SCORES]
-    rank = arr.index(int(new_score)) + 1
+    new_score = int(new_score)
+    # Rank among every score, even when it falls off the end of the board
+    rank = 1 + sum(1 for s in scores if s > new_score)
+    arr = sorted(scores + [new_score], reverse=True)[:MAX_HIGH_SCORES]
     qualifies = rank <= MAX_HIGH_SCORES
     return arr, qualifies, rank
 
-def reset_game_state():
-    now = pygame.time.get_ticks()
-    s = {
-        "ax_rect": new_axolotl_rect(),
-        "ax_sprite": ax_img_idle,
-        "ax_mask": ax_mask_idle,
-        "lives": 3,
-        "has_shield": False,
-        "starfruits": [],
-        "turtles": [],
-        "jellies": [],
-        "score_popups": [],
-        "starfruit_spawns": 0,
-        "last_starfruit_spawn": now,
-        "last_jelly_spawn": now,
-        "game_over": False,
-        "score": 0,                # score counter
-        "score_submitted": False,  # high score submitted flag
-        "new_high": False,         # whether this run hit the board
-        "rank": None,              # rank on the board
-    }
-    # Spawn a turtle power-up at the start of the game (retry until not overlapping axolotl)
-    t = spawn_turtle(now)
-    while t["rect"].colliderect(s["ax_rect"]):
-        t = spawn_turtle(now)
-    s["turtles"].append(t)
-    return s
+def record_score(score, ticks=None):
+    """Add a finished run to the board and queue it for saving.
+
+    Returns (top scores, qualifies, rank). With the leaderboard open the rank
+    is among every run ever played (from ``ranks``, in memory); nothing here
+    touches the disk or the database, ``score_writer`` saves the run on its
+    own thread.
+    """
+    updated, qualifies, rank = submit_high_score(high_scores, score)
+    if ranks is not None:
+        rank = ranks.rank(score)
+        ranks.add(score)
+    high_scores[:] = updated
+    score_writer.submit((score, time.time(), ticks))
+    return updated, qualifies, rank
+
+def close_score_writer():
+    # The writer closes the leaderboard itself once it is done with it, so a
+    # slow last batch isn't cut off if this times out
+    score_writer.close(SCORE_WRITER_CLOSE_TIMEOUT)
+
+def new_run():
+    """Fresh game state with a known seed, plus its input recorder (if recording)."""
+    seed = random.randrange(2**62)
+    run_state = reset_game_state(assets, seed)
+    if telemetry is not None:
+        telemetry.start_run(seed)
+    if args.no_record:
+        return run_state, None
+    path = os.path.join(REPLAY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{seed}.axr")
+    return run_state, Recorder(path, seed)
 
 # -------------------------
-# Initialize
+# Game (only when run as a script, so the helpers above can be imported)
 # -------------------------
-high_scores = load_high_scores()
-state = reset_game_state()
+if __name__ == "__main__":
+    args = parse_args()
+    render_fps = args.fps if args.fps is not None else (0 if args.vsync else FPS)
 
-# -------------------------
-# Game loop
-# -------------------------
-running = True
-while running:
-    dt = clock.tick(FPS)
-    now = pygame.time.get_ticks()
-
-    # Events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    # -------------------------
+    # Init pygame
+    # -------------------------
+    pygame.init()
+    pygame.display.set_caption("Axolotl")
+    if args.backend == "texture":
+        if TextureRenderer is None:
+            sys.exit("--backend texture needs pygame's SDL2 video module (pygame._sdl2.video)")
+        # An SDL renderer owns the window; there is no display surface
+        window, sdl_renderer, _ = open_window(
+            (SCREEN_WIDTH, SCREEN_HEIGHT), "Axolotl", software=args.software_renderer, vsync=args.vsync
+        )
+    elif args.vsync:
+        # SDL only honours vsync for scaled or OpenGL windows
+        try:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+        except pygame.error:
+            screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    else:
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    clock = pygame.time.Clock()
+    font = pygame.font.Font(resolve_asset(ASSET_DIR, FONT_PATH), 24)
+    small_font = pygame.font.Font(resolve_asset(ASSET_DIR, FONT_PATH), 20)
 
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_ESCAPE]:
-        running = False
 
-    # Update
-    if not state["game_over"]:
-        # Movement: Arrow keys and WASD
-        dx = int(keys[pygame.K_RIGHT] or keys[pygame.K_d]) - int(keys[pygame.K_LEFT] or keys[pygame.K_a])
-        dy = int(keys[pygame.K_DOWN]  or keys[pygame.K_s]) - int(keys[pygame.K_UP]   or keys[pygame.K_w])
+    text_cache = TextCache(SHADOW_OFFSET, max_entries=TEXT_CACHE_MAX_ENTRIES)
 
-        # Normalize diagonal (keeps speed consistent)
-        if dx != 0 or dy != 0:
-            length = math.sqrt(dx*dx + dy*dy)
-            ux, uy = dx / length, dy / length
-            move_x = int(round(ux * MOVE_SPEED))
-            move_y = int(round(uy * MOVE_SPEED))
-        else:
-            move_x = move_y = 0
-
-        # Move axolotl and clamp
-        state["ax_rect"].x += move_x
-        state["ax_rect"].y += move_y
-        clamp_rect_to_screen(state["ax_rect"])
-
-        # Choose sprite by direction
-        if move_x > 0:
-            state["ax_sprite"] = ax_img_right
-            state["ax_mask"] = ax_mask_right
-        elif move_x < 0:
-            state["ax_sprite"] = ax_img_left
-            state["ax_mask"] = ax_mask_left
-        elif move_y > 0:
-            state["ax_sprite"] = ax_img_down
-            state["ax_mask"] = ax_mask_down
-        elif move_y < 0:
-            state["ax_sprite"] = ax_img_up
-            state["ax_mask"] = ax_mask_up
-        else:
-            state["ax_sprite"] = ax_img_idle
-            state["ax_mask"] = ax_mask_idle
-
-        # Spawning: Starfruit (random positions, stationary with wobble)
-        if now - state["last_starfruit_spawn"] >= STARFRUIT_SPAWN_INTERVAL:
-            state["starfruits"].append(spawn_starfruit(now))
-            state["starfruit_spawns"] += 1
-            state["last_starfruit_spawn"] = now
-
-            # Every N starfruit spawns, add a turtle shield
-            if state["starfruit_spawns"] % TURTLE_SPAWN_EVERY == 0:
-                state["turtles"].append(spawn_turtle(now))
-
-        # Spawning: Jellyfish (static image selection per spawn)
-        if now - state["last_jelly_spawn"] >= JELLYFISH_SPAWN_INTERVAL:
-            state["jellies"].append(spawn_jelly())
-            state["last_jelly_spawn"] = now
-
-        # Update jellyfish movement (no animation)
-        for j in state["jellies"]:
-            j["rect"].x += int(j["vx"])
-            j["rect"].y += int(j["vy"])
-
-        # Remove off-screen jellies
-        state["jellies"] = [j for j in state["jellies"] if j["rect"].top <= SCREEN_HEIGHT]
-
-        # Collisions: Jellyfish with axolotl
-        for j in state["jellies"][:]:
-            if state["ax_rect"].colliderect(j["rect"]):
-                offset = (j["rect"].x - state["ax_rect"].x, j["rect"].y - state["ax_rect"].y)
-                if state["ax_mask"].overlap(j["mask"], offset):
-                    if state["has_shield"]:
-                        state["has_shield"] = False
-                        state["jellies"].remove(j)
-                    else:
-                        state["lives"] -= 1
-                        state["jellies"].remove(j)
-                        if state["lives"] <= 0:
-                            state["game_over"] = True
-                            if not state["score_submitted"]:
-                                updated, qualifies, rank = submit_high_score(high_scores, state["score"])
-                                high_scores[:] = updated
-                                save_high_scores(high_scores)
-                                state["score_submitted"] = True
-                                state["new_high"] = qualifies
-                                state["rank"] = rank
-                            break
-
-        # Collisions: Starfruits with axolotl
-        for f in state["starfruits"][:]:
-            if state["ax_rect"].colliderect(f["rect"]):
-                offset = (f["rect"].x - state["ax_rect"].x, f["rect"].y - state["ax_rect"].y)
-                if state["ax_mask"].overlap(starfruit_mask, offset):
-                    pos = f["rect"].center
-                    state["starfruits"].remove(f)
-                    state["score"] += 1  # 1 point per starfruit
-                    grow_axolotl()       # grow on pickup
-                    state["score_popups"].append(spawn_score_popup(pos, now))
-                    if pickup_sound:
-                        pickup_sound.play()
-
-        # Collisions: Turtle shields with axolotl
-        for t in state["turtles"][:]:
-            if state["ax_rect"].colliderect(t["rect"]):
-                offset = (t["rect"].x - state["ax_rect"].x, t["rect"].y - state["ax_rect"].y)
-                if state["ax_mask"].overlap(turtle_mask, offset):
-                    state["turtles"].remove(t)
-                    state["has_shield"] = True
+    # Sound effects are synthesized (or read from the on-disk cache) once at startup
+    try:
+        sounds = SoundBank(channels=SOUND_CHANNELS)
+    except pygame.error:
+        sounds = None
 
+    # -------------------------
+    # Load and scale assets
+    # -------------------------
+    # Sprites and masks shared with the simulation (converted for the open window)
+    # Images are decoded and scaled once into an mmapped pack under .asset_cache/
+    asset_manager = AssetManager()
+    assets = load_assets(asset_manager)
+
+    # Background
+    background_img = asset_manager.load(
+        [("background", "Background.png", (SCREEN_WIDTH, SCREEN_HEIGHT), False)], group="background"
+    )["background"]
+
+    # Full redraw by default; --dirty-rects restores and pushes only changed regions.
+    # The texture backend uploads sprites once and redraws everything on the renderer.
+    if args.backend == "texture":
+        renderer = TextureRenderer(sdl_renderer, background_img)
+        renderer.preload(asset_surfaces(assets))
+    elif args.dirty_rects:
+        renderer = DirtyRectRenderer(screen, background_img, max_fraction=DIRTY_RECT_MAX_FRACTION)
     else:
-        # Game Over: allow restart
-           if keys[pygame.K_r]:
-            state = reset_game_state()
+        renderer = FullRenderer(screen, background_img)
+
+    # Everything drawn each frame (shared with the headless benchmarks)
+    scene = Scene(renderer, assets, text_cache, font, small_font)
+
+    # Fixed drawing detail, or --quality auto: step down through the tiers
+    # while frames take longer than the frame budget
+    governor = None
+    if args.quality == "auto":
+        governor = FrameGovernor(1000 / (render_fps or FPS), len(QUALITY_TIERS))
+    else:
+        scene.quality = QUALITY_TIERS[QUALITY_NAMES.index(args.quality)]
+    # Time the governor doesn't count as work: waiting for the frame clock,
+    # and with vsync, waiting for the display in the flip
+    idle_phases = ("tick", "flip") if args.vsync else ("tick",)
 
-    # Update score popups
-    for p in state["score_popups"][:]:
-        elapsed = now - p["spawn"]
-        p["y"] -= SCORE_POPUP_RISE_SPEED * dt
-        p["alpha"] = 255 - (elapsed / SCORE_POPUP_DURATION) * 255
-        if elapsed >= SCORE_POPUP_DURATION:
-            state["score_popups"].remove(p)
+    # Per-phase frame timings for the last PROFILE_FRAMES frames
+    profiler = FrameProfiler(PROFILE_PHASES, PROFILE_COUNTERS, capacity=PROFILE_FRAMES)
+    show_profile = args.profile
+    profile_lines = []
 
     # -------------------------
-    # Drawing
+    # Initialize
     # -------------------------
-    # Background first
-    screen.blit(background_img, (0, 0))
-
-    # Draw pickups with wobble
-    for f in state["starfruits"]:
-        draw_wobbling(starfruit_img, f, now)
-    for t in state["turtles"]:
-        draw_wobbling(turtle_img, t, now)
-
-    # Draw jellyfish (static images)
-    for j in state["jellies"]:
-        screen.blit(j["image"], j["rect"])
-
-    # Draw axolotl
-    screen.blit(state["ax_sprite"], state["ax_rect"])
-
-    # Draw score popups
-    for p in state["score_popups"]:
-        surf = p["surf"].copy()
-        surf.set_alpha(max(0, int(p["alpha"])))
-        rect = surf.get_rect(center=(int(p["x"]), int(p["y"])))
-        screen.blit(surf, rect)
-
-    # UI: Lives, score, and shield indicator
-    blit_text_with_shadow(f"Lives: {state['lives']}", font, HUD_STATS_COLOR, (10, 10))
-    blit_text_with_shadow(f"Score: {state['score']}", font, HUD_STATS_COLOR, (10, 46))
-
-    if state["has_shield"]:
-        blit_text_with_shadow("Shield Active", font, HUD_TEXT_COLOR, (10, 82))
-
-    # Game over overlay with Top 10
-    if state["game_over"]:
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 140))
-        screen.blit(overlay, (0, 0))
-
-        cx = SCREEN_WIDTH // 2
-        y = SCREEN_HEIGHT // 2 - 120
-
-        blit_text_with_shadow("Game Over", font, HUD_TEXT_COLOR, (cx, y), center=True)
-        y += 40
-
-        blit_text_with_shadow(f"Score: {state['score']}", font, HUD_TEXT_COLOR, (cx, y), center=True)
-        y += 36
-
-        if state.get("new_high"):
-            blit_text_with_shadow(
-                f"New High Score! Rank #{state.get('rank', '?')}",
-                font,
-                (255, 215, 0),
-                (cx, y),
-                center=True,
-            )
-            y += 36
-
-        blit_text_with_shadow("Top 10 High Scores", font, HUD_TEXT_COLOR, (cx, y), center=True)
-        y += 32
-
-        for idx, sc in enumerate(high_scores[:MAX_HIGH_SCORES], start=1):
-            is_this_run = (state["score_submitted"] and sc == state["score"] and idx == state.get("rank"))
-            color = (255, 215, 0) if is_this_run else (230, 230, 230)
-            blit_text_with_shadow(f"{idx:2d}. {sc}", small_font, color, (cx, y), center=True)
-            y += 24
-
-        blit_text_with_shadow(
-            "Press R to Restart or Esc to Quit",
-            font,
-            HUD_TEXT_COLOR,
-            (cx, SCREEN_HEIGHT // 2 + 220),
-            center=True,
-        )
+    # The run history, seeded from the JSON top 10 on first use; without
+    # SQLite the game keeps using the JSON file
+    leaderboard = open_leaderboard(LEADERBOARD_FILE, load_high_scores)
+    high_scores = leaderboard.top(MAX_HIGH_SCORES) if leaderboard is not None else load_high_scores()
+    # After this only the score writer thread uses the connection
+    ranks = RankTable(leaderboard.score_counts()) if leaderboard is not None else None
+    score_writer = BackgroundWriter(
+        partial(write_runs, leaderboard, fallback=lambda: save_high_scores(list(high_scores))),
+        max_queue=SCORE_WRITER_QUEUE,
+        name="score-writer",
+        on_close=leaderboard.close if leaderboard is not None else None,
+    )
+    # Also flush pending runs if the game loop dies with an exception
+    atexit.register(close_score_writer)
+    telemetry = None
+    if args.telemetry:
+        os.makedirs(TELEMETRY_DIR, exist_ok=True)
+        telemetry = Telemetry(os.path.join(TELEMETRY_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.jsonl.gz"))
+        atexit.register(telemetry.close)
+    state, recorder = new_run()
+    last_recorder = None      # the previous run's, possibly still being written
+    prev = None               # snapshot before the last step, for interpolation
+    accumulator = 0.0         # ms of real time not yet simulated
+    game_over_screen = None  # composed once when the game ends
 
-    pygame.display.flip()
+    # -------------------------
+    # Game loop
+    # -------------------------
+    running = True
+    while running:
+        profiler.begin_frame()
+        frame_ms = clock.tick(render_fps)
+        profiler.mark("tick")
+
+        # Events
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_profile = not show_profile
+
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_ESCAPE]:
+            running = False
 
-pygame.quit()
+        # Game Over: allow restart
+        if state["game_over"] and keys[pygame.K_r]:
+            state, recorder = new_run()
+            prev = None
+            game_over_screen = None
 
-sys.exit()
+        # Movement: Arrow keys and WASD
+        dx = int(keys[pygame.K_RIGHT] or keys[pygame.K_d]) - int(keys[pygame.K_LEFT] or keys[pygame.K_a])
+        dy = int(keys[pygame.K_DOWN]  or keys[pygame.K_s]) - int(keys[pygame.K_UP]   or keys[pygame.K_w])
+        profiler.mark("events")
+
+        # Update: as many fixed steps as the elapsed time covers. Leftover time
+        # carries over to the next frame.
+        accumulator = min(accumulator + frame_ms, MAX_STEPS_PER_FRAME * TICK_MS)
+        while accumulator >= TICK_MS:
+            accumulator -= TICK_MS
+            prev = snapshot(state)
+            if recorder is not None:
+                recorder.record(dx, dy, TICK_MS)
+            for sim_event in step(state, assets, dx, dy, TICK_MS, profiler=profiler):
+                if sounds and sim_event in EVENT_SOUNDS:
+                    sounds.play(EVENT_SOUNDS[sim_event])
+                if telemetry is not None:
+                    telemetry.sim_event(sim_event, state)
+                if sim_event == "game_over" and not state["score_submitted"]:
+                    _, qualifies, rank = record_score(state["score"], ticks=state["ticks"])
+                    state["score_submitted"] = True
+                    state["new_high"] = qualifies
+                    state["rank"] = rank
+                    game_over_screen = scene.compose_game_over_screen(state, high_scores[:MAX_HIGH_SCORES])
+                    if telemetry is not None:
+                        telemetry.end_run(state)
+                    if recorder is not None:
+                        recorder.finish(state)  # the writer thread closes the file
+                        last_recorder, recorder = recorder, None
+            profiler.mark("sim_events")
+
+        # -------------------------
+        # Drawing
+        # -------------------------
+        # Draw between the last two ticks, by how far into the next tick we are
+        scene.draw(state, game_over_screen, prev, accumulator / TICK_MS)
+        profiler.mark("draw")
+
+        if show_profile:
+            draw_profile_overlay()
+        profiler.mark("overlay")
+
+        renderer.present()
+        profiler.mark("flip")
+        counts = {name: len(state[name]) for name in PROFILE_ENTITIES}
+        counts["quality_tier"] = QUALITY_TIERS.index(scene.quality)
+        profiler.end_frame(counts)
+
+        work_ms = profiler.latest_total(exclude=idle_phases)
+        if governor is not None and governor.update(work_ms):
+            scene.quality = QUALITY_TIERS[governor.tier]
+        if telemetry is not None and profiler.frames % TELEMETRY_SAMPLE_FRAMES == 0:
+            telemetry.sample(state["ticks"], frame_ms, work_ms, counts)
+
+    if args.profile_out:
+        profiler.dump(args.profile_out)
+
+    # Quitting mid-run keeps the inputs so far, marked unfinished
+    if recorder is not None:
+        recorder.finish()
+        last_recorder = recorder
+    if last_recorder is not None:
+        last_recorder.wait(SCORE_WRITER_CLOSE_TIMEOUT)
+
+    close_score_writer()
+    if telemetry is not None:
+        if not state["game_over"]:
+            # Quit mid-run: log it so its play time is still counted
+            telemetry.end_run(state, finished=False)
+        telemetry.close()
+
+    pygame.quit()
+
+    sys.exit()
 
 
 
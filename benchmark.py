@@ -0,0 +1,339 @@
+"""Headless benchmarks for the game's update and draw paths.
+
+Each scenario builds a game state, then runs the same per-frame work as
+``axolotl_dash.py`` (``simulation.step`` plus ``Scene.draw`` and a flip)
+under the SDL dummy video driver. Reported per scenario:
+
+- ``ticks_per_sec``: simulation steps per second (update only)
+- ``mean_ms`` / ``p95_ms`` / ``p99_ms``: whole frame time, update + draw
+- ``alloc_kib``: peak Python memory allocated within a frame (tracemalloc)
+- ``net_blocks``: allocated blocks left behind per frame (leaks show up here)
+
+``--backend texture`` draws through ``texture_renderer`` (SDL's renderer;
+the software one under the dummy driver) instead of blitting surfaces.
+Runs with anything but the default drawing setup are stored under keys like
+``<scenario>[surface,dirty,q=low]`` or ``<scenario>[texture,software]``
+(see ``baseline_key``), so each setup is compared with its own baselines.
+
+Usage::
+
+    python benchmark.py                # run everything, compare with baselines
+    python benchmark.py --save         # store the results as the new baselines
+    python benchmark.py jellies_2000   # only some scenarios
+    python benchmark.py --backend texture
+
+Baselines are machine specific, so they live in an untracked JSON file.
+A run fails (exit status 1) when a gated metric is more than
+``--threshold`` slower than its baseline.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pygame
+
+import simulation
+from asset_manager import ASSET_DIR, AssetManager, resolve_asset
+from dirty_rects import DirtyRectRenderer, FullRenderer
+from scene import QUALITY_NAMES, QUALITY_TIERS, Scene
+from text_cache import TextCache
+
+BASELINE_FILE = "benchmark_baselines.json"
+DEFAULT_THRESHOLD = 0.25          # allowed slowdown before a run fails
+GATED_METRICS = ("mean_ms", "update_ms")  # lower is better; tails are too noisy to gate
+NOISE_FLOOR_MS = 0.1              # slowdowns smaller than this never fail a run
+FONT_PATH = "assets/DejaVuSans.ttf"
+ENDLESS_LIVES = 10**9             # keep stress scenarios running through hits
+
+
+# -------------------------
+# Setup
+# -------------------------
+def make_context(dirty_rects=False, backend="surface", software=False):
+    """Window, assets and scene, set up like the game but on the dummy driver."""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    size = (simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT)
+    if backend == "texture":
+        from texture_renderer import TextureRenderer, asset_surfaces, open_window
+        window, sdl_renderer, driver = open_window(size, "benchmark", software=software)
+    else:
+        screen = pygame.display.set_mode(size)
+        driver = "surface"
+    manager = AssetManager()
+    assets = simulation.load_assets(manager)
+    background = manager.load(
+        [("background", "Background.png", (simulation.SCREEN_WIDTH, simulation.SCREEN_HEIGHT), False)],
+        group="background",
+    )["background"]
+    if backend == "texture":
+        renderer = TextureRenderer(sdl_renderer, background)
+        renderer.preload(asset_surfaces(assets))
+    else:
+        renderer = (DirtyRectRenderer if dirty_rects else FullRenderer)(screen, background)
+    font_path = resolve_asset(ASSET_DIR, FONT_PATH)
+    scene = Scene(renderer, assets, TextCache(), pygame.font.Font(font_path, 24), pygame.font.Font(font_path, 20))
+    return {"assets": assets, "renderer": renderer, "scene": scene, "driver": driver}
+
+
+def _still(state):
+    return 0, 0
+
+
+def _circling(period):
+    """Bot that cycles right, down, left, up, changing every ``period`` ticks."""
+    moves = ((1, 0), (0, 1), (-1, 0), (0, -1))
+    return lambda state: moves[(state["ticks"] // period) % 4]
+
+
+def _fill_jellies(state, assets, n):
+    """Top up to ``n`` live jellies; the first fill is spread over the screen."""
+    jellies = state["jellies"]
+    first = len(jellies) == 0
+    while len(jellies) < n:
+        j = simulation.spawn_jelly(state, assets, state["now"])
+        if first:
+            jellies.y[j] = state["rng"].randint(-simulation.JELLYFISH_SIZE[1], simulation.SCREEN_HEIGHT)
+
+
+def _fill_pickups(state, starfruits, turtles):
+    while len(state["starfruits"]) < starfruits:
+        simulation.spawn_starfruit(state, state["now"])
+    while len(state["turtles"]) < turtles:
+        simulation.spawn_turtle(state, state["now"])
+
+
+# -------------------------
+# Scenarios
+# -------------------------
+# Each returns (state, tick, game_over_screen). ``tick(state)`` runs before
+# every step and returns the (dx, dy) input.
+def scenario_default(ctx):
+    state = simulation.reset_game_state(ctx["assets"], seed=1)
+    state["lives"] = ENDLESS_LIVES
+    return state, _circling(90), None
+
+
+def _jellies(n):
+    def scenario(ctx):
+        assets = ctx["assets"]
+        state = simulation.reset_game_state(assets, seed=1)
+        state["lives"] = ENDLESS_LIVES
+        bot = _circling(60)
+
+        def tick(state):
+            _fill_jellies(state, assets, n)
+            return bot(state)
+        return state, tick, None
+    return scenario
+
+
+def scenario_max_axolotl(ctx):
+    """A 200x200 axolotl hitting a jelly and eating a starfruit every frame."""
+    assets = ctx["assets"]
+    state = simulation.reset_game_state(assets, seed=1)
+    state["lives"] = ENDLESS_LIVES
+    while state["ax_size"] != simulation.AXOLOTL_MAX_SIZE:
+        simulation.grow_axolotl(state, assets)
+    bot = _circling(30)
+
+    def tick(state):
+        center = state["ax_rect"].center
+        rect = pygame.Rect((0, 0), simulation.JELLYFISH_SIZE)
+        rect.center = center
+        simulation.add_entity(state, "jellies", rect, vy=0.0, sprite=state["ticks"] % len(assets["jelly_masks"]))
+        rect = pygame.Rect((0, 0), simulation.STARFRUIT_SIZE)
+        rect.center = center
+        simulation.add_entity(state, "starfruits", rect, spawn_ms=state["now"])
+        return bot(state)
+    return state, tick, None
+
+
+def scenario_pickup_piles(ctx):
+    """Hundreds of uncollected starfruits and turtles being swept up."""
+    state = simulation.reset_game_state(ctx["assets"], seed=1)
+    state["lives"] = ENDLESS_LIVES
+    bot = _circling(120)
+
+    def tick(state):
+        _fill_pickups(state, 1500, 400)
+        return bot(state)
+    return state, tick, None
+
+
+def scenario_game_over(ctx):
+    """The game-over overlay on top of a busy final frame."""
+    assets, scene = ctx["assets"], ctx["scene"]
+    state = simulation.reset_game_state(assets, seed=1)
+    _fill_jellies(state, assets, 100)
+    _fill_pickups(state, 30, 5)
+    state.update(game_over=True, score=42, score_submitted=True, new_high=True, rank=3)
+    screen = scene.compose_game_over_screen(state, [90, 64, 42, 30, 12, 9, 5, 3, 2, 1])
+    return state, _still, screen
+
+
+SCENARIOS = {
+    "default": scenario_default,
+    "jellies_500": _jellies(500),
+    "jellies_2000": _jellies(2000),
+    "max_axolotl": scenario_max_axolotl,
+    "pickup_piles": scenario_pickup_piles,
+    "game_over": scenario_game_over,
+}
+
+
+# -------------------------
+# Running
+# -------------------------
+def _frame(ctx, state, tick, game_over_screen):
+    """One frame as the game runs it; returns (update_s, frame_s)."""
+    t0 = time.perf_counter()
+    dx, dy = tick(state)
+    simulation.step(state, ctx["assets"], dx, dy)
+    t1 = time.perf_counter()
+    ctx["scene"].draw(state, game_over_screen)
+    ctx["renderer"].present()
+    return t1 - t0, time.perf_counter() - t0
+
+
+def run_scenario(ctx, name, frames=300, warmup=30, alloc_frames=60):
+    state, tick, game_over_screen = SCENARIOS[name](ctx)
+    for _ in range(warmup):
+        _frame(ctx, state, tick, game_over_screen)
+
+    update = np.empty(frames)
+    total = np.empty(frames)
+    for k in range(frames):
+        update[k], total[k] = _frame(ctx, state, tick, game_over_screen)
+
+    # Allocation pass, separate because tracing slows everything down
+    peaks = []
+    tracemalloc.start()
+    blocks = sys.getallocatedblocks()
+    for _ in range(alloc_frames):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        _frame(ctx, state, tick, game_over_screen)
+        peaks.append(tracemalloc.get_traced_memory()[1] - current)
+    net_blocks = (sys.getallocatedblocks() - blocks) / alloc_frames
+    tracemalloc.stop()
+
+    total_ms = total * 1000
+    return {
+        "ticks_per_sec": round(frames / update.sum()),
+        "update_ms": round(float(update.mean() * 1000), 4),
+        "mean_ms": round(float(total_ms.mean()), 4),
+        "p95_ms": round(float(np.percentile(total_ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(total_ms, 99)), 4),
+        "alloc_kib": round(sum(peaks) / len(peaks) / 1024, 2),
+        "net_blocks": round(net_blocks, 2),
+    }
+
+
+def compare(results, baselines, threshold=DEFAULT_THRESHOLD):
+    """Regression messages for gated metrics more than ``threshold`` over baseline.
+
+    Differences below ``NOISE_FLOOR_MS`` are ignored, since tiny update
+    times easily double from timer jitter alone.
+    """
+    failures = []
+    for name, metrics in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        for metric in GATED_METRICS:
+            if metric not in base:
+                continue
+            slower = metrics[metric] - base[metric]
+            if metrics[metric] > base[metric] * (1 + threshold) and slower > NOISE_FLOOR_MS:
+                failures.append(
+                    f"{name}: {metric} {metrics[metric]:.3f} > baseline {base[metric]:.3f} (+{threshold:.0%})"
+                )
+    return failures
+
+
+def baseline_key(name, backend="surface", mode="full", quality=QUALITY_NAMES[0]):
+    """Baselines entry for scenario ``name`` drawn with the given setup.
+
+    ``mode`` is ``"full"`` or ``"dirty"`` for the surface backend and the SDL
+    renderer driver for the texture one. The default setup keeps the bare
+    scenario name.
+    """
+    if (backend, mode, quality) == ("surface", "full", QUALITY_NAMES[0]):
+        return name
+    tags = [backend, mode]
+    if quality != QUALITY_NAMES[0]:
+        tags.append(f"q={quality}")
+    return f"{name}[{','.join(tags)}]"
+
+
+def load_baselines(path=BASELINE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baselines(results, path=BASELINE_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Axolotl Dash headless benchmarks")
+    parser.add_argument("scenarios", nargs="*", help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--frames", type=int, default=300, help="timed frames per scenario")
+    parser.add_argument("--dirty-rects", action="store_true", help="draw with the dirty-rectangle renderer")
+    parser.add_argument("--backend", choices=("surface", "texture"), default="surface",
+                        help="draw by blitting surfaces or through SDL's renderer (default: %(default)s)")
+    parser.add_argument("--software-renderer", action="store_true",
+                        help="with --backend texture, don't try a GPU renderer first")
+    parser.add_argument("--quality", choices=QUALITY_NAMES, default=QUALITY_NAMES[0],
+                        help="drawing detail tier (default: %(default)s)")
+    parser.add_argument("--save", action="store_true", help="store these results as the baselines")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file (default: %(default)s)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown as a fraction (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    names = args.scenarios or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+
+    ctx = make_context(args.dirty_rects, args.backend, args.software_renderer)
+    mode = ctx["driver"] if args.backend == "texture" else ("dirty" if args.dirty_rects else "full")
+    ctx["scene"].quality = QUALITY_TIERS[QUALITY_NAMES.index(args.quality)]
+    baselines = load_baselines(args.baseline)
+    results = {}
+    print(f"renderer: {ctx['driver']}")
+    print(f"{'scenario':<14}{'ticks/s':>10}{'mean ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'KiB/frame':>11}{'blocks':>8}  vs baseline")
+    for name in names:
+        key = baseline_key(name, args.backend, mode, args.quality)
+        r = results[key] = run_scenario(ctx, name, frames=args.frames)
+        base = baselines.get(key, {}).get("mean_ms")
+        delta = f"{r['mean_ms'] / base - 1:+.1%}" if base else "-"
+        print(f"{name:<14}{r['ticks_per_sec']:>10}{r['mean_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['p99_ms']:>10.2f}{r['alloc_kib']:>11.1f}{r['net_blocks']:>8.1f}  {delta}")
+    pygame.quit()
+
+    if args.save:
+        save_baselines({**baselines, **results}, args.baseline)
+        print(f"saved baselines to {args.baseline}")
+        return 0
+
+    failures = compare(results, baselines, args.threshold)
+    for msg in failures:
+        print("REGRESSION", msg)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+import pygame
+
+
+class FullRenderer:
+    """Default renderer: redraw the whole background and flip every frame."""
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background
+
+    def clear(self):
+        self.screen.blit(self.background, (0, 0))
+
+    def blit(self, surf, dest, area=None):
+        return self.screen.blit(surf, dest, area)
+
+    def blits(self, seq):
+        self.screen.blits(seq, doreturn=False)
+
+    def present(self):
+        pygame.display.flip()
+
+
+class DirtyRectRenderer(FullRenderer):
+    """Redraw and push only the screen regions that changed.
+
+    Every rect drawn this frame is remembered. Next frame those regions are
+    restored from the background before anything is drawn, and only the old
+    plus new rects are sent to the display with ``pygame.display.update``.
+    When the dirty area passes ``max_fraction`` of the screen (e.g. the game
+    over overlay) it falls back to a full flip.
+    """
+
+    def __init__(self, screen, background, max_fraction=0.5):
+        super().__init__(screen, background)
+        self.screen_rect = screen.get_rect()
+        self.max_area = self.screen_rect.w * self.screen_rect.h * max_fraction
+        # Nothing is on screen yet, so the first frame restores everything
+        self._prev = [self.screen_rect]
+        self._cur = []
+        self.full_frames = 0
+        self.partial_frames = 0
+
+    def clear(self):
+        for r in self._prev:
+            self.screen.blit(self.background, r, r)
+
+    def blit(self, surf, dest, area=None):
+        r = self.screen.blit(surf, dest, area)
+        self._cur.append(r)
+        return r
+
+    def blits(self, seq):
+        self._cur.extend(self.screen.blits(seq))
+
+    def present(self):
+        dirty = self._prev + self._cur
+        if sum(r.w * r.h for r in dirty) > self.max_area:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self._prev = self._cur
+        self._cur = []
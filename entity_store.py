@@ -0,0 +1,101 @@
+import numpy as np
+import pygame
+
+
+class EntityStore:
+    """Struct-of-arrays storage for one kind of same-sized entity.
+
+    Each entity is a slot index into parallel NumPy arrays (position,
+    velocity, wobble phase, sprite index, spawn time, alive flag). Movement,
+    off-screen culling, AABB tests and wobble offsets run as one batched
+    operation over the arrays instead of a Python loop over dicts. Freed
+    slots go on a free list and are reused, so steady-state play does not
+    allocate.
+    """
+
+    def __init__(self, size, capacity=64):
+        self.w, self.h = size
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.int64)
+        self.vx = np.zeros(capacity, dtype=np.float64)
+        self.vy = np.zeros(capacity, dtype=np.float64)
+        self.phase = np.zeros(capacity, dtype=np.float64)
+        self.spawn_ms = np.zeros(capacity, dtype=np.float64)
+        self.sprite = np.zeros(capacity, dtype=np.int16)
+        self.alive = np.zeros(capacity, dtype=bool)
+        # Pop from the end so the lowest free slot is reused first
+        self._free = list(range(capacity - 1, -1, -1))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.alive)
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        for name in ("x", "y", "vx", "vy", "phase", "spawn_ms", "sprite", "alive"):
+            arr = getattr(self, name)
+            grown = np.zeros(new, dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        self._free[:0] = range(new - 1, old - 1, -1)
+
+    def spawn(self, x, y, vx=0.0, vy=0.0, phase=0.0, sprite=0, spawn_ms=0.0):
+        """Place a new entity with its top-left at ``(x, y)`` and return its slot."""
+        if not self._free:
+            self._grow()
+        i = self._free.pop()
+        self.x[i] = x
+        self.y[i] = y
+        self.vx[i] = vx
+        self.vy[i] = vy
+        self.phase[i] = phase
+        self.sprite[i] = sprite
+        self.spawn_ms[i] = spawn_ms
+        self.alive[i] = True
+        self.count += 1
+        return i
+
+    def kill(self, i):
+        self.alive[i] = False
+        self._free.append(int(i))
+        self.count -= 1
+
+    def live(self):
+        """Slots of all live entities, in slot order."""
+        return np.flatnonzero(self.alive)
+
+    def rect(self, i):
+        return pygame.Rect(int(self.x[i]), int(self.y[i]), self.w, self.h)
+
+    def move(self):
+        """Apply one tick of velocity, truncated to whole pixels like ``int(v)``."""
+        self.x += self.vx.astype(np.int64)
+        self.y += self.vy.astype(np.int64)
+
+    def _kill_many(self, gone):
+        if len(gone):
+            self.alive[gone] = False
+            self._free.extend(gone.tolist())
+            self.count -= len(gone)
+        return gone
+
+    def cull_below(self, bottom):
+        """Kill every entity whose top edge is past ``bottom``. Returns the slots."""
+        return self._kill_many(np.flatnonzero(self.alive & (self.y > bottom)))
+
+    def overlapping(self, rect):
+        """Slots of live entities whose bounding box intersects ``rect``."""
+        return np.flatnonzero(
+            self.alive
+            & (self.x < rect.right) & (self.x + self.w > rect.left)
+            & (self.y < rect.bottom) & (self.y + self.h > rect.top)
+        )
+
+    def wobble(self, now_ms, amplitude, speed, idx):
+        """Horizontal wobble offsets in whole pixels for the slots in ``idx``."""
+        return np.rint(amplitude * np.sin(speed * now_ms + self.phase[idx])).astype(np.int64)
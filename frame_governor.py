@@ -0,0 +1,87 @@
+"""Adaptive quality: trade visual detail for frame time when over budget.
+
+``FrameGovernor`` keeps a rolling average of how long each frame's work
+took (not counting the wait for the frame clock) and moves between quality
+tiers, 0 being the best. Hysteresis keeps it from flapping:
+
+- it drops a tier when the average is over ``degrade_at`` of the budget,
+- it only climbs back after ``restore_frames`` frames in a row under
+  ``restore_at`` of the budget, a much lower bar,
+- after any change it waits ``hold_frames`` frames, with a fresh average,
+  before judging the new tier.
+
+What each tier turns off is up to the caller (see ``scene.QUALITY_TIERS``).
+"""
+from collections import deque
+
+GOVERNOR_WINDOW = 30              # frames in the rolling average
+GOVERNOR_DEGRADE_AT = 0.9         # share of the budget that triggers a lower tier
+GOVERNOR_RESTORE_AT = 0.6         # share of the budget that counts as headroom
+GOVERNOR_HOLD_FRAMES = 60         # frames to settle after a tier change
+GOVERNOR_RESTORE_FRAMES = 180     # frames of headroom before a higher tier
+
+
+class FrameGovernor:
+    """Pick one of ``tiers`` quality tiers so frames fit in ``budget_ms``."""
+
+    def __init__(
+        self,
+        budget_ms,
+        tiers,
+        window=GOVERNOR_WINDOW,
+        degrade_at=GOVERNOR_DEGRADE_AT,
+        restore_at=GOVERNOR_RESTORE_AT,
+        hold_frames=GOVERNOR_HOLD_FRAMES,
+        restore_frames=GOVERNOR_RESTORE_FRAMES,
+    ):
+        if not restore_at < degrade_at:
+            raise ValueError("restore_at must be below degrade_at")
+        self.budget_ms = budget_ms
+        self.tiers = tiers
+        self.degrade_at = degrade_at
+        self.restore_at = restore_at
+        self.hold_frames = max(hold_frames, window)
+        self.restore_frames = restore_frames
+        self.tier = 0
+        self.changes = 0
+        self._window = deque(maxlen=window)
+        self._sum = 0.0
+        self._since_change = 0
+        self._headroom = 0
+
+    @property
+    def average_ms(self):
+        return self._sum / len(self._window) if self._window else 0.0
+
+    def _set_tier(self, tier):
+        self.tier = tier
+        self.changes += 1
+        self._window.clear()
+        self._sum = 0.0
+        self._since_change = 0
+        self._headroom = 0
+
+    def update(self, work_ms):
+        """Add one frame's work time; returns True if the tier changed."""
+        if len(self._window) == self._window.maxlen:
+            self._sum -= self._window[0]
+        self._window.append(work_ms)
+        self._sum += work_ms
+        self._since_change += 1
+        if self._since_change < self.hold_frames:
+            return False
+
+        average = self.average_ms
+        if average > self.budget_ms * self.degrade_at:
+            self._headroom = 0
+            if self.tier < self.tiers - 1:
+                self._set_tier(self.tier + 1)
+                return True
+        elif average < self.budget_ms * self.restore_at:
+            self._headroom += 1
+            if self.tier > 0 and self._headroom >= self.restore_frames:
+                self._set_tier(self.tier - 1)
+                return True
+        else:
+            self._headroom = 0
+        return False
@@ -0,0 +1,124 @@
+"""Per-phase frame timing kept in a fixed-size ring buffer.
+
+Each frame is split into named phases with ``mark(phase)``, which charges
+the time since the previous mark to that phase. Rows are stored in NumPy
+arrays so percentiles over the last few hundred frames are cheap, and the
+buffer can be written out as CSV or JSONL for offline comparison.
+"""
+import csv
+import json
+import time
+
+import numpy as np
+
+
+class FrameProfiler:
+    """Time ``phases`` and sample entity ``counters`` for the last ``capacity`` frames.
+
+    Usage per frame::
+
+        profiler.begin_frame()
+        ...                       # work
+        profiler.mark("events")   # time since begin_frame goes to "events"
+        ...
+        profiler.end_frame({"jellies": 12})
+
+    Marking a phase that is not in ``phases`` raises ``KeyError``. Phases
+    skipped in a frame record 0 and their time goes to the next mark.
+    """
+
+    def __init__(self, phases, counters=(), capacity=600, clock=time.perf_counter):
+        self.phases = tuple(phases)
+        self.counters = tuple(counters)
+        if len(set(self.phases + self.counters)) != len(self.phases) + len(self.counters):
+            raise ValueError("phase and counter names must be unique")
+        self.capacity = capacity
+        self.clock = clock
+        self.times = np.zeros((capacity, len(self.phases)), dtype=np.float32)  # ms
+        self.counts = np.zeros((capacity, len(self.counters)), dtype=np.int32)
+        self.frames = 0  # frames recorded so far, including overwritten ones
+        self._col = {name: k for k, name in enumerate(self.phases)}
+        self._row = [0.0] * len(self.phases)
+        self._last = None
+
+    def __len__(self):
+        return min(self.frames, self.capacity)
+
+    def begin_frame(self):
+        self._row = [0.0] * len(self.phases)
+        self._last = self.clock()
+
+    def mark(self, phase):
+        now = self.clock()
+        self._row[self._col[phase]] += (now - self._last) * 1000.0
+        self._last = now
+
+    def end_frame(self, counts=None):
+        slot = self.frames % self.capacity
+        self.times[slot] = self._row
+        if counts:
+            self.counts[slot] = [counts.get(name, 0) for name in self.counters]
+        else:
+            self.counts[slot] = 0
+        self.frames += 1
+
+    def _ordered(self, array):
+        """Recorded rows of ``array``, oldest first."""
+        n = len(self)
+        if self.frames <= self.capacity:
+            return array[:n]
+        slot = self.frames % self.capacity
+        return np.concatenate((array[slot:], array[:slot]))
+
+    def percentiles(self, qs=(50, 95, 99), exclude=()):
+        """``{phase: [p for q in qs]}`` in ms, plus ``"total"`` per frame.
+
+        Phases in ``exclude`` (e.g. time spent waiting for the frame clock)
+        are left out of the total.
+        """
+        n = len(self)
+        if not n:
+            return {}
+        times = self.times[:n]
+        keep = [k for k, name in enumerate(self.phases) if name not in exclude]
+        total = times[:, keep].sum(axis=1)
+        result = {}
+        for name, column in zip(self.phases + ("total",), np.column_stack((times, total)).T):
+            result[name] = np.percentile(column, qs).tolist()
+        return result
+
+    def latest_total(self, exclude=()):
+        """Total ms of the last recorded frame, leaving out phases in ``exclude``."""
+        if not self.frames:
+            return 0.0
+        slot = (self.frames - 1) % self.capacity
+        keep = [k for k, name in enumerate(self.phases) if name not in exclude]
+        return float(self.times[slot, keep].sum())
+
+    def latest_counts(self):
+        if not self.frames:
+            return dict.fromkeys(self.counters, 0)
+        slot = (self.frames - 1) % self.capacity
+        return dict(zip(self.counters, self.counts[slot].tolist()))
+
+    def rows(self):
+        """Recorded frames, oldest first, as dicts of frame number, phase ms and counts."""
+        first = self.frames - len(self)
+        times = self._ordered(self.times).tolist()
+        counts = self._ordered(self.counts).tolist()
+        for k, (t, c) in enumerate(zip(times, counts)):
+            row = {"frame": first + k}
+            row.update(zip(self.phases, (round(v, 4) for v in t)))
+            row.update(zip(self.counters, c))
+            yield row
+
+    def dump(self, path):
+        """Write the buffer to ``path``: JSONL if it ends in ``.jsonl``, CSV otherwise."""
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            if path.endswith(".jsonl"):
+                for row in self.rows():
+                    f.write(json.dumps(row) + "\n")
+            else:
+                writer = csv.DictWriter(f, fieldnames=("frame",) + self.phases + self.counters)
+                writer.writeheader()
+                writer.writerows(self.rows())
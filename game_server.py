@@ -0,0 +1,544 @@
+"""Multi-session game server: many headless games ticked on one event loop.
+
+Each connected client plays its own authoritative game, built by
+``simulation.reset_game_state`` and advanced by ``simulation.step``. One
+scheduler task steps every session together at ``TICK_MS``, using the
+latest input each client sent, and sends every client a compact delta of
+what changed in its game that tick. Every finished run is ranked with
+``axolotl_dash.submit_high_score`` and recorded in the same leaderboard
+database the game reads.
+
+Protocol (TCP, little endian). Every message is ``<HB`` body length and
+type, then the body:
+
+- client -> server: ``JOIN`` (``<q`` seed, -1 for random), ``INPUT``
+  (``<bb`` dx, dy, held until the next input) and ``LEAVE``
+- server -> client: ``WELCOME`` (``<Iqd`` session id, seed, tick ms),
+  ``DELTA`` (once per tick, see ``encode_delta``) and ``GAME_OVER``
+  (``<iiB`` score, rank, made the board)
+
+Jellies only ever move by their whole-pixel velocity, so a delta carries
+entities once, when they spawn, and clients move them locally::
+
+    python game_server.py serve                 # listen on 127.0.0.1:7777
+    python game_server.py client --clients 8    # stand-in bot clients
+    python game_server.py bench                 # sessions one core can tick
+"""
+import argparse
+import asyncio
+import os
+import random
+import struct
+import sys
+import time
+from functools import partial
+
+import numpy as np
+
+import simulation
+from axolotl_dash import LEADERBOARD_FILE, MAX_HIGH_SCORES, load_high_scores, save_high_scores, submit_high_score
+from leaderboard import RankTable, open_leaderboard, write_runs
+from score_writer import BackgroundWriter
+from sweep import random_bot
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7777
+MAX_CATCH_UP_TICKS = 5            # past this a stalled server drops ticks instead of bursting
+MAX_CLIENT_BUFFER = 256 * 1024    # bytes of unsent deltas before a client is dropped
+MAX_SESSIONS = 1024
+
+# Message types
+JOIN, INPUT, LEAVE = 1, 2, 3
+WELCOME, DELTA, GAME_OVER = 0x81, 0x82, 0x83
+
+_HEADER = struct.Struct("<HB")    # body length, message type
+_JOIN = struct.Struct("<q")
+_INPUT = struct.Struct("<bb")
+_WELCOME = struct.Struct("<Iqd")
+_GAME_OVER = struct.Struct("<iiB")
+# tick, score, lives, flags, events, axolotl rect, spawns, kills
+_DELTA = struct.Struct("<IiiBBhhHHHH")
+_SPAWN = struct.Struct("<BHhhbbB")  # kind, slot, x, y, vx, vy, sprite
+_KILL = struct.Struct("<BH")        # kind, slot
+
+KINDS = ("jellies", "starfruits", "turtles")
+EVENTS = ("pickup", "shield", "shield_used", "hit", "game_over")
+EVENT_BITS = {name: 1 << i for i, name in enumerate(EVENTS)}
+FLAG_SHIELD, FLAG_GAME_OVER = 1, 2
+
+
+class ProtocolError(ValueError):
+    pass
+
+
+def pack_message(kind, body=b""):
+    return _HEADER.pack(len(body), kind) + body
+
+
+async def read_message(reader):
+    """Next ``(type, body)`` from ``reader``; raises ``IncompleteReadError`` at EOF."""
+    size, kind = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    return kind, await reader.readexactly(size)
+
+
+# -------------------------
+# Deltas
+# -------------------------
+class _Seen:
+    """What a client has been told about one entity store so far."""
+
+    def __init__(self):
+        self.alive = np.zeros(0, dtype=bool)
+        self.spawn_ms = np.zeros(0)
+
+    def diff(self, store):
+        """``(spawned, killed)`` slots since the last call, and remember the new state.
+
+        A slot that was freed and reused shows up in both, with a new spawn time.
+        """
+        n = len(self.alive)
+        alive, spawn_ms = store.alive, store.spawn_ms
+        reused = self.alive & alive[:n] & (spawn_ms[:n] != self.spawn_ms)
+        killed = np.flatnonzero((self.alive & ~alive[:n]) | reused)
+        spawned = np.flatnonzero(alive[:n] & (~self.alive | reused))
+        if len(alive) > n:  # the store grew
+            spawned = np.concatenate((spawned, np.flatnonzero(alive[n:]) + n))
+            self.alive = alive.copy()
+            self.spawn_ms = spawn_ms.copy()
+        else:
+            np.copyto(self.alive, alive)
+            np.copyto(self.spawn_ms, spawn_ms)
+        return spawned, killed
+
+
+def encode_delta(state, seen, events=()):
+    """``DELTA`` body describing ``state`` relative to what ``seen`` holds.
+
+    Fixed header (tick, score, lives, shield/game-over flags, event bits,
+    axolotl rect, record counts), then one ``_KILL`` record per entity gone
+    and one ``_SPAWN`` record per new entity, with its position after this
+    tick's move and its velocity truncated the way ``EntityStore.move`` does.
+    """
+    spawns, kills = [], []
+    for k, kind in enumerate(KINDS):
+        store = state[kind]
+        spawned, killed = seen[kind].diff(store)
+        kills.extend(_KILL.pack(k, i) for i in killed.tolist())
+        for i in spawned.tolist():
+            spawns.append(_SPAWN.pack(
+                k, i, int(store.x[i]), int(store.y[i]),
+                int(store.vx[i]), int(store.vy[i]), int(store.sprite[i]),
+            ))
+    flags = (FLAG_SHIELD if state["has_shield"] else 0) | (FLAG_GAME_OVER if state["game_over"] else 0)
+    bits = 0
+    for name in events:
+        bits |= EVENT_BITS.get(name, 0)  # spawns travel as spawn records
+    ax = state["ax_rect"]
+    head = _DELTA.pack(
+        state["ticks"], state["score"], state["lives"], flags, bits,
+        ax.x, ax.y, ax.w, ax.h, len(spawns), len(kills),
+    )
+    return b"".join([head] + kills + spawns)
+
+
+class Mirror:
+    """A client's copy of its game, rebuilt from ``DELTA`` messages."""
+
+    def __init__(self):
+        self.ticks = 0
+        self.score = 0
+        self.lives = 0
+        self.has_shield = False
+        self.game_over = False
+        self.ax_rect = (0, 0, 0, 0)
+        self.events = ()
+        # kind -> {slot: [x, y, vx, vy, sprite]}
+        self.entities = {kind: {} for kind in KINDS}
+
+    def apply(self, body):
+        (ticks, self.score, self.lives, flags, bits, x, y, w, h, n_spawns, n_kills) = _DELTA.unpack_from(body)
+        if ticks > self.ticks and not self.game_over:
+            for entity in self.entities["jellies"].values():
+                entity[0] += entity[2]
+                entity[1] += entity[3]
+        self.ticks = ticks
+        self.has_shield = bool(flags & FLAG_SHIELD)
+        self.game_over = bool(flags & FLAG_GAME_OVER)
+        self.ax_rect = (x, y, w, h)
+        self.events = tuple(name for name in EVENTS if bits & EVENT_BITS[name])
+
+        offset = _DELTA.size
+        expected = offset + n_kills * _KILL.size + n_spawns * _SPAWN.size
+        if len(body) != expected:
+            raise ProtocolError(f"delta is {len(body)} bytes, expected {expected}")
+        for k, i in _KILL.iter_unpack(body[offset:offset + n_kills * _KILL.size]):
+            self.entities[KINDS[k]].pop(i, None)
+        offset += n_kills * _KILL.size
+        for k, i, ex, ey, vx, vy, sprite in _SPAWN.iter_unpack(body[offset:]):
+            self.entities[KINDS[k]][i] = [ex, ey, vx, vy, sprite]
+
+
+# -------------------------
+# Server
+# -------------------------
+class Session:
+    """One client's authoritative game."""
+
+    def __init__(self, session_id, seed, assets, writer):
+        self.id = session_id
+        self.seed = seed
+        self.state = simulation.reset_game_state(assets, seed)
+        self.writer = writer
+        self.dx = self.dy = 0
+        self.seen = {kind: _Seen() for kind in KINDS}
+
+
+class GameServer:
+    """Sessions for every connected client, stepped together by ``tick``.
+
+    ``high_scores`` is the top-10 list finished runs are ranked against, or
+    ``ranks`` (a ``leaderboard.RankTable`` of every run) when given;
+    ``score_writer``, if given, is handed ``(score, played_at, ticks)`` for
+    every finished run, whether or not it made the top 10.
+    """
+
+    def __init__(self, assets, high_scores=None, score_writer=None, tick_ms=simulation.TICK_MS, ranks=None):
+        self.assets = assets
+        self.high_scores = list(high_scores or [])
+        self.score_writer = score_writer
+        self.ranks = ranks
+        self.tick_ms = tick_ms
+        self.sessions = {}
+        self.ticks = 0
+        self.dropped_ticks = 0
+        self._next_id = 1
+        self._server = None
+        self._ticker = None
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, tick=True):
+        """Listen on ``host:port`` (0 for any free port) and, with ``tick``, start the scheduler.
+
+        Returns the bound port.
+        """
+        self._server = await asyncio.start_server(self._serve_client, host, port)
+        if tick:
+            self._ticker = asyncio.create_task(self._run_ticks())
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for session in list(self.sessions.values()):
+            session.writer.close()
+        self.sessions.clear()
+
+    # Scheduler
+    async def _run_ticks(self):
+        loop = asyncio.get_running_loop()
+        interval = self.tick_ms / 1000
+        due = loop.time()
+        while True:
+            behind = 0
+            while loop.time() >= due and behind < MAX_CATCH_UP_TICKS:
+                self.tick()
+                due += interval
+                behind += 1
+            if loop.time() >= due:
+                # Too far behind to catch up: skip ahead rather than burst
+                skipped = int((loop.time() - due) / interval) + 1
+                self.dropped_ticks += skipped
+                due += skipped * interval
+            await asyncio.sleep(due - loop.time())
+
+    def tick(self):
+        """Step every session once and send each client its delta."""
+        self.ticks += 1
+        for session in list(self.sessions.values()):
+            state = session.state
+            events = simulation.step(state, self.assets, session.dx, session.dy, self.tick_ms)
+            delta = pack_message(DELTA, encode_delta(state, session.seen, events))
+            if not self._send(session, delta):
+                continue
+            if state["game_over"]:
+                self._finish(session)
+
+    def _send(self, session, message):
+        writer = session.writer
+        if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_CLIENT_BUFFER:
+            # Deltas build on each other, so a client that can't keep up is dropped
+            self.sessions.pop(session.id, None)
+            writer.close()
+            return False
+        writer.write(message)
+        return True
+
+    def _finish(self, session):
+        score = session.state["score"]
+        self.high_scores, qualifies, rank = submit_high_score(self.high_scores, score)
+        if self.ranks is not None:
+            rank = self.ranks.rank(score)
+            self.ranks.add(score)
+        if self.score_writer is not None:
+            self.score_writer.submit((score, time.time(), session.state["ticks"]))
+        self.sessions.pop(session.id, None)
+        self._send(session, pack_message(GAME_OVER, _GAME_OVER.pack(score, rank, qualifies)))
+
+    # Connections
+    def _join(self, seed, writer):
+        if len(self.sessions) >= MAX_SESSIONS:
+            raise ProtocolError("server full")
+        if seed < 0:
+            seed = random.randrange(2**62)
+        session = Session(self._next_id, seed, self.assets, writer)
+        self._next_id += 1
+        self.sessions[session.id] = session
+        writer.write(pack_message(WELCOME, _WELCOME.pack(session.id, seed, self.tick_ms)))
+        # The starting entities, before the first tick
+        writer.write(pack_message(DELTA, encode_delta(session.state, session.seen)))
+        return session
+
+    async def _serve_client(self, reader, writer):
+        session = None
+        try:
+            while True:
+                kind, body = await read_message(reader)
+                if kind == INPUT and session is not None and session.id in self.sessions:
+                    dx, dy = _INPUT.unpack(body)
+                    session.dx, session.dy = max(-1, min(1, dx)), max(-1, min(1, dy))
+                elif kind == JOIN:
+                    if session is not None:
+                        self.sessions.pop(session.id, None)
+                    session = self._join(_JOIN.unpack(body)[0], writer)
+                elif kind == LEAVE:
+                    break
+                elif kind != INPUT:
+                    raise ProtocolError(f"unknown message type {kind}")
+        except (asyncio.IncompleteReadError, ConnectionError, ProtocolError, struct.error):
+            pass
+        finally:
+            if session is not None:
+                self.sessions.pop(session.id, None)
+            writer.close()
+
+
+# -------------------------
+# Stand-in client
+# -------------------------
+class StandInClient:
+    """Bot client: mirrors its game from deltas and steers with ``sweep.random_bot``."""
+
+    def __init__(self, reader, writer, bot_seed=0):
+        self.reader = reader
+        self.writer = writer
+        self.mirror = Mirror()
+        self.session_id = None
+        self.seed = None
+        self.result = None  # (score, rank, qualifies) once the game is over
+        self.deltas = 0
+        self.bytes = 0
+        self._bot = random_bot(bot_seed)
+        self._move = (0, 0)
+
+    @classmethod
+    async def connect(cls, host=DEFAULT_HOST, port=DEFAULT_PORT, bot_seed=0):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer, bot_seed)
+
+    async def join(self, seed=-1):
+        self.writer.write(pack_message(JOIN, _JOIN.pack(seed)))
+        kind, body = await read_message(self.reader)
+        if kind != WELCOME:
+            raise ProtocolError(f"expected WELCOME, got message type {kind}")
+        self.session_id, self.seed, _ = _WELCOME.unpack(body)
+
+    def send_input(self, dx, dy):
+        self.writer.write(pack_message(INPUT, _INPUT.pack(dx, dy)))
+
+    async def receive(self):
+        """Handle the next server message and return its type."""
+        kind, body = await read_message(self.reader)
+        self.bytes += _HEADER.size + len(body)
+        if kind == DELTA:
+            self.mirror.apply(body)
+            self.deltas += 1
+            move = self._bot({"ticks": self.mirror.ticks})
+            if move != self._move:
+                self._move = move
+                self.send_input(*move)
+        elif kind == GAME_OVER:
+            self.result = _GAME_OVER.unpack(body)
+        return kind
+
+    async def play(self, ticks):
+        """Play until the game ends or ``ticks`` deltas have arrived."""
+        while self.result is None and self.deltas <= ticks:
+            await self.receive()
+
+    async def close(self):
+        self.writer.write(pack_message(LEAVE))
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def run_clients(host, port, clients, ticks):
+    """Connect ``clients`` stand-ins, each playing up to ``ticks`` ticks; returns them."""
+    players = [await StandInClient.connect(host, port, bot_seed=n) for n in range(clients)]
+    for n, player in enumerate(players):
+        await player.join(seed=n)
+    await asyncio.gather(*(player.play(ticks) for player in players))
+    for player in players:
+        await player.close()
+    return players
+
+
+# -------------------------
+# Throughput
+# -------------------------
+class _NullTransport:
+    def get_write_buffer_size(self):
+        return 0
+
+
+class _CountingWriter:
+    """Stands in for a stream writer: counts bytes instead of sending them."""
+
+    def __init__(self):
+        self.transport = _NullTransport()
+        self.bytes = 0
+
+    def write(self, data):
+        self.bytes += len(data)
+
+    def is_closing(self):
+        return False
+
+    def close(self):
+        pass
+
+
+def measure_throughput(assets, sessions=64, ticks=600, seed=0):
+    """Tick ``sessions`` bot-driven games ``ticks`` times with no sockets.
+
+    Returns the mean ms per server tick, the number of sessions one core
+    could tick at the tick rate, and the delta bandwidth per session.
+    Games that end are restarted, so the load stays at ``sessions``.
+    """
+    server = GameServer(assets)
+    bots = {}
+    writers = []
+
+    def join(n):
+        writer = _CountingWriter()
+        writers.append(writer)
+        session = server._join(seed + n, writer)
+        bots[session.id] = random_bot(seed + n)
+
+    for n in range(sessions):
+        join(n)
+    elapsed = 0.0
+    for _ in range(ticks):
+        for session in server.sessions.values():
+            session.dx, session.dy = bots[session.id](session.state)
+        start = time.perf_counter()
+        server.tick()
+        elapsed += time.perf_counter() - start
+        for n in range(sessions - len(server.sessions)):
+            join(len(writers))
+
+    tick_ms = elapsed / ticks * 1000
+    per_session_ms = tick_ms / sessions
+    seconds = ticks * server.tick_ms / 1000
+    return {
+        "sessions": sessions,
+        "tick_ms": round(tick_ms, 4),
+        "per_session_us": round(per_session_ms * 1000, 2),
+        "max_sessions": int(server.tick_ms / per_session_ms),
+        "kib_per_session_s": round(sum(w.bytes for w in writers) / sessions / seconds / 1024, 2),
+    }
+
+
+# -------------------------
+# Command line
+# -------------------------
+async def _serve(args, assets):
+    # The game's run history; the JSON top 10 only without SQLite
+    board = open_leaderboard(LEADERBOARD_FILE, load_high_scores)
+    if board is not None:
+        # The database is only touched here and then on the writer thread
+        server = GameServer(assets, board.top(MAX_HIGH_SCORES), ranks=RankTable(board.score_counts()))
+    else:
+        server = GameServer(assets, load_high_scores())
+    server.score_writer = writer = BackgroundWriter(
+        partial(write_runs, board, fallback=lambda: save_high_scores(list(server.high_scores))),
+        name="server-score-writer",
+        on_close=board.close if board is not None else None,
+    )
+    port = await server.start(args.host, args.port)
+    print(f"serving on {args.host}:{port} at {1000 / server.tick_ms:.0f} Hz")
+    try:
+        while True:
+            await asyncio.sleep(5)
+            print(f"{len(server.sessions)} sessions, tick {server.ticks}, {server.dropped_ticks} ticks dropped")
+    finally:
+        await server.close()
+        writer.close()   # closes the board on its own thread when done
+
+
+async def _clients(args):
+    start = time.perf_counter()
+    players = await run_clients(args.host, args.port, args.clients, args.ticks)
+    elapsed = time.perf_counter() - start
+    for p in players:
+        score, rank, _ = p.result or (p.mirror.score, None, False)
+        print(f"session {p.session_id} (seed {p.seed}): {p.deltas} deltas, {p.bytes / 1024:.1f} KiB,"
+              f" score {score}" + (f", rank {rank}" if rank else ""))
+    print(f"{sum(p.deltas for p in players)} deltas in {elapsed:.1f}s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Axolotl Dash multi-session server")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("serve", "client"):
+        p = sub.add_parser(name)
+        p.add_argument("--host", default=DEFAULT_HOST)
+        p.add_argument("--port", type=int, default=DEFAULT_PORT)
+    sub.choices["client"].add_argument("--clients", type=int, default=4, help="stand-in clients to run")
+    sub.choices["client"].add_argument("--ticks", type=int, default=10 * simulation.FPS,
+                                       help="ticks each client plays at most (default: %(default)s)")
+    bench = sub.add_parser("bench", help="measure how many sessions one core can tick")
+    bench.add_argument("--sessions", type=int, nargs="+", default=[16, 64, 256])
+    bench.add_argument("--ticks", type=int, default=600)
+    args = parser.parse_args(argv)
+
+    if args.command == "client":
+        asyncio.run(_clients(args))
+        return 0
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    assets = simulation.load_assets()
+    if args.command == "serve":
+        try:
+            asyncio.run(_serve(args, assets))
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    print(f"{'sessions':>8}{'tick ms':>10}{'us/session':>12}{'max @60Hz':>11}{'KiB/s each':>12}")
+    for n in args.sessions:
+        r = measure_throughput(assets, n, args.ticks)
+        print(f"{n:>8}{r['tick_ms']:>10.2f}{r['per_session_us']:>12.1f}{r['max_sessions']:>11}"
+              f"{r['kib_per_session_s']:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
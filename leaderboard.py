@@ -0,0 +1,201 @@
+"""Persistent leaderboard with full run history, backed by SQLite.
+
+Every run is a row in ``runs`` with its score and when it was played. An
+index on ``score`` serves top-K queries straight from the B-tree, and a
+``score_counts`` table (kept up to date by a trigger) holds how many runs
+reached each score, so the rank of a score is a sum over the distinct
+higher scores rather than a sort of every run. Each write is its own
+transaction, so a crash leaves either the old or the new board on disk.
+
+The schema version is kept in ``PRAGMA user_version``. Opening an older
+database runs the migrations from its version up; a database from a newer
+version of the game is refused with ``LeaderboardError``.
+
+``open_leaderboard`` and ``write_runs`` are the pieces the game and the
+game server share: both hand finished runs to a ``BackgroundWriter`` whose
+batches go to ``write_runs``, and rank new runs with a ``RankTable`` loaded
+once at startup, so nothing queries the database during play.
+"""
+import time
+from bisect import bisect_right, insort
+
+try:
+    import sqlite3
+except ImportError:  # Python built without SQLite
+    sqlite3 = None
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id        INTEGER PRIMARY KEY,
+    score     INTEGER NOT NULL,
+    played_at REAL    NOT NULL,
+    ticks     INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score DESC, id);
+CREATE TABLE IF NOT EXISTS score_counts (
+    score INTEGER PRIMARY KEY,
+    n     INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS count_run AFTER INSERT ON runs BEGIN
+    INSERT INTO score_counts (score, n) VALUES (new.score, 1)
+        ON CONFLICT (score) DO UPDATE SET n = n + 1;
+END;
+"""
+
+# Scripts that bring the schema from version k to k + 1; each runs in one
+# transaction and may run twice if two processes open a new board at once
+_MIGRATIONS = [
+    # 1: runs, plus score_counts rebuilt from any runs already there
+    _SCHEMA + """
+    DELETE FROM score_counts;
+    INSERT INTO score_counts (score, n) SELECT score, COUNT(*) FROM runs GROUP BY score;
+    """,
+]
+LEADERBOARD_SCHEMA_VERSION = len(_MIGRATIONS)
+
+
+class LeaderboardError(ValueError):
+    pass
+
+
+class Leaderboard:
+    """All recorded runs in the SQLite database at ``path``.
+
+    Use ``":memory:"`` for a throwaway board. Ranks count ties the way the
+    JSON board does: a score ranks just after every strictly higher score.
+    """
+
+    def __init__(self, path, check_same_thread=True):
+        self.path = path
+        self.conn = sqlite3.connect(path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            self._migrate()
+        except BaseException:
+            self.conn.close()  # also rolls back a half-run migration
+            raise
+
+    def _migrate(self):
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > LEADERBOARD_SCHEMA_VERSION:
+            raise LeaderboardError(
+                f"{self.path}: schema version {version} is newer than this game's ({LEADERBOARD_SCHEMA_VERSION})"
+            )
+        for k in range(version, LEADERBOARD_SCHEMA_VERSION):
+            self.conn.executescript(f"BEGIN IMMEDIATE;\n{_MIGRATIONS[k]}\nPRAGMA user_version={k + 1};\nCOMMIT;")
+
+    def __len__(self):
+        return self.conn.execute("SELECT COALESCE(SUM(n), 0) FROM score_counts").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, score, played_at=None, ticks=None):
+        """Store one run and return its id."""
+        if played_at is None:
+            played_at = time.time()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO runs (score, played_at, ticks) VALUES (?, ?, ?)",
+                (int(score), played_at, ticks),
+            )
+        return cur.lastrowid
+
+    def record_many(self, runs):
+        """Store ``(score, played_at, ticks)`` tuples in a single transaction.
+
+        Runs with ``played_at=None`` are stamped with the current time.
+        """
+        now = time.time()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO runs (score, played_at, ticks) VALUES (?, ?, ?)",
+                ((int(score), now if played_at is None else played_at, ticks) for score, played_at, ticks in runs),
+            )
+
+    def top(self, k):
+        """The ``k`` best scores, highest first."""
+        rows = self.conn.execute("SELECT score FROM runs ORDER BY score DESC, id LIMIT ?", (k,))
+        return [score for (score,) in rows]
+
+    def score_counts(self):
+        """``(score, runs)`` pairs for every score reached, lowest first."""
+        return self.conn.execute("SELECT score, n FROM score_counts ORDER BY score").fetchall()
+
+    def rank(self, score):
+        """1-based position ``score`` has (or would have) on the board."""
+        higher = self.conn.execute(
+            "SELECT COALESCE(SUM(n), 0) FROM score_counts WHERE score > ?", (int(score),)
+        ).fetchone()[0]
+        return higher + 1
+
+    def history(self, limit=100, before_id=None):
+        """Most recent runs first as dicts; pass the last ``id`` seen to page back."""
+        query = "SELECT id, score, played_at, ticks FROM runs"
+        if before_id is None:
+            rows = self.conn.execute(query + " ORDER BY id DESC LIMIT ?", (limit,))
+        else:
+            rows = self.conn.execute(query + " WHERE id < ? ORDER BY id DESC LIMIT ?", (before_id, limit))
+        return [dict(zip(("id", "score", "played_at", "ticks"), row)) for row in rows]
+
+
+class RankTable:
+    """In-memory run counts per score, for ranking without a query.
+
+    Seed it from ``Leaderboard.score_counts`` when the board opens and
+    ``add`` every run as it finishes (before it is even written), and
+    ``rank`` agrees with ``Leaderboard.rank`` over all of those runs.
+    """
+
+    def __init__(self, counts=()):
+        self._scores = []  # distinct scores, ascending
+        self._counts = {}
+        for score, n in counts:
+            self.add(score, n)
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def add(self, score, n=1):
+        score = int(score)
+        if score not in self._counts:
+            insort(self._scores, score)
+            self._counts[score] = 0
+        self._counts[score] += n
+
+    def rank(self, score):
+        """1-based position ``score`` has (or would have): one past every higher run."""
+        counts = self._counts
+        return 1 + sum(counts[s] for s in self._scores[bisect_right(self._scores, int(score)):])
+
+
+def open_leaderboard(path, initial_scores=None):
+    """The run history at ``path``, opened for use from a writer thread.
+
+    A new (empty) board is seeded with ``initial_scores()``, e.g. the old
+    JSON top 10. Returns ``None`` when SQLite is unavailable or the database
+    can't be opened (or is from a newer game); callers then keep a JSON top
+    10 instead.
+    """
+    if sqlite3 is None:
+        return None
+    try:
+        board = Leaderboard(path, check_same_thread=False)
+        if not len(board) and initial_scores is not None:
+            board.record_many((score, None, None) for score in initial_scores())
+        return board
+    except Exception:
+        return None
+
+
+def write_runs(board, runs, fallback=None):
+    """Persist queued ``(score, played_at, ticks)`` runs. Runs on a score writer thread.
+
+    Without a ``board``, ``fallback()`` saves the caller's in-memory top 10
+    instead (it already includes every queued run).
+    """
+    if board is not None:
+        board.record_many(runs)
+    elif fallback is not None:
+        fallback()
@@ -0,0 +1,192 @@
+"""Input recordings of whole runs, and fast headless playback.
+
+A run is fully determined by its RNG seed and the ``(dx, dy, dt)`` passed
+to ``simulation.step`` every frame, so that is all a recording stores:
+
+- a fixed-size header: magic, version, seed, and (once the run is over)
+  the final ticks, score and lives
+- a zlib stream of packed per-frame records (int8 dx, int8 dy, float64 dt)
+
+``Recorder`` buffers frames in a NumPy array and hands full chunks to a
+``BackgroundWriter``, so the game loop only pays for one array store per
+frame. The writer thread also opens the file and, after ``finish``, ends
+the stream and fills in the header, so no replay I/O happens in a frame.
+Each chunk is sync-flushed, so a recording cut short by a crash still
+plays back up to its last chunk.
+
+Playback::
+
+    python replay.py replays/*.axr      # re-simulate and check the results
+"""
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+import simulation
+from score_writer import BackgroundWriter
+
+REPLAY_MAGIC = b"AXRP"
+REPLAY_VERSION = 2                 # bumped whenever game rules change (2: pickups expire)
+REPLAY_CHUNK_FRAMES = 1024         # frames buffered before a chunk is written
+FRAME_DTYPE = np.dtype([("dx", "i1"), ("dy", "i1"), ("dt", "<f8")])
+
+_HEADER = struct.Struct("<4sHxxqqqq")  # magic, version, seed, ticks, score, lives
+UNFINISHED = -1                        # ticks/score/lives of a run that never ended
+
+
+class ReplayError(ValueError):
+    pass
+
+
+class Recorder:
+    """Stream one run's inputs to ``path``.
+
+    Call ``record`` once per ``step`` with the same arguments, then
+    ``finish`` with the final state. All file access happens on a
+    background thread; ``wait`` blocks until it has closed the file.
+    """
+
+    def __init__(self, path, seed, chunk_frames=REPLAY_CHUNK_FRAMES):
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._buf = np.zeros(chunk_frames, dtype=FRAME_DTYPE)
+        self._n = 0
+        self._file = None  # opened by the writer thread
+        self._result = None
+        self._zip = zlib.compressobj(9)
+        self._writer = BackgroundWriter(self._write_chunks, name="replay-writer", on_close=self._end_stream)
+
+    def record(self, dx, dy, dt):
+        self._buf[self._n] = (dx, dy, dt)
+        self._n += 1
+        self.frames += 1
+        if self._n == len(self._buf):
+            self._flush_buffer()
+
+    def _flush_buffer(self):
+        if self._n:
+            self._writer.submit(self._buf[:self._n].tobytes())
+            self._n = 0
+
+    def finish(self, state=None):
+        """Queue the remaining frames and, if given, the final result.
+
+        Returns at once; the writer thread then ends the stream, fills in the
+        header and closes the file.
+        """
+        if state is not None:
+            self._result = (state["ticks"], state["score"], state["lives"])
+        self._flush_buffer()
+        self._writer.close(timeout=0)
+
+    def wait(self, timeout=5.0):
+        """Wait up to ``timeout`` s for the file to be closed; True if it was."""
+        return self._writer.close(timeout)
+
+    # The rest runs on the writer thread
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._file = open(self.path, "wb")
+        self._file.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, UNFINISHED, UNFINISHED, UNFINISHED))
+
+    def _write_chunks(self, chunks):
+        if self._file is None:
+            self._open()
+        for raw in chunks:
+            self._file.write(self._zip.compress(raw))
+        self._file.write(self._zip.flush(zlib.Z_SYNC_FLUSH))
+        self._file.flush()
+
+    def _end_stream(self):
+        if self._file is None:
+            self._open()
+        self._file.write(self._zip.flush())
+        if self._result is not None:
+            self._file.seek(0)
+            self._file.write(_HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, self.seed, *self._result))
+        self._file.close()
+
+
+def load_replay(path):
+    """``(header dict, frames array)`` for the recording at ``path``."""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        body = f.read()
+    if len(head) < _HEADER.size:
+        raise ReplayError(f"{path}: not a replay (too short)")
+    magic, version, seed, ticks, score, lives = _HEADER.unpack(head)
+    if magic != REPLAY_MAGIC:
+        raise ReplayError(f"{path}: not a replay")
+    if version != REPLAY_VERSION:
+        raise ReplayError(f"{path}: unsupported replay version {version}")
+
+    # decompressobj tolerates a missing end of stream (a run cut short)
+    try:
+        raw = zlib.decompressobj().decompress(body)
+    except zlib.error as exc:
+        raise ReplayError(f"{path}: corrupt input stream ({exc})") from None
+    usable = len(raw) - len(raw) % FRAME_DTYPE.itemsize
+    frames = np.frombuffer(raw[:usable], dtype=FRAME_DTYPE)
+    header = {"seed": seed, "ticks": ticks, "score": score, "lives": lives, "finished": ticks != UNFINISHED}
+    return header, frames
+
+
+def play(frames, seed, assets):
+    """Re-simulate ``frames`` from ``seed``; returns the final state."""
+    state = simulation.reset_game_state(assets, seed)
+    step = simulation.step
+    for dx, dy, dt in zip(frames["dx"].tolist(), frames["dy"].tolist(), frames["dt"].tolist()):
+        step(state, assets, dx, dy, dt)
+    return state
+
+
+def verify_replay(path, assets):
+    """Play ``path`` back; returns ``(ok, header, state)``.
+
+    ``ok`` is True when the recording is finished and the re-simulated
+    ticks, score and lives match what the game recorded.
+    """
+    header, frames = load_replay(path)
+    state = play(frames, header["seed"], assets)
+    ok = header["finished"] and (state["ticks"], state["score"], state["lives"]) == (
+        header["ticks"], header["score"], header["lives"]
+    )
+    return ok, header, state
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play back Axolotl Dash recordings headlessly")
+    parser.add_argument("replays", nargs="+", help="recording files (.axr)")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    assets = simulation.load_assets()
+    failed = 0
+    for path in args.replays:
+        start = time.perf_counter()
+        try:
+            ok, header, state = verify_replay(path, assets)
+        except (OSError, ReplayError) as exc:
+            print(f"{path}: {exc}")
+            failed += 1
+            continue
+        elapsed = time.perf_counter() - start
+        speedup = state["now"] / 1000 / elapsed if elapsed else float("inf")
+        status = "ok" if ok else ("UNFINISHED" if not header["finished"] else "MISMATCH")
+        print(
+            f"{path}: {status}  score {state['score']} (recorded {header['score']})"
+            f"  lives {state['lives']} (recorded {header['lives']})"
+            f"  {state['ticks']} ticks in {elapsed:.3f}s = {speedup:.0f}x real time"
+        )
+        failed += not ok
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Drawing one frame of game state.
+
+``Scene`` holds the sprites, fonts and text cache the frame needs and draws
+through a renderer from ``dirty_rects``. The game window and the headless
+benchmarks both use it, so they exercise the same draw path.
+"""
+import numpy as np
+import pygame
+
+from simulation import SCREEN_WIDTH, SCREEN_HEIGHT, SCORE_POPUP_DURATION, SCORE_POPUP_RISE_SPEED
+
+# -------------------------
+# Config
+# -------------------------
+WOBBLE_AMPLITUDE = 6             # px
+WOBBLE_SPEED     = 0.006         # radians per ms
+
+SCORE_POPUP_COLOR   = (200, 80, 255)  # bright purple for score popups
+SCORE_POPUP_ALPHA_STEPS = 16          # pre-faded copies of the popup text
+
+HUD_TEXT_COLOR = (255, 240, 200)  # warm sand tone to match palette
+HUD_STATS_COLOR = (30, 130, 110)  # dark seafoam green for lives/score
+HIGHLIGHT_COLOR = (255, 215, 0)   # new high score / this run's row
+
+# Quality tiers, best first, stepped through by frame_governor when frames
+# run over budget. Collisions are never simplified: game results must not
+# depend on how fast the machine draws.
+#   wobble:      pickups bob sideways
+#   max_popups:  newest score popups drawn (None for all)
+#   hud_every:   frames between HUD text updates
+#   interpolate: draw moving things between ticks
+QUALITY_TIERS = (
+    {"name": "high", "wobble": True, "max_popups": None, "hud_every": 1, "interpolate": True},
+    {"name": "medium", "wobble": True, "max_popups": 8, "hud_every": 4, "interpolate": True},
+    {"name": "low", "wobble": False, "max_popups": 3, "hud_every": 8, "interpolate": True},
+    {"name": "minimal", "wobble": False, "max_popups": 0, "hud_every": 15, "interpolate": False},
+)
+QUALITY_NAMES = tuple(tier["name"] for tier in QUALITY_TIERS)
+
+
+def build_alpha_ramp(surf, steps):
+    """Copies of ``surf`` fading from opaque towards transparent in ``steps`` steps."""
+    ramp = []
+    for k in range(steps):
+        faded = surf.copy()
+        faded.set_alpha(int(255 * (1 - k / steps)))
+        ramp.append(faded)
+    return ramp
+
+
+def _interpolate(store, live, prev, alpha):
+    """Positions of ``live`` slots ``alpha`` of the way from ``prev`` to now.
+
+    Slots that were not holding the same entity in the snapshot (new
+    spawns, reused slots, or slots added when the store grew) are drawn
+    where they are now.
+    """
+    xs, ys = store.x[live], store.y[live]
+    px, py, pspawn = prev["jelly_x"], prev["jelly_y"], prev["jelly_spawn_ms"]
+    known = live < len(px)
+    same = np.zeros(len(live), dtype=bool)
+    same[known] = pspawn[live[known]] == store.spawn_ms[live[known]]
+    old = live[same]
+    xs = xs.copy()
+    ys = ys.copy()
+    xs[same] = np.rint(px[old] + (xs[same] - px[old]) * alpha)
+    ys[same] = np.rint(py[old] + (ys[same] - py[old]) * alpha)
+    return xs, ys
+
+
+class Scene:
+    """Draws game ``state`` through ``renderer`` using the sprites in ``assets``.
+
+    ``quality`` is one of ``QUALITY_TIERS`` and can be swapped between frames.
+    """
+
+    def __init__(self, renderer, assets, text_cache, font, small_font):
+        self.renderer = renderer
+        self.text_cache = text_cache
+        self.font = font
+        self.small_font = small_font
+        self.starfruit_img = assets["starfruit_img"]
+        self.turtle_img = assets["turtle_img"]
+        self.jelly_images = assets["jelly_images"]
+        # Score popups all show the same text, so render it once and pre-fade it
+        self.popup_ramp = build_alpha_ramp(
+            small_font.render("+1", True, SCORE_POPUP_COLOR), SCORE_POPUP_ALPHA_STEPS
+        )
+        self.quality = QUALITY_TIERS[0]
+        self.frames = 0
+        self._hud = None  # (lives, score, shield) as last shown
+
+    def blit_text_with_shadow(self, text, font, color, pos, center=False, target=None):
+        """Blit text with a shadow for improved readability.
+
+        The text and its shadow come pre-composited from ``text_cache``, so an
+        unchanged line costs one blit. Draws through the renderer unless a
+        ``target`` surface is given.
+        """
+        surf = self.text_cache.get(text, font, color)
+        text_rect = pygame.Rect((0, 0), self.text_cache.text_size(surf))
+        if center:
+            text_rect.center = pos
+        else:
+            text_rect.topleft = pos
+        (target or self.renderer).blit(surf, text_rect.topleft)
+        return text_rect
+
+    def draw_wobbling(self, image, store, now_ms, wobble=True):
+        """Draw every pickup in ``store`` with its wobble, computed for all at once."""
+        live = store.live()
+        if not len(live):
+            return
+        xs = store.x[live]
+        if wobble:
+            xs = xs + store.wobble(now_ms, WOBBLE_AMPLITUDE, WOBBLE_SPEED, live)
+        xs = xs.tolist()
+        ys = store.y[live].tolist()
+        self.renderer.blits([(image, (x, y)) for x, y in zip(xs, ys)])
+
+    def draw_jellies(self, store, prev=None, alpha=1.0):
+        """Draw every jelly, ``alpha`` of the way from its ``prev`` snapshot position."""
+        live = store.live()
+        if not len(live):
+            return
+        images = self.jelly_images
+        sprites = store.sprite[live].tolist()
+        xs = store.x[live]
+        ys = store.y[live]
+        if prev is not None and alpha < 1.0:
+            xs, ys = _interpolate(store, live, prev, alpha)
+        self.renderer.blits([(images[k], (x, y)) for k, x, y in zip(sprites, xs.tolist(), ys.tolist())])
+
+    def draw_popups(self, store, now_ms, max_popups=None):
+        """Draw the score popups; with ``max_popups``, only that many of the newest."""
+        live = store.live()
+        if max_popups is not None and len(live) > max_popups:
+            live = live[np.argsort(store.spawn_ms[live], kind="stable")[len(live) - max_popups:]]
+        if not len(live):
+            return
+        ramp = self.popup_ramp
+        steps = len(ramp)
+        blits = []
+        for x, y, spawn in zip(store.x[live].tolist(), store.y[live].tolist(), store.spawn_ms[live].tolist()):
+            elapsed = now_ms - spawn
+            surf = ramp[min(steps - 1, int(elapsed * steps / SCORE_POPUP_DURATION))]
+            rect = surf.get_rect(center=(x, int(y - SCORE_POPUP_RISE_SPEED * elapsed)))
+            blits.append((surf, rect))
+        self.renderer.blits(blits)
+
+    def draw(self, state, game_over_screen=None, prev=None, alpha=1.0):
+        """Draw a whole frame, up to but not including ``renderer.present()``.
+
+        With a ``simulation.snapshot`` taken before the last step, moving
+        things are drawn ``alpha`` (0..1) of the way from the snapshot to
+        the current state, so motion stays smooth when frames and
+        simulation ticks don't line up.
+        """
+        quality = self.quality
+        self.frames += 1
+        if prev is None or not quality["interpolate"]:
+            alpha = 1.0
+        now = state["now"] if alpha >= 1.0 else prev["now"] + (state["now"] - prev["now"]) * alpha
+
+        # Background first
+        self.renderer.clear()
+
+        # Draw pickups with wobble
+        self.draw_wobbling(self.starfruit_img, state["starfruits"], now, quality["wobble"])
+        self.draw_wobbling(self.turtle_img, state["turtles"], now, quality["wobble"])
+
+        # Draw jellyfish (static images)
+        self.draw_jellies(state["jellies"], prev, alpha)
+
+        # Draw axolotl
+        ax_rect = state["ax_rect"]
+        if alpha < 1.0:
+            (px, py), (cx, cy) = prev["ax_center"], ax_rect.center
+            ax_rect = ax_rect.copy()
+            ax_rect.center = (round(px + (cx - px) * alpha), round(py + (cy - py) * alpha))
+        self.renderer.blit(state["ax_sprite"], ax_rect)
+
+        # Draw score popups: rise and fade come from the elapsed time
+        self.draw_popups(state["score_popups"], now, quality["max_popups"])
+
+        # UI: Lives, score, and shield indicator. Lower tiers only pick up
+        # new values every few frames.
+        if self._hud is None or self.frames % quality["hud_every"] == 0:
+            self._hud = (state["lives"], state["score"], state["has_shield"])
+        lives, score, shield = self._hud
+        self.blit_text_with_shadow(f"Lives: {lives}", self.font, HUD_STATS_COLOR, (10, 10))
+        self.blit_text_with_shadow(f"Score: {score}", self.font, HUD_STATS_COLOR, (10, 46))
+
+        if shield:
+            self.blit_text_with_shadow("Shield Active", self.font, HUD_TEXT_COLOR, (10, 82))
+
+        # Game over overlay with Top 10
+        if game_over_screen is not None:
+            self.renderer.blit(game_over_screen, (0, 0))
+
+    def compose_game_over_screen(self, state, scores):
+        """Dimming overlay plus the high score list, drawn once into a single surface."""
+        text = self.blit_text_with_shadow
+        font, small_font = self.font, self.small_font
+        surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        surf.fill((0, 0, 0, 140))
+
+        cx = SCREEN_WIDTH // 2
+        y = SCREEN_HEIGHT // 2 - 120
+
+        text("Game Over", font, HUD_TEXT_COLOR, (cx, y), center=True, target=surf)
+        y += 40
+
+        text(f"Score: {state['score']}", font, HUD_TEXT_COLOR, (cx, y), center=True, target=surf)
+        y += 36
+
+        if state.get("new_high"):
+            text(
+                f"New High Score! Rank #{state.get('rank', '?')}",
+                font,
+                HIGHLIGHT_COLOR,
+                (cx, y),
+                center=True,
+                target=surf,
+            )
+            y += 36
+
+        text("Top 10 High Scores", font, HUD_TEXT_COLOR, (cx, y), center=True, target=surf)
+        y += 32
+
+        for idx, sc in enumerate(scores, start=1):
+            is_this_run = (state["score_submitted"] and sc == state["score"] and idx == state.get("rank"))
+            color = HIGHLIGHT_COLOR if is_this_run else (230, 230, 230)
+            text(f"{idx:2d}. {sc}", small_font, color, (cx, y), center=True, target=surf)
+            y += 24
+
+        text(
+            "Press R to Restart or Esc to Quit",
+            font,
+            HUD_TEXT_COLOR,
+            (cx, SCREEN_HEIGHT // 2 + 220),
+            center=True,
+            target=surf,
+        )
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        return surf
@@ -0,0 +1,89 @@
+"""Background persistence so disk writes never happen inside a frame.
+
+The game hands finished runs to ``BackgroundWriter.submit``, which only
+puts them on a bounded queue. A worker thread drains everything queued so
+far and passes it to ``write_batch`` in one call, so a burst of runs costs
+a single transaction (or a single file rewrite). Batches that fail are kept
+and retried with the next one; ``close`` writes whatever is left, then runs
+the optional ``on_close`` on the worker thread too.
+"""
+import queue
+import threading
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """Run ``write_batch(items)`` on a worker thread for submitted items.
+
+    ``submit`` never blocks. When ``max_queue`` items are already waiting
+    (the disk has stalled for a long time) new items are counted in
+    ``dropped`` instead of queued.
+    """
+
+    def __init__(self, write_batch, max_queue=64, name="background-writer", on_close=None):
+        self.write_batch = write_batch
+        self.on_close = on_close
+        self.max_queue = max_queue
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.error = None  # last exception raised by write_batch or on_close
+        # Bounded in submit() rather than here, so close() can always queue its stop
+        self._queue = queue.Queue()
+        self._retry = []
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item):
+        """Queue ``item`` for writing; returns False if it had to be dropped."""
+        if self._queue.qsize() >= self.max_queue:
+            self.dropped += 1
+            return False
+        self._queue.put(item)
+        return True
+
+    def close(self, timeout=5.0):
+        """Write everything queued, stop the worker and wait up to ``timeout`` s.
+
+        With ``timeout=0`` this never blocks: the worker finishes on its own.
+        Returns True if the worker finished in time.
+        """
+        if not self._thread.is_alive():
+            return True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _drain(self, first):
+        batch = [first]
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _write(self, items):
+        try:
+            self.write_batch(items)
+        except Exception as exc:  # keep the items and try again next batch
+            self.error = exc
+            self._retry = items
+            return
+        self._retry = []
+        self.written += len(items)
+        self.batches += 1
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch = self._drain(self._queue.get())
+            stop = _STOP in batch
+            items = self._retry + [item for item in batch if item is not _STOP]
+            if items:
+                self._write(items)
+        if self.on_close is not None:
+            try:
+                self.on_close()
+            except Exception as exc:
+                self.error = exc
@@ -0,0 +1,480 @@
+"""Headless, deterministic game simulation for Axolotl Dash.
+
+Everything that changes ``state`` lives here: movement, spawning, jellyfish
+motion, the three collision passes and score popups. Nothing in this module
+opens a window, so it runs under the SDL dummy driver and can be stepped as
+fast as the CPU allows for balancing and regression checks.
+"""
+import math
+import os
+import random
+
+import pygame
+
+from asset_manager import AssetManager
+from entity_store import EntityStore
+from spatial_hash import SpatialHash
+from sprite_cache import SpriteCache
+from timer_wheel import TimerWheel
+
+# -------------------------
+# Config
+# -------------------------
+SCREEN_WIDTH  = 1280
+SCREEN_HEIGHT = 720
+FPS = 60
+TICK_MS = 1000 / FPS             # fixed simulation step
+
+AXOLOTL_SIZE      = (80, 80)
+STARFRUIT_SIZE    = (40, 40)
+TURTLE_SIZE       = (54, 54)
+JELLYFISH_SIZE    = (72, 72)
+
+MOVE_SPEED = 6
+
+JELLYFISH_SPEED_MIN = 1.2
+JELLYFISH_SPEED_MAX = 2.8
+
+STARFRUIT_SPAWN_INTERVAL = 1500  # ms
+JELLYFISH_SPAWN_INTERVAL = 900   # ms
+
+TURTLE_SPAWN_EVERY = 4
+
+# Uncollected pickups vanish after their lifetime, and scheduled spawns are
+# skipped while a kind is at its cap, so idle play stays bounded
+STARFRUIT_LIFETIME = 15000       # ms
+TURTLE_LIFETIME = 20000          # ms
+STARFRUIT_MAX = 12
+TURTLE_MAX = 2
+JELLYFISH_MAX = 120
+
+TIMER_WHEEL_SLOTS = 256          # buckets of TICK_MS: about four seconds per turn
+
+SCORE_POPUP_DURATION = 700       # ms
+SCORE_POPUP_RISE_SPEED = 0.05    # px per ms
+
+STARTING_LIVES = 3
+
+BROADPHASE_CELL_SIZE = 128       # px, spatial hash bucket size for static pickups
+
+# Growth settings
+AXOLOTL_GROWTH   = 2              # pixels per fruit (width & height)
+AXOLOTL_MAX_SIZE = (200, 200)     # max axolotl size clamp
+AXOLOTL_CACHE_MAX_BYTES = 32 * 1024 * 1024  # scaled sprite + mask cache cap
+
+AXOLOTL_IMAGE_FILES = {
+    "idle":  "axel.png",
+    "down":  "diver.png",
+    "left":  "diverLeft.png",
+    "up":    "diverUp.png",
+    "right": "diverRight.png",
+}
+STARFRUIT_IMAGE_FILE = "Starfruit.png"
+TURTLE_IMAGE_FILE    = "turtle_shield.png"
+JELLY_IMAGE_FILES    = ["Jelly1.png", "Jelly2.png", "Jelly3.png", "Jelly4.png"]
+
+
+# -------------------------
+# Assets
+# -------------------------
+def load_assets(manager=None):
+    """Load every sprite and mask the simulation needs.
+
+    Images come pre-scaled from the ``AssetManager`` pack cache. Works
+    without a display; when a window is open the images are converted to the
+    screen format so the renderer can blit them directly. Axolotl sprites
+    for the directions the player has not moved in yet load in the
+    background.
+    """
+    if manager is None:
+        manager = AssetManager()
+
+    specs = [
+        ("starfruit", STARFRUIT_IMAGE_FILE, STARFRUIT_SIZE, True),
+        ("turtle", TURTLE_IMAGE_FILE, TURTLE_SIZE, True),
+        ("axolotl_idle", AXOLOTL_IMAGE_FILES["idle"], AXOLOTL_MAX_SIZE, True),
+    ]
+    specs += [(f"jelly{k}", f, JELLYFISH_SIZE, True) for k, f in enumerate(JELLY_IMAGE_FILES)]
+    images = manager.load(specs, group="sprites")
+    later = manager.load_later(
+        [(f"axolotl_{d}", f, AXOLOTL_MAX_SIZE, True) for d, f in AXOLOTL_IMAGE_FILES.items() if d != "idle"],
+        group="axolotl",
+    )
+
+    # Growth sizes are scaled down from the max-size sprites in the pack
+    ax_sprites = SpriteCache(
+        {d: f"axolotl_{d}" for d in AXOLOTL_IMAGE_FILES},
+        max_bytes=AXOLOTL_CACHE_MAX_BYTES,
+        loader=lambda name: images[name] if name in images else later.get(name),
+    )
+    # The starting size now, and every size grow_axolotl can reach in the
+    # background (smallest first), so a pickup never scales in its frame
+    sizes = growth_sizes()
+    ax_sprites.prewarm(sizes[:1], directions=("idle",))
+    ax_sprites.prewarm_later(sizes[1:], directions=("idle",))
+
+    starfruit_img = images["starfruit"]
+    turtle_img    = images["turtle"]
+    # Jellyfish: static images, choose one per spawn
+    jelly_images  = [images[f"jelly{k}"] for k in range(len(JELLY_IMAGE_FILES))]
+    return {
+        "ax_sprites": ax_sprites,
+        "starfruit_img": starfruit_img,
+        "starfruit_mask": pygame.mask.from_surface(starfruit_img),
+        "turtle_img": turtle_img,
+        "turtle_mask": pygame.mask.from_surface(turtle_img),
+        "jelly_images": jelly_images,
+        "jelly_masks": [pygame.mask.from_surface(img) for img in jelly_images],
+    }
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def clamp_rect_to_screen(rect):
+    rect.left = max(0, rect.left)
+    rect.top = max(0, rect.top)
+    rect.right = min(SCREEN_WIDTH, rect.right)
+    rect.bottom = min(SCREEN_HEIGHT, rect.bottom)
+
+def new_axolotl_rect():
+    rect = pygame.Rect((0, 0), AXOLOTL_SIZE)
+    rect.center = (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+    return rect
+
+def _random_pickup_rect(rng, size):
+    x = rng.randint(30, SCREEN_WIDTH - 30)
+    y = rng.randint(30, SCREEN_HEIGHT - 30)
+    rect = pygame.Rect((0, 0), size)
+    rect.center = (x, y)
+    return rect
+
+def schedule_expiry(state, kind, i, lifetime_ms):
+    """Remove entity ``i`` of ``kind`` ``lifetime_ms`` after it spawned.
+
+    The timer remembers the spawn time, so it does nothing if the slot has
+    been freed (or reused) by then.
+    """
+    spawn_ms = float(state[kind].spawn_ms[i])
+    state["timers"].schedule(spawn_ms + lifetime_ms, ("expire", kind, i, spawn_ms))
+
+def spawn_starfruit(state, now_ms):
+    rng = state["rng"]
+    rect = _random_pickup_rect(rng, STARFRUIT_SIZE)
+    phase = rng.uniform(0, 2 * math.pi)  # desync wobble
+    i = add_entity(state, "starfruits", rect, phase=phase, spawn_ms=now_ms)
+    schedule_expiry(state, "starfruits", i, STARFRUIT_LIFETIME)
+    return i
+
+def spawn_turtle(state, now_ms):
+    rng = state["rng"]
+    rect = _random_pickup_rect(rng, TURTLE_SIZE)
+    phase = rng.uniform(0, 2 * math.pi)
+    i = add_entity(state, "turtles", rect, phase=phase, spawn_ms=now_ms)
+    schedule_expiry(state, "turtles", i, TURTLE_LIFETIME)
+    return i
+
+def spawn_jelly(state, assets, now_ms):
+    # Spawn from top at random x, drifting down with slight sideways drift
+    rng = state["rng"]
+    kind = rng.randrange(len(assets["jelly_masks"]))  # pick one and keep it static
+    x = rng.randint(20, SCREEN_WIDTH - 20)
+    rect = pygame.Rect((0, 0), JELLYFISH_SIZE)
+    rect.midtop = (x, -JELLYFISH_SIZE[1])
+    speed_y = rng.uniform(JELLYFISH_SPEED_MIN, JELLYFISH_SPEED_MAX)
+    drift = rng.uniform(-0.8, 0.8)  # gentle sideways drift
+    return add_entity(state, "jellies", rect, vx=drift, vy=speed_y, sprite=kind, spawn_ms=now_ms)
+
+def spawn_score_popup(state, position, now_ms):
+    # Popups only store where and when they appeared; rise and fade are
+    # derived from the elapsed time when drawing
+    x, y = position
+    i = state["score_popups"].spawn(x, y, spawn_ms=now_ms)
+    schedule_expiry(state, "score_popups", i, SCORE_POPUP_DURATION)
+    return i
+
+def add_entity(state, kind, rect, **fields):
+    """Store a new entity at ``rect`` in ``state[kind]`` and return its slot.
+
+    Static pickups are also registered with their spatial hash broadphase.
+    """
+    i = state[kind].spawn(rect.x, rect.y, **fields)
+    grid = state["grids"].get(kind)
+    if grid is not None:
+        grid.insert(i, rect)
+    return i
+
+def remove_entity(state, kind, i):
+    state[kind].kill(i)
+    grid = state["grids"].get(kind)
+    if grid is not None:
+        grid.remove(i)
+
+def growth_sizes():
+    """Every axolotl size from ``AXOLOTL_SIZE`` up to the max, in growth order."""
+    sizes = [AXOLOTL_SIZE]
+    w, h = AXOLOTL_SIZE
+    while AXOLOTL_GROWTH > 0 and (w, h) != AXOLOTL_MAX_SIZE:
+        w = min(w + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[0])
+        h = min(h + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[1])
+        sizes.append((w, h))
+    return sizes
+
+# Growth: look up the next size in the sprite cache and keep the center fixed
+def grow_axolotl(state, assets):
+    current_w, current_h = state["ax_size"]
+    new_w = min(current_w + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[0])
+    new_h = min(current_h + AXOLOTL_GROWTH, AXOLOTL_MAX_SIZE[1])
+    if (new_w, new_h) == (current_w, current_h):
+        return  # already at max size
+
+    center = state["ax_rect"].center
+    state["ax_size"] = (new_w, new_h)
+    state["ax_sprite"], state["ax_mask"] = assets["ax_sprites"].get("idle", state["ax_size"])
+    state["ax_rect"] = state["ax_sprite"].get_rect(center=center)
+
+
+def reset_game_state(assets, seed=None):
+    """Fresh game state. The same ``seed`` always replays the same game."""
+    rng = random.Random(seed)
+    now = 0.0
+    ax_sprite, ax_mask = assets["ax_sprites"].get("idle", AXOLOTL_SIZE)
+    s = {
+        "rng": rng,
+        "seed": seed,
+        "now": now,                # simulation clock in ms
+        "ticks": 0,
+        "ax_rect": new_axolotl_rect(),
+        "ax_size": AXOLOTL_SIZE,
+        "ax_dir": "idle",
+        "ax_sprite": ax_sprite,
+        "ax_mask": ax_mask,
+        "lives": STARTING_LIVES,
+        "has_shield": False,
+        # Entities live in struct-of-arrays stores and are addressed by slot
+        "starfruits": EntityStore(STARFRUIT_SIZE),
+        "turtles": EntityStore(TURTLE_SIZE),
+        "jellies": EntityStore(JELLYFISH_SIZE),
+        "score_popups": EntityStore((0, 0), capacity=16),
+        # Pickups never move, so a grid beats rescanning them every tick.
+        # Jellies move every tick and use the store's vectorized AABB test.
+        "grids": {
+            "starfruits": SpatialHash(BROADPHASE_CELL_SIZE),
+            "turtles": SpatialHash(BROADPHASE_CELL_SIZE),
+        },
+        # Spawns and expiries, fired by step() as the clock passes them
+        "timers": TimerWheel(TICK_MS, TIMER_WHEEL_SLOTS),
+        "starfruit_spawns": 0,
+        "game_over": False,
+        "score": 0,                # score counter
+        "score_submitted": False,  # high score submitted flag
+        "new_high": False,         # whether this run hit the board
+        "rank": None,              # rank on the board
+    }
+    # Spawn a turtle power-up at the start of the game (retry until not overlapping axolotl)
+    rect = _random_pickup_rect(rng, TURTLE_SIZE)
+    phase = rng.uniform(0, 2 * math.pi)
+    while rect.colliderect(s["ax_rect"]):
+        rect = _random_pickup_rect(rng, TURTLE_SIZE)
+        phase = rng.uniform(0, 2 * math.pi)
+    turtle = add_entity(s, "turtles", rect, phase=phase, spawn_ms=now)
+    schedule_expiry(s, "turtles", turtle, TURTLE_LIFETIME)
+    s["timers"].schedule(now + STARFRUIT_SPAWN_INTERVAL, ("spawn", "starfruits"))
+    s["timers"].schedule(now + JELLYFISH_SPAWN_INTERVAL, ("spawn", "jellies"))
+    return s
+
+
+# -------------------------
+# Update
+# -------------------------
+# Phases step() reports to a FrameProfiler, in order
+SIM_PHASES = ("move", "timers", "move_jellies", "hit_jellies", "hit_starfruits", "hit_turtles")
+
+def _no_mark(phase):
+    pass
+
+def run_timers(state, assets, now, events, spawning=True):
+    """Fire every timer due by ``now``, appending spawn events to ``events``.
+
+    A spawn timer re-arms itself one interval from now (intervals are read
+    each time, so they can be changed mid-run), and only spawns while its
+    kind is under its cap. With ``spawning`` off only expiries run.
+    """
+    timers = state["timers"]
+    for event in timers.advance(now):
+        if event[0] == "expire":
+            _, kind, i, spawn_ms = event
+            store = state[kind]
+            if store.alive[i] and store.spawn_ms[i] == spawn_ms:
+                remove_entity(state, kind, i)
+        elif not spawning:
+            continue
+        elif event[1] == "starfruits":
+            # Starfruit (random positions, stationary with wobble), and every
+            # Nth one a turtle shield
+            if len(state["starfruits"]) < STARFRUIT_MAX:
+                spawn_starfruit(state, now)
+                state["starfruit_spawns"] += 1
+                events.append("spawn_starfruit")
+                if state["starfruit_spawns"] % TURTLE_SPAWN_EVERY == 0 and len(state["turtles"]) < TURTLE_MAX:
+                    spawn_turtle(state, now)
+                    events.append("spawn_turtle")
+            timers.schedule(now + STARFRUIT_SPAWN_INTERVAL, event)
+        else:
+            # Jellyfish (static image selection per spawn)
+            if len(state["jellies"]) < JELLYFISH_MAX:
+                spawn_jelly(state, assets, now)
+                events.append("spawn_jelly")
+            timers.schedule(now + JELLYFISH_SPAWN_INTERVAL, event)
+
+def step(state, assets, dx, dy, dt=TICK_MS, profiler=None):
+    """Advance ``state`` by one tick of ``dt`` ms with input direction ``dx``/``dy``.
+
+    Returns a list of event names (``"pickup"``, ``"shield"``, ``"shield_used"``,
+    ``"hit"``, ``"game_over"``, and ``"spawn_starfruit"``, ``"spawn_turtle"``,
+    ``"spawn_jelly"``) so the caller can play sounds, persist scores or log.
+    If a ``FrameProfiler`` is given, each of ``SIM_PHASES`` is marked on it.
+    """
+    mark = profiler.mark if profiler is not None else _no_mark
+    events = []
+    state["now"] += dt
+    state["ticks"] += 1
+    now = state["now"]
+
+    if not state["game_over"]:
+        # Normalize diagonal (keeps speed consistent)
+        if dx != 0 or dy != 0:
+            length = math.sqrt(dx*dx + dy*dy)
+            ux, uy = dx / length, dy / length
+            move_x = int(round(ux * MOVE_SPEED))
+            move_y = int(round(uy * MOVE_SPEED))
+        else:
+            move_x = move_y = 0
+
+        # Move axolotl and clamp
+        ax_rect = state["ax_rect"]
+        ax_rect.x += move_x
+        ax_rect.y += move_y
+        clamp_rect_to_screen(ax_rect)
+
+        # Choose sprite by direction
+        if move_x > 0:
+            direction = "right"
+        elif move_x < 0:
+            direction = "left"
+        elif move_y > 0:
+            direction = "down"
+        elif move_y < 0:
+            direction = "up"
+        else:
+            direction = "idle"
+        state["ax_dir"] = direction
+        state["ax_sprite"], state["ax_mask"] = assets["ax_sprites"].get(direction, state["ax_size"])
+        mark("move")
+
+        # Spawning and expiry: everything scheduled up to now
+        run_timers(state, assets, now, events)
+        mark("timers")
+
+        # Update jellyfish movement (no animation) and remove off-screen ones,
+        # one batched array operation each
+        jellies = state["jellies"]
+        jellies.move()
+        jellies.cull_below(SCREEN_HEIGHT)
+        mark("move_jellies")
+
+        # Collisions: Jellyfish with axolotl. Only jellies whose box overlaps
+        # the axolotl reach the mask test.
+        jelly_masks = assets["jelly_masks"]
+        for j in jellies.overlapping(ax_rect).tolist():
+            offset = (int(jellies.x[j]) - ax_rect.x, int(jellies.y[j]) - ax_rect.y)
+            if state["ax_mask"].overlap(jelly_masks[jellies.sprite[j]], offset):
+                remove_entity(state, "jellies", j)
+                if state["has_shield"]:
+                    state["has_shield"] = False
+                    events.append("shield_used")
+                else:
+                    state["lives"] -= 1
+                    events.append("hit")
+                    if state["lives"] <= 0:
+                        state["game_over"] = True
+                        events.append("game_over")
+                        break
+        mark("hit_jellies")
+
+        # Collisions: Starfruits with axolotl. Pickups come from the grid
+        # cells under the axolotl rather than a scan of every pickup.
+        starfruits = state["starfruits"]
+        for f in state["grids"]["starfruits"].query(state["ax_rect"]):
+            f_rect = starfruits.rect(f)
+            if state["ax_rect"].colliderect(f_rect):
+                offset = (f_rect.x - state["ax_rect"].x, f_rect.y - state["ax_rect"].y)
+                if state["ax_mask"].overlap(assets["starfruit_mask"], offset):
+                    pos = f_rect.center
+                    remove_entity(state, "starfruits", f)
+                    state["score"] += 1  # 1 point per starfruit
+                    grow_axolotl(state, assets)  # grow on pickup
+                    spawn_score_popup(state, pos, now)
+                    events.append("pickup")
+        mark("hit_starfruits")
+
+        # Collisions: Turtle shields with axolotl
+        turtles = state["turtles"]
+        for t in state["grids"]["turtles"].query(state["ax_rect"]):
+            t_rect = turtles.rect(t)
+            if state["ax_rect"].colliderect(t_rect):
+                offset = (t_rect.x - state["ax_rect"].x, t_rect.y - state["ax_rect"].y)
+                if state["ax_mask"].overlap(assets["turtle_mask"], offset):
+                    remove_entity(state, "turtles", t)
+                    state["has_shield"] = True
+                    events.append("shield")
+        mark("hit_turtles")
+
+    else:
+        # Nothing spawns after game over, but score popups still expire
+        run_timers(state, assets, now, events, spawning=False)
+        mark("timers")
+
+    return events
+
+
+def snapshot(state):
+    """Copy of everything that moves between ticks.
+
+    Taken before a step, it lets the renderer draw positions part way
+    between two ticks (see ``Scene.draw``). Pickups don't move, and popups
+    and wobble are derived from ``now``, so only the axolotl and jellies
+    need saving.
+    """
+    jellies = state["jellies"]
+    return {
+        "now": state["now"],
+        "ax_center": state["ax_rect"].center,
+        "jelly_x": jellies.x.copy(),
+        "jelly_y": jellies.y.copy(),
+        "jelly_spawn_ms": jellies.spawn_ms.copy(),
+    }
+
+
+# -------------------------
+# Headless runs
+# -------------------------
+def idle_bot(state):
+    return 0, 0
+
+def run_headless(seed=None, ticks=3600, bot=idle_bot, assets=None, stop_on_game_over=True):
+    """Step a fresh game ``ticks`` times at ``TICK_MS`` without a window.
+
+    ``bot(state)`` returns the ``(dx, dy)`` input for each tick. Returns the
+    final state.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    if assets is None:
+        assets = load_assets()
+    state = reset_game_state(assets, seed)
+    for _ in range(ticks):
+        dx, dy = bot(state)
+        step(state, assets, dx, dy)
+        if stop_on_game_over and state["game_over"]:
+            break
+    return state
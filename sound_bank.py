@@ -0,0 +1,141 @@
+"""Procedural sound effects rendered with NumPy and cached on disk.
+
+Each effect is a small parameter dict (tone frequencies, length, volume,
+pitch sweep, attack). Tones are synthesized for all samples at once, and the
+resulting PCM is saved under ``SOUND_CACHE_DIR`` keyed by a hash of the
+parameters, so adding effects or variants costs nothing on later launches.
+"""
+import hashlib
+import json
+import os
+
+import numpy as np
+import pygame
+
+SOUND_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sound_cache")
+SOUND_CACHE_VERSION = 1  # bump when the synthesis code changes
+
+# Pitch variants are frequency multipliers; play() cycles through them
+EFFECTS = {
+    "pickup": {
+        "freqs": [660, 880], "duration_ms": 180, "volume": 8000,
+        "sweep": 1.0, "attack_ms": 0, "variants": [1.0, 1.122, 1.26],
+    },
+    "shield": {
+        "freqs": [440, 660], "duration_ms": 320, "volume": 7000,
+        "sweep": 1.5, "attack_ms": 30, "variants": [1.0],
+    },
+    "hit": {
+        "freqs": [196, 207], "duration_ms": 260, "volume": 9000,
+        "sweep": 0.6, "attack_ms": 0, "variants": [1.0, 0.94],
+    },
+    "game_over": {
+        "freqs": [392, 494], "duration_ms": 900, "volume": 8000,
+        "sweep": 0.5, "attack_ms": 20, "variants": [1.0],
+    },
+}
+
+
+def render_tone(freqs, duration_ms, volume, sweep=1.0, attack_ms=0, sample_rate=44100):
+    """Mono int16 PCM of ``freqs`` mixed together under an attack/decay envelope.
+
+    ``sweep`` is the ratio between the final and starting pitch; the pitch
+    glides exponentially between them.
+    """
+    n = int(sample_rate * duration_ms / 1000)
+    i = np.arange(n, dtype=np.float64)
+    # Instantaneous pitch multiplier per sample, integrated into phase below
+    glide = sweep ** (i / n) if sweep != 1.0 else np.ones(n)
+    step = 2 * np.pi * glide / sample_rate
+    phase = np.cumsum(step) - step[0]  # starts at 0 like sin(2*pi*f*t)
+    wave = np.zeros(n)
+    for f in freqs:
+        wave += np.sin(f * phase)
+    wave /= len(freqs)
+
+    envelope = 1 - i / n  # fade out for softer sound
+    attack = int(sample_rate * attack_ms / 1000)
+    if attack:
+        envelope[:attack] *= np.linspace(0, 1, attack, endpoint=False)
+    return (volume * envelope * wave).astype(np.int16)
+
+
+def _cache_path(cache_dir, name, params, sample_rate):
+    key = json.dumps(
+        {"params": params, "sample_rate": sample_rate, "version": SOUND_CACHE_VERSION},
+        sort_keys=True,
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(cache_dir, f"{name}-{digest}.npy")
+
+
+def load_or_render(name, params, sample_rate, cache_dir=SOUND_CACHE_DIR):
+    """PCM for one effect variant, read from the disk cache when possible."""
+    path = _cache_path(cache_dir, name, params, sample_rate)
+    try:
+        return np.load(path)
+    except (OSError, ValueError):
+        pass
+
+    pcm = render_tone(
+        params["freqs"], params["duration_ms"], params["volume"],
+        params.get("sweep", 1.0), params.get("attack_ms", 0), sample_rate,
+    )
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = path + ".tmp.npy"
+        np.save(tmp, pcm)
+        os.replace(tmp, path)
+    except OSError:
+        pass  # cache is an optimization only
+    return pcm
+
+
+class SoundBank:
+    """All game sound effects, played round-robin on a fixed pool of mixer channels.
+
+    Raises ``pygame.error`` when the mixer is not available.
+    """
+
+    def __init__(self, effects=EFFECTS, cache_dir=SOUND_CACHE_DIR, channels=8):
+        init = pygame.mixer.get_init()
+        if init is None:
+            raise pygame.error("mixer not initialized")
+        sample_rate, _, n_channels = init
+
+        self._sounds = {}
+        for name, params in effects.items():
+            variants = []
+            for ratio in params.get("variants", [1.0]):
+                variant = dict(params, freqs=[f * ratio for f in params["freqs"]])
+                variant.pop("variants", None)
+                pcm = load_or_render(name, variant, sample_rate, cache_dir)
+                if n_channels > 1:
+                    pcm = np.repeat(pcm[:, None], n_channels, axis=1)
+                variants.append(pygame.sndarray.make_sound(np.ascontiguousarray(pcm)))
+            self._sounds[name] = variants
+        self._next_variant = dict.fromkeys(self._sounds, 0)
+
+        pygame.mixer.set_num_channels(channels)
+        self._channels = [pygame.mixer.Channel(i) for i in range(channels)]
+        self._next_channel = 0
+
+    def __contains__(self, name):
+        return name in self._sounds
+
+    def play(self, name):
+        variants = self._sounds[name]
+        k = self._next_variant[name]
+        self._next_variant[name] = (k + 1) % len(variants)
+
+        # Prefer an idle channel; otherwise take over the one used longest ago
+        n = len(self._channels)
+        start = self._next_channel
+        pick = start
+        for offset in range(n):
+            idx = (start + offset) % n
+            if not self._channels[idx].get_busy():
+                pick = idx
+                break
+        self._next_channel = (pick + 1) % n
+        self._channels[pick].play(variants[k])
@@ -0,0 +1,68 @@
+class SpatialHash:
+    """Uniform grid broadphase for axis-aligned rects.
+
+    Items are bucketed into every ``cell_size`` square their rect touches,
+    and ``query`` returns just the items sharing a cell with the given rect,
+    so collision checks stay flat as entity counts grow. Meant for entities
+    that don't move once placed (the pickups). Items must be hashable, e.g.
+    entity store slot indices.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._items = {}  # item -> cell range
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item):
+        return item in self._items
+
+    def _range(self, rect):
+        cs = self.cell_size
+        return (rect.left // cs, rect.top // cs, (rect.right - 1) // cs, (rect.bottom - 1) // cs)
+
+    def _add(self, item, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is None:
+                    bucket = self._cells[(cx, cy)] = {}
+                bucket[item] = None
+
+    def _discard(self, item, cells):
+        x0, y0, x1, y1 = cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = self._cells[(cx, cy)]
+                del bucket[item]
+                if not bucket:
+                    del self._cells[(cx, cy)]
+
+    def insert(self, item, rect):
+        cells = self._range(rect)
+        self._items[item] = cells
+        self._add(item, cells)
+
+    def remove(self, item):
+        cells = self._items.pop(item)
+        self._discard(item, cells)
+
+    def query(self, rect):
+        """Items whose cells overlap ``rect``, each once.
+
+        Ordered cell by cell (column-major over the cells ``rect`` covers),
+        then by insertion within a cell: deterministic, but not overall
+        insertion order.
+        """
+        x0, y0, x1, y1 = self._range(rect)
+        found = {}
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return list(found)
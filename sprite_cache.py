@@ -0,0 +1,101 @@
+import threading
+from collections import OrderedDict
+
+import pygame
+
+# Facing directions used by the axolotl, in the order the game loads them
+AXOLOTL_DIRECTIONS = ("idle", "down", "left", "up", "right")
+
+
+def load_image(path):
+    img = pygame.image.load(path)
+    # convert_alpha needs a display mode; headless runs keep the raw surface
+    if pygame.display.get_surface() is not None:
+        img = img.convert_alpha()
+    return img
+
+
+def _entry_bytes(size):
+    """Rough memory cost of one cached sprite plus its 1-bit mask."""
+    w, h = size
+    return w * h * 4 + (w * h + 7) // 8
+
+
+class SpriteCache:
+    """Scaled sprites and collision masks keyed by (direction, size).
+
+    Each source image is fetched once through ``loader`` (by default decoded
+    from the PNG path in ``files``). Scaled surfaces and masks are built on
+    first use and kept in an LRU that is capped at ``max_bytes``, so growing
+    the axolotl is a dictionary lookup instead of a disk reload.
+
+    ``prewarm_later`` builds entries on a background thread while the game
+    runs; lookups only hold the lock for the dictionary work, never while
+    scaling, so the game never waits on the prewarm.
+    """
+
+    def __init__(self, files, max_bytes=32 * 1024 * 1024, loader=load_image):
+        self.files = dict(files)
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self._sources = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _source(self, direction):
+        src = self._sources.get(direction)
+        if src is None:
+            src = self._sources[direction] = self.loader(self.files[direction])
+        return src
+
+    def get(self, direction, size):
+        """Return ``(surface, mask)`` for ``direction`` scaled to ``size``."""
+        key = (direction, tuple(size))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        surf = pygame.transform.scale(self._source(direction), key[1])
+        entry = (surf, pygame.mask.from_surface(surf))
+        with self._lock:
+            # Another thread may have built the same entry meanwhile
+            if key in self._entries:
+                return self._entries[key]
+            self._entries[key] = entry
+            self.used_bytes += _entry_bytes(key[1])
+            self._evict()
+        return entry
+
+    def prewarm(self, sizes, directions=AXOLOTL_DIRECTIONS):
+        """Build entries ahead of time so later lookups never scale."""
+        for size in sizes:
+            for direction in directions:
+                self.get(direction, size)
+
+    def prewarm_later(self, sizes, directions=AXOLOTL_DIRECTIONS):
+        """``prewarm`` on a background thread, in order; returns the thread."""
+        thread = threading.Thread(
+            target=self.prewarm, args=(list(sizes), directions), name="sprite-prewarm", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.used_bytes = 0
+
+    def _evict(self):
+        # Never drop the entry that was just added, even if it alone is over the cap
+        while self.used_bytes > self.max_bytes and len(self._entries) > 1:
+            key, _ = self._entries.popitem(last=False)
+            self.used_bytes -= _entry_bytes(key[1])
@@ -0,0 +1,256 @@
+"""Parameter sweeps over the difficulty constants, run on a process pool.
+
+Every point of the grid is played as several seeded headless games by a
+bot. Games are spread over all cores, and the per-point summary (survival
+time, score distribution, entity counts) is written to one results file::
+
+    python sweep.py --param JELLYFISH_SPAWN_INTERVAL=600,900,1200 \\
+                    --param MOVE_SPEED=4,6,8 --seeds 20 --out sweep.json
+
+Constants are overridden on the ``simulation`` module inside each worker,
+so the game code itself is unchanged. The results are JSON unless
+``--out`` ends in ``.csv``.
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import simulation
+
+SWEEPABLE = (
+    "JELLYFISH_SPAWN_INTERVAL",
+    "JELLYFISH_SPEED_MIN",
+    "JELLYFISH_SPEED_MAX",
+    "STARFRUIT_SPAWN_INTERVAL",
+    "TURTLE_SPAWN_EVERY",
+    "STARFRUIT_LIFETIME",
+    "TURTLE_LIFETIME",
+    "STARFRUIT_MAX",
+    "TURTLE_MAX",
+    "JELLYFISH_MAX",
+    "AXOLOTL_GROWTH",
+    "MOVE_SPEED",
+    "STARTING_LIVES",
+)
+DEFAULT_TICKS = 3 * 60 * simulation.FPS   # three minutes of play per game
+SCORE_PERCENTILES = (10, 25, 50, 75, 90)
+COUNTED = ("jellies", "starfruits", "turtles")
+
+DODGE_RANGE_X = 110               # px, jellies closer than this sideways are a threat
+DODGE_RANGE_Y = 220               # px, ...and at most this far above the axolotl
+
+
+# -------------------------
+# Bots
+# -------------------------
+def random_bot(seed):
+    """Holds a random direction for a random 10-40 ticks."""
+    rng = random.Random(seed)
+    held = {"move": (0, 0), "until": 0}
+
+    def bot(state):
+        if state["ticks"] >= held["until"]:
+            held["move"] = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+            held["until"] = state["ticks"] + rng.randint(10, 40)
+        return held["move"]
+    return bot
+
+
+def _nearest(store, x, y):
+    live = store.live()
+    if not len(live):
+        return None
+    d = (store.x[live] - x) ** 2 + (store.y[live] - y) ** 2
+    k = live[int(np.argmin(d))]
+    return int(store.x[k]), int(store.y[k])
+
+
+def greedy_bot(seed):
+    """Heads for the nearest turtle (without a shield) or starfruit and
+    sidesteps jellies falling towards it."""
+    def bot(state):
+        ax = state["ax_rect"]
+        jellies = state["jellies"]
+        live = jellies.live()
+        if len(live):
+            jx = jellies.x[live] + simulation.JELLYFISH_SIZE[0] // 2 - ax.centerx
+            jy = ax.centery - (jellies.y[live] + simulation.JELLYFISH_SIZE[1] // 2)
+            threat = (np.abs(jx) < DODGE_RANGE_X) & (jy > -ax.height) & (jy < DODGE_RANGE_Y)
+            if threat.any():
+                # Step away from the closest one, and back off downwards
+                k = np.flatnonzero(threat)[int(np.argmin(jy[threat]))]
+                dx = -1 if jx[k] > 0 else 1
+                if (dx < 0 and ax.left <= 0) or (dx > 0 and ax.right >= simulation.SCREEN_WIDTH):
+                    dx = -dx
+                return dx, 1
+
+        target = None
+        if not state["has_shield"]:
+            target = _nearest(state["turtles"], ax.x, ax.y)
+        if target is None:
+            target = _nearest(state["starfruits"], ax.x, ax.y)
+        if target is None:
+            return 0, 0
+        tx, ty = target
+        return (tx > ax.x) - (tx < ax.x), (ty > ax.y) - (ty < ax.y)
+    return bot
+
+
+BOTS = {"idle": lambda seed: simulation.idle_bot, "random": random_bot, "greedy": greedy_bot}
+
+
+# -------------------------
+# Running games
+# -------------------------
+_assets = None
+
+
+def _init_worker():
+    global _assets
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    _assets = simulation.load_assets()
+
+
+def play_game(config, seed, ticks=DEFAULT_TICKS, bot="greedy", assets=None):
+    """One seeded game with ``config`` constants in effect; returns its stats."""
+    assets = assets if assets is not None else _assets
+    saved = {name: getattr(simulation, name) for name in config}
+    counts = {name: [0, 0] for name in COUNTED}  # running sum, peak
+    play = BOTS[bot](seed)
+
+    def counting_bot(state):
+        for name, c in counts.items():
+            n = len(state[name])
+            c[0] += n
+            c[1] = max(c[1], n)
+        return play(state)
+
+    try:
+        for name, value in config.items():
+            setattr(simulation, name, value)
+        state = simulation.run_headless(seed=seed, ticks=ticks, bot=counting_bot, assets=assets)
+    finally:
+        for name, value in saved.items():
+            setattr(simulation, name, value)
+
+    result = {
+        "seed": seed,
+        "score": state["score"],
+        "survived_s": state["now"] / 1000,
+        "game_over": state["game_over"],
+    }
+    for name, (total, peak) in counts.items():
+        result[f"{name}_mean"] = total / max(1, state["ticks"])
+        result[f"{name}_peak"] = peak
+    return result
+
+
+def _play_task(task):
+    index, config, seed, ticks, bot = task
+    return index, play_game(config, seed, ticks, bot)
+
+
+def summarize(config, games):
+    """Aggregate one grid point's games into a flat row."""
+    scores = np.array([g["score"] for g in games])
+    survived = np.array([g["survived_s"] for g in games])
+    row = dict(config)
+    row["games"] = len(games)
+    row["survival_rate"] = float(np.mean([not g["game_over"] for g in games]))
+    row["survived_s_mean"] = float(survived.mean())
+    row["survived_s_p10"] = float(np.percentile(survived, 10))
+    row["survived_s_p50"] = float(np.percentile(survived, 50))
+    row["score_mean"] = float(scores.mean())
+    for q, v in zip(SCORE_PERCENTILES, np.percentile(scores, SCORE_PERCENTILES)):
+        row[f"score_p{q}"] = float(v)
+    row["score_max"] = int(scores.max())
+    for name in COUNTED:
+        row[f"{name}_mean"] = float(np.mean([g[f"{name}_mean"] for g in games]))
+        row[f"{name}_peak"] = int(max(g[f"{name}_peak"] for g in games))
+    return row
+
+
+def grid_points(params):
+    """Every combination of ``{name: [values]}``, as a list of dicts."""
+    names = list(params)
+    return [dict(zip(names, values)) for values in itertools.product(*(params[n] for n in names))]
+
+
+def run_sweep(params, seeds=10, ticks=DEFAULT_TICKS, bot="greedy", workers=None):
+    """Play ``seeds`` games per grid point; returns one summary row per point.
+
+    Seeds are ``0..seeds-1`` for every point, so points are compared on the
+    same games.
+    """
+    points = grid_points(params)
+    tasks = [(i, config, seed, ticks, bot) for i, config in enumerate(points) for seed in range(seeds)]
+    games = [[] for _ in points]
+    # A few chunks per worker: low IPC overhead, but still balanced
+    chunksize = max(1, len(tasks) // (4 * (workers or os.cpu_count() or 1)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for index, result in pool.map(_play_task, tasks, chunksize=chunksize):
+            games[index].append(result)
+    return [summarize(config, g) for config, g in zip(points, games)]
+
+
+# -------------------------
+# Command line
+# -------------------------
+def parse_param(text):
+    """``"NAME=v1,v2,..."`` -> ``(NAME, [values])``."""
+    name, sep, values = text.partition("=")
+    name = name.strip().upper()
+    if not sep or not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=v1,v2,... got {text!r}")
+    if name not in SWEEPABLE:
+        raise argparse.ArgumentTypeError(f"{name} is not sweepable (choose from {', '.join(SWEEPABLE)})")
+    try:
+        return name, [json.loads(v) for v in values.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"values for {name} must be numbers") from None
+
+
+def write_results(path, rows, meta):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        else:
+            json.dump({"meta": meta, "results": rows}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sweep Axolotl Dash difficulty constants")
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="NAME=v1,v2",
+                        help="constant to vary; repeat for a grid")
+    parser.add_argument("--seeds", type=int, default=10, help="games per grid point (default: %(default)s)")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="tick cap per game (default: %(default)s)")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="greedy")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: all cores)")
+    parser.add_argument("--out", default="sweep_results.json", help="results file (.json or .csv)")
+    args = parser.parse_args(argv)
+
+    params = dict(args.param)
+    start = time.perf_counter()
+    rows = run_sweep(params, args.seeds, args.ticks, args.bot, args.workers)
+    elapsed = time.perf_counter() - start
+    meta = {"params": params, "seeds": args.seeds, "ticks": args.ticks, "bot": args.bot,
+            "elapsed_s": round(elapsed, 2)}
+    write_results(args.out, rows, meta)
+    print(f"{len(rows)} configurations x {args.seeds} games in {elapsed:.1f}s -> {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Opt-in gameplay telemetry: compressed JSONL logs and a streaming reader.
+
+The game pushes records with ``Telemetry.event`` and ``Telemetry.sample``,
+which only append a tuple to an in-memory list. Full lists are handed to a
+``BackgroundWriter``; its thread turns them into JSON lines and appends
+each batch to the log as its own gzip member, so a crash loses at most the
+batch in flight and the file still reads back with ``gzip``.
+
+Every line is one JSON object with ``event``, ``run`` (run number within
+the log), ``tick`` and ``t`` (seconds since the log started), plus
+event-specific fields:
+
+- ``run_start`` (seed) and ``run_end`` (score, lives, ticks, rank, and
+  ``finished``: false when the player quit mid-run)
+- ``spawn_starfruit``, ``spawn_turtle``, ``spawn_jelly``
+- ``pickup`` (score, size: the axolotl's size after ``grow_axolotl``)
+- ``shield``, ``shield_used``, ``hit`` (lives left), ``game_over``
+- ``sample`` every few frames: frame and work ms, entity counts, quality tier
+
+Summarize any number of logs in one streaming pass::
+
+    python telemetry.py telemetry/*.jsonl.gz
+"""
+import argparse
+import gzip
+import json
+import sys
+import time
+import zlib
+from collections import Counter
+
+from score_writer import BackgroundWriter
+from simulation import FPS
+
+TELEMETRY_DIR = "telemetry"
+TELEMETRY_BATCH = 512             # records buffered before a batch is handed to the writer
+TELEMETRY_SAMPLE_FRAMES = 30      # frames between frame-time samples
+TELEMETRY_COMPRESSLEVEL = 6
+
+FRAME_HIST_BIN_MS = 0.25          # reader's frame-time histogram resolution
+FRAME_HIST_BINS = 400             # up to 100 ms; slower frames go in the last bin
+FRAME_PERCENTILES = (50, 95, 99)
+
+
+class Telemetry:
+    """Buffered, compressed event log at ``path``.
+
+    ``event`` and ``sample`` are cheap enough to call from the game loop:
+    records are tuples until the writer thread serializes them.
+    """
+
+    def __init__(self, path, batch=TELEMETRY_BATCH, clock=time.perf_counter):
+        self.path = path
+        self.batch = batch
+        self.clock = clock
+        self.run = 0
+        self.records = 0
+        self._start = clock()
+        self._buf = []
+        self._file = open(path, "ab")
+        # The writer closes the file after its last batch, even if close() times out
+        self._writer = BackgroundWriter(self._write_batches, name="telemetry-writer", on_close=self._file.close)
+
+    @property
+    def dropped(self):
+        """Batches lost because the writer fell too far behind."""
+        return self._writer.dropped
+
+    def event(self, name, tick, **fields):
+        self._buf.append((name, self.run, tick, self.clock() - self._start, fields))
+        self.records += 1
+        if len(self._buf) >= self.batch:
+            self.flush()
+
+    def start_run(self, seed):
+        self.run += 1
+        self.event("run_start", 0, seed=seed)
+
+    def end_run(self, state, finished=True):
+        """Log the end of the current run; ``finished=False`` if it was quit."""
+        self.event("run_end", state["ticks"], score=state["score"], lives=state["lives"],
+                   ticks=state["ticks"], rank=state["rank"], finished=finished)
+        self.flush()
+
+    def sim_event(self, name, state):
+        """Log one of ``simulation.step``'s events with the state that goes with it."""
+        if name == "pickup":
+            self.event(name, state["ticks"], score=state["score"], size=state["ax_size"][0])
+        elif name == "hit":
+            self.event(name, state["ticks"], lives=state["lives"])
+        else:
+            self.event(name, state["ticks"])
+
+    def sample(self, tick, frame_ms, work_ms, counts):
+        self.event("sample", tick, frame_ms=round(frame_ms, 3), work_ms=round(work_ms, 3), **counts)
+
+    def flush(self):
+        if self._buf:
+            self._writer.submit(self._buf)
+            self._buf = []
+
+    def close(self, timeout=5.0):
+        """Write what's buffered; True if the log was closed within ``timeout`` s."""
+        self.flush()
+        return self._writer.close(timeout)
+
+    def _write_batches(self, batches):
+        # Runs on the writer thread
+        lines = []
+        for batch in batches:
+            for name, run, tick, t, fields in batch:
+                record = {"event": name, "run": run, "tick": tick, "t": round(t, 4)}
+                record.update(fields)
+                lines.append(json.dumps(record, separators=(",", ":")))
+        lines.append("")
+        self._file.write(gzip.compress("\n".join(lines).encode("utf-8"), TELEMETRY_COMPRESSLEVEL))
+        self._file.flush()
+
+
+# -------------------------
+# Reading
+# -------------------------
+def read_events(path):
+    """Yield the records in one log, a line at a time.
+
+    A log cut short by a crash yields everything before the damaged batch.
+    """
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        return
+    except (EOFError, gzip.BadGzipFile, zlib.error):
+        return
+
+
+class Summary:
+    """Running totals over any number of logs; add records with ``add``."""
+
+    def __init__(self):
+        self.logs = 0
+        self.events = Counter()
+        self.runs = 0
+        self.finished = 0
+        self.quit = 0             # runs ended by quitting; their play time still counts
+        self.scores = []          # one int per finished run
+        self.ticks = 0
+        self.max_size = 0
+        self.peak = Counter()     # highest sampled count per entity kind
+        self.frame_hist = [0] * FRAME_HIST_BINS
+        self.work_hist = [0] * FRAME_HIST_BINS
+
+    def _bin(self, hist, ms):
+        hist[min(FRAME_HIST_BINS - 1, int(ms / FRAME_HIST_BIN_MS))] += 1
+
+    def add(self, record):
+        name = record.get("event")
+        self.events[name] += 1
+        if name == "run_start":
+            self.runs += 1
+        elif name == "run_end":
+            self.ticks += record["ticks"]
+            if record.get("finished", True):
+                self.finished += 1
+                self.scores.append(record["score"])
+            else:
+                self.quit += 1
+        elif name == "pickup":
+            self.max_size = max(self.max_size, record["size"])
+        elif name == "sample":
+            self._bin(self.frame_hist, record["frame_ms"])
+            self._bin(self.work_hist, record["work_ms"])
+            for kind in ("starfruits", "turtles", "jellies", "score_popups"):
+                if kind in record:
+                    self.peak[kind] = max(self.peak[kind], record[kind])
+
+    def add_log(self, path):
+        self.logs += 1
+        for record in read_events(path):
+            self.add(record)
+
+    @staticmethod
+    def _percentiles(hist):
+        total = sum(hist)
+        if not total:
+            return {}
+        result = {}
+        targets = iter(FRAME_PERCENTILES)
+        q = next(targets)
+        seen = 0
+        for k, n in enumerate(hist):
+            seen += n
+            while q is not None and seen * 100 >= q * total:
+                result[f"p{q}"] = round((k + 1) * FRAME_HIST_BIN_MS, 2)  # upper edge of the bin
+                q = next(targets, None)
+            if q is None:
+                break
+        return result
+
+    def report(self):
+        minutes = self.ticks / FPS / 60
+        scores = sorted(self.scores)
+        return {
+            "logs": self.logs,
+            "runs": self.runs,
+            "finished_runs": self.finished,
+            "quit_runs": self.quit,
+            "score_mean": round(sum(scores) / len(scores), 2) if scores else None,
+            "score_median": scores[len(scores) // 2] if scores else None,
+            "score_max": scores[-1] if scores else None,
+            "minutes_played": round(minutes, 2),
+            "hits_per_minute": round(self.events["hit"] / minutes, 2) if minutes else None,
+            "pickups_per_minute": round(self.events["pickup"] / minutes, 2) if minutes else None,
+            "max_axolotl_size": self.max_size,
+            "events": dict(self.events),
+            "peak_counts": dict(self.peak),
+            "frame_ms": self._percentiles(self.frame_hist),
+            "work_ms": self._percentiles(self.work_hist),
+        }
+
+
+def summarize(paths):
+    summary = Summary()
+    for path in paths:
+        summary.add_log(path)
+    return summary.report()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize Axolotl Dash telemetry logs")
+    parser.add_argument("logs", nargs="+", help="telemetry files (.jsonl.gz)")
+    parser.add_argument("--json", action="store_true", help="print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    report = summarize(args.logs)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    for key, value in report.items():
+        if isinstance(value, dict):
+            value = "  ".join(f"{k}: {v}" for k, v in sorted(value.items()))
+        print(f"{key:<20}{value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
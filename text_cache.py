@@ -0,0 +1,55 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextCache:
+    """LRU of rendered text, each entry already composited with its drop shadow.
+
+    Keyed by ``(text, font, color)``, so a HUD line is only re-rendered when
+    its value changes and then costs a single blit per frame.
+    """
+
+    def __init__(self, shadow_offset=(2, 2), shadow_darken=80, max_entries=128):
+        # The shadow is drawn down/right of the text, so offsets must be >= 0
+        self.shadow_offset = shadow_offset
+        self.shadow_darken = shadow_darken
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, text, font, color):
+        key = (text, font, color)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf = self._render(text, font, color)
+        self._entries[key] = surf
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+    def text_size(self, surf):
+        """Size of the text itself inside a cached surface, without the shadow."""
+        return surf.get_width() - self.shadow_offset[0], surf.get_height() - self.shadow_offset[1]
+
+    def _render(self, text, font, color):
+        shadow_color = tuple(max(0, c - self.shadow_darken) for c in color)
+        text_surf = font.render(text, True, color)
+        shadow_surf = font.render(text, True, shadow_color)
+        ox, oy = self.shadow_offset
+        surf = pygame.Surface(
+            (text_surf.get_width() + ox, text_surf.get_height() + oy), pygame.SRCALPHA
+        )
+        surf.blit(shadow_surf, (ox, oy))
+        surf.blit(text_surf, (0, 0))
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha()
+        return surf
@@ -0,0 +1,115 @@
+"""Render backend on SDL's 2D renderer (``pygame._sdl2.video``).
+
+Instead of blitting surfaces onto the window surface on the CPU, every
+surface is uploaded to a ``Texture`` the first time it is drawn and then
+drawn as a texture copy, with the surface's alpha applied per draw. With a
+GPU renderer that moves all blending off the CPU; SDL's software renderer
+works everywhere (including the dummy video driver) and still avoids
+touching the window surface.
+
+``TextureRenderer`` has the same interface as the renderers in
+``dirty_rects``, so ``Scene`` draws through it unchanged.
+"""
+from collections import OrderedDict
+
+import pygame
+from pygame._sdl2.sdl2 import error as SDLError
+from pygame._sdl2.video import Renderer, Texture, Window
+
+from simulation import AXOLOTL_SIZE
+from sprite_cache import AXOLOTL_DIRECTIONS
+
+TEXTURE_CACHE_MAX = 512           # textures kept for surfaces that stopped being drawn
+
+
+def open_window(size, title="Axolotl", software=False, vsync=False):
+    """A window with an SDL renderer; returns ``(window, renderer, driver_name)``.
+
+    Asks for a GPU renderer unless ``software``, and falls back to the
+    software renderer when none is available.
+    """
+    window = Window(title, size=size)
+    if not software:
+        try:
+            return window, Renderer(window, accelerated=1, vsync=vsync), "accelerated"
+        except (SDLError, pygame.error):
+            pass
+    return window, Renderer(window, accelerated=0, vsync=vsync), "software"
+
+
+def asset_surfaces(assets):
+    """The sprites every game draws: jellies, pickups and the starting axolotl."""
+    yield from assets["jelly_images"]
+    yield assets["starfruit_img"]
+    yield assets["turtle_img"]
+    for direction in AXOLOTL_DIRECTIONS:
+        yield assets["ax_sprites"].get(direction, AXOLOTL_SIZE)[0]
+
+
+class TextureRenderer:
+    """Draw surfaces as textures through an SDL ``Renderer``.
+
+    Textures are looked up by surface identity, so a surface must not be
+    modified after it has been drawn (true of every sprite, cached text
+    line and composed overlay the game draws). The cache holds on to the
+    surfaces it has uploaded; past ``max_textures`` the oldest uploads are
+    dropped and simply uploaded again if they are drawn later.
+    """
+
+    def __init__(self, renderer, background, max_textures=TEXTURE_CACHE_MAX):
+        self.renderer = renderer
+        self.max_textures = max_textures
+        self.uploads = 0
+        self._textures = OrderedDict()  # id(surface) -> [texture, alpha, w, h, surface]
+        self.background = self._upload(background)[0]
+
+    def _upload(self, surf):
+        # Keep the surface alive so its id can't be reused by another one
+        w, h = surf.get_size()
+        entry = self._textures[id(surf)] = [Texture.from_surface(self.renderer, surf), 255, w, h, surf]
+        self.uploads += 1
+        if len(self._textures) > self.max_textures:
+            self._textures.popitem(last=False)
+        return entry
+
+    def preload(self, surfaces):
+        """Upload ``surfaces`` now rather than on first draw."""
+        for surf in surfaces:
+            if id(surf) not in self._textures:
+                self._upload(surf)
+
+    def clear(self):
+        self.background.draw()
+
+    def blit(self, surf, dest, area=None):
+        entry = self._textures.get(id(surf)) or self._upload(surf)
+        texture = entry[0]
+        alpha = surf.get_alpha()
+        if alpha is None:
+            alpha = 255
+        if alpha != entry[1]:
+            texture.alpha = entry[1] = alpha
+        x, y = dest.topleft if isinstance(dest, pygame.Rect) else dest
+        if area is None:
+            rect = (x, y, entry[2], entry[3])
+        else:
+            area = pygame.Rect(area)
+            rect = (x, y, area.w, area.h)
+        texture.draw(area, rect)
+        return pygame.Rect(rect)
+
+    def blits(self, seq):
+        # Same as blit() for each item, inlined: this is the per-sprite path
+        textures = self._textures
+        for surf, dest in seq:
+            entry = textures.get(id(surf)) or self._upload(surf)
+            alpha = surf.get_alpha()
+            if alpha is None:
+                alpha = 255
+            if alpha != entry[1]:
+                entry[0].alpha = entry[1] = alpha
+            x, y = dest.topleft if isinstance(dest, pygame.Rect) else dest
+            entry[0].draw(None, (x, y, entry[2], entry[3]))
+
+    def present(self):
+        self.renderer.present()
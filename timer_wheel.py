@@ -0,0 +1,61 @@
+"""Hashed timer wheel for simulation events (spawns, expiries).
+
+Time is cut into ``resolution_ms`` ticks and each tick maps to one of a
+fixed ring of buckets. Scheduling appends to the bucket of the event's
+tick, and advancing the clock visits only the buckets for the ticks that
+passed, so both cost O(1) however many timers are pending. Events further
+out than one turn of the wheel share a bucket with nearer ones and are
+simply left there until their own turn comes round.
+
+Due events come out ordered by time, then by scheduling order, so a seeded
+simulation driven by the wheel stays deterministic.
+"""
+
+
+class TimerWheel:
+    """Pending ``(at_ms, event)`` timers, fired by ``advance(now_ms)``."""
+
+    def __init__(self, resolution_ms, slots=256):
+        self.resolution = resolution_ms
+        self._buckets = [[] for _ in range(slots)]
+        self._tick = 0   # next tick to fire; its bucket may still hold later events
+        self._seq = 0
+        self._pending = 0
+
+    def __len__(self):
+        return self._pending
+
+    def schedule(self, at_ms, event):
+        """Fire ``event`` on the first ``advance`` with ``now_ms >= at_ms``."""
+        tick = max(int(at_ms // self.resolution), self._tick)
+        self._buckets[tick % len(self._buckets)].append((tick, at_ms, self._seq, event))
+        self._seq += 1
+        self._pending += 1
+
+    def advance(self, now_ms):
+        """Remove and return every event due by ``now_ms``, earliest first."""
+        target = int(now_ms // self.resolution)
+        buckets = self._buckets
+        due = []
+        while True:
+            tick = self._tick
+            bucket = buckets[tick % len(buckets)]
+            if bucket:
+                keep = []
+                for entry in bucket:
+                    # Only the last tick can hold events later than now
+                    if entry[0] == tick and (tick < target or entry[1] <= now_ms):
+                        due.append(entry)
+                    else:
+                        keep.append(entry)
+                if len(keep) != len(bucket):
+                    bucket[:] = keep
+            if tick >= target:
+                break
+            self._tick = tick + 1
+        if not due:
+            return due
+        self._pending -= len(due)
+        if len(due) > 1:
+            due.sort(key=lambda entry: (entry[1], entry[2]))
+        return [entry[3] for entry in due]